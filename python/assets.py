@@ -0,0 +1,37 @@
+import bpy
+import os
+
+# Búsqueda de archivos externos (GIF/vídeo del monitor, etc.).
+#
+# Antes cada script buscaba en c:\paginas_webs\blender. Ahora el orden es:
+#   1. las carpetas de la variable de entorno SETUP_ASSETS_PATH (separadas
+#      por os.pathsep: ';' en Windows, ':' en Linux/macOS)
+#   2. la carpeta del .blend actual, si está guardado
+#   3. python/, la raíz del repositorio y web_project/
+
+ENV_VAR = "SETUP_ASSETS_PATH"
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(_script_dir)
+
+
+def search_folders():
+    folders = [p for p in os.environ.get(ENV_VAR, "").split(os.pathsep) if p]
+    if bpy.data.is_saved:
+        folders.append(os.path.dirname(bpy.data.filepath))
+    folders += [_script_dir, REPO_DIR, os.path.join(REPO_DIR, "web_project")]
+    return folders
+
+
+def find_asset(names):
+    """Ruta del primer archivo de 'names' que exista (por orden de carpeta y nombre) o None."""
+    if isinstance(names, str):
+        names = [names]
+    for folder in search_folders():
+        if not os.path.isdir(folder):
+            continue
+        for name in names:
+            path = os.path.join(folder, name)
+            if os.path.exists(path):
+                return path
+    return None
@@ -0,0 +1,242 @@
+import bpy
+import hashlib
+import json
+import os
+from array import array
+
+import material_library
+import primitives
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Horneado del material procedural de la pared a texturas.
+#
+# improve_wall_realism.py convierte Room_Wall_DarkGrey en un Noise (Detail 16,
+# Scale 80) con Bump y ColorRamp: caro de evaluar en cada muestra y el
+# exportador glTF lo ignora (en el visor la pared sale plana). Aquí se hornea
+# una vez en CPU con Cycles a dos imágenes, color base y normal, y las
+# paredes pasan a usar un material barato con esas imágenes.
+#
+# El ruido usa coordenadas Object (locales, sin la escala del objeto), así que
+# todas las paredes con la misma malla se ven igual: basta un horneado por
+# geometría distinta. Las imágenes se guardan en build/cache/bake con una
+# clave que combina el hash de los nodos, el de la geometría y la resolución;
+# si nada cambió, se cargan sin hornear.
+
+CACHE_DIR = os.path.join(os.path.dirname(_script_dir), "build", "cache", "bake")
+
+BAKE_RESOLUTION = 512
+BAKE_SAMPLES = 16
+BAKE_MARGIN = 4
+# JPEG: el GLB del visor lleva las imágenes dentro y el ruido no comprime en PNG
+IMAGE_FORMAT = 'JPEG'
+
+# nombre del pase, tipo de bake, pass_filter, espacio de color
+PASSES = [
+    ("basecolor", 'DIFFUSE', {'COLOR'}, 'sRGB'),
+    ("normal", 'NORMAL', set(), 'Non-Color'),
+]
+
+# Propiedades de nodo (no sockets) que cambian el resultado
+_NODE_PROPS = ("noise_dimensions", "noise_type", "normalize", "invert", "vector_type")
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 6)
+    try:
+        return [_rounded(v) for v in value]
+    except TypeError:
+        return value
+
+
+def node_tree_params(tree):
+    """Descripción estable de un árbol de nodos (valores, rampas y enlaces)."""
+    nodes = []
+    for node in sorted(tree.nodes, key=lambda n: n.name):
+        entry = {"name": node.name, "type": node.bl_idname, "inputs": {}}
+        for socket in node.inputs:
+            if not socket.is_linked and hasattr(socket, "default_value"):
+                entry["inputs"][socket.identifier] = _rounded(socket.default_value)
+        for prop in _NODE_PROPS:
+            if hasattr(node, prop):
+                entry[prop] = getattr(node, prop)
+        if node.bl_idname == 'ShaderNodeValToRGB':
+            entry["ramp"] = [[_rounded(e.position), _rounded(e.color)]
+                             for e in node.color_ramp.elements]
+        nodes.append(entry)
+
+    links = sorted(f"{l.from_node.name}:{l.from_socket.identifier}->"
+                   f"{l.to_node.name}:{l.to_socket.identifier}" for l in tree.links)
+    return {"nodes": nodes, "links": links}
+
+
+def geometry_hash(mesh):
+    """Hash de posiciones y UVs: dos mallas iguales hornean la misma imagen."""
+    coords = array('f', [0.0]) * (len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", coords)
+    digest = hashlib.sha256(coords.tobytes())
+
+    uv_layer = mesh.uv_layers.active
+    if uv_layer is not None:
+        uvs = array('f', [0.0]) * (len(uv_layer.data) * 2)
+        uv_layer.data.foreach_get("uv", uvs)
+        digest.update(uvs.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def bake_key(material, mesh, resolution):
+    payload = {
+        "nodes": node_tree_params(material.node_tree),
+        "geometry": geometry_hash(mesh),
+        "resolution": resolution,
+        "samples": BAKE_SAMPLES,
+        "blender": bpy.app.version_string,
+    }
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:20]
+
+
+def _image_path(key, pass_name):
+    extension = ".jpg" if IMAGE_FORMAT == 'JPEG' else ".png"
+    return os.path.join(CACHE_DIR, f"{key}_{pass_name}{extension}")
+
+
+def _load_cached(key):
+    """Imágenes ya horneadas con esta clave ({pase: imagen}) o None."""
+    paths = {name: _image_path(key, name) for name, _, _, _ in PASSES}
+    if not all(os.path.exists(p) for p in paths.values()):
+        return None
+
+    images = {}
+    for name, _, _, colorspace in PASSES:
+        image = bpy.data.images.load(paths[name], check_existing=True)
+        image.colorspace_settings.name = colorspace
+        images[name] = image
+    return images
+
+
+def _bake(material, mesh, key, resolution):
+    """Hornea los pases sobre un objeto temporal con esa malla (transformación identidad)."""
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    saved = (scene.render.engine, scene.cycles.device, scene.cycles.samples)
+
+    temp = bpy.data.objects.new("Bake_Temp", mesh)
+    scene.collection.objects.link(temp)
+    primitives.set_material(temp, material)
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    temp.select_set(True)
+    view_layer.objects.active = temp
+
+    nodes = material.node_tree.nodes
+    target = nodes.new('ShaderNodeTexImage')
+    nodes.active = target
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        scene.render.engine = 'CYCLES'
+        scene.cycles.device = 'CPU'
+        scene.cycles.samples = BAKE_SAMPLES
+        for name, bake_type, pass_filter, colorspace in PASSES:
+            image = bpy.data.images.new(f"{material.name}_{name}", resolution, resolution)
+            image.colorspace_settings.name = colorspace
+            target.image = image
+            bpy.ops.object.bake(type=bake_type, pass_filter=pass_filter,
+                                margin=BAKE_MARGIN, use_clear=True)
+            image.filepath_raw = _image_path(key, name)
+            image.file_format = IMAGE_FORMAT
+            image.save()
+            bpy.data.images.remove(image)
+    finally:
+        nodes.remove(target)
+        bpy.data.objects.remove(temp, do_unlink=True)
+        scene.render.engine, scene.cycles.device, scene.cycles.samples = saved
+
+    return _load_cached(key)
+
+
+def _baked_material(name, images, source):
+    """Principled con las imágenes horneadas; rugosidad y metal del original."""
+    mat = bpy.data.materials.get(name) or bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    nodes.clear()
+
+    output = nodes.new('ShaderNodeOutputMaterial')
+    output.location = (400, 0)
+    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+    bsdf.location = (100, 0)
+    links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+
+    original = next((n for n in source.node_tree.nodes if n.type == 'BSDF_PRINCIPLED'), None)
+    if original is not None:
+        for socket in ('Roughness', 'Metallic'):
+            bsdf.inputs[socket].default_value = original.inputs[socket].default_value
+
+    color = nodes.new('ShaderNodeTexImage')
+    color.location = (-400, 200)
+    color.image = images["basecolor"]
+    links.new(color.outputs['Color'], bsdf.inputs['Base Color'])
+
+    normal = nodes.new('ShaderNodeTexImage')
+    normal.location = (-400, -200)
+    normal.image = images["normal"]
+    normal_map = nodes.new('ShaderNodeNormalMap')
+    normal_map.location = (-150, -200)
+    links.new(normal.outputs['Color'], normal_map.inputs['Color'])
+    links.new(normal_map.outputs['Normal'], bsdf.inputs['Normal'])
+
+    mat["baked_from"] = source.name
+    return mat
+
+
+def bake_material(mat_name, resolution=BAKE_RESOLUTION):
+    """Hornea un material procedural y lo sustituye en los objetos que lo usan."""
+    mat = material_library.find_material(mat_name)
+    if mat is None or not mat.use_nodes:
+        print(f"Material '{mat_name}' no encontrado o sin nodos; no hay nada que hornear.")
+        return []
+
+    users = [obj for obj in bpy.context.scene.objects
+             if obj.type == 'MESH' and any(s.material == mat for s in obj.material_slots)]
+    if not users:
+        print(f"Ningún objeto usa '{mat.name}'; no se hornea.")
+        return []
+
+    groups = {}
+    for obj in users:
+        groups.setdefault(geometry_hash(obj.data), []).append(obj)
+
+    baked = []
+    for index, objects in enumerate(groups.values()):
+        mesh = objects[0].data
+        key = bake_key(mat, mesh, resolution)
+        images = _load_cached(key)
+        if images is None:
+            print(f"Horneando '{mat.name}' ({resolution}x{resolution}, {BAKE_SAMPLES} muestras)...")
+            images = _bake(mat, mesh, key, resolution)
+        else:
+            print(f"'{mat.name}': texturas horneadas en caché ({key}).")
+
+        suffix = "_Baked" if len(groups) == 1 else f"_Baked_{index}"
+        baked_mat = _baked_material(mat.name + suffix, images, mat)
+        for obj in objects:
+            for slot in obj.material_slots:
+                if slot.material == mat:
+                    slot.material = baked_mat
+        baked.append(baked_mat)
+
+    # El procedural se conserva para volver a hornear si cambia
+    mat.use_fake_user = True
+    return baked
+
+
+def bake_wall_material():
+    return bake_material("Room_Wall_DarkGrey")
+
+
+if __name__ == "__main__":
+    bake_wall_material()
@@ -0,0 +1,42 @@
+import bpy
+from contextlib import ContextDecorator
+
+# Generación por lotes: un paso de deshacer y una evaluación por prop.
+#
+# En una sesión abierta de Blender cada operador apila un paso de deshacer y
+# puede forzar que el depsgraph se reevalúe; ejecutar todos los scripts dejaba
+# un historial larguísimo. Los generadores ya construyen con bpy.data (sin
+# operadores, que son los que apilan pasos), así que con BatchGeneration,
+# mientras se construye un prop, no se pide ninguna evaluación intermedia y
+# al terminar se evalúa la escena una sola vez (view_layer.update) y se apila
+# un único paso de deshacer con el nombre del prop.
+#
+# No se tocan las preferencias del usuario (use_global_undo): son de toda la
+# sesión y se guardan solas al salir de Blender, así que un error a medias las
+# dejaría cambiadas.
+#
+# Se usa como decorador del generador o como bloque with. Se puede anidar
+# (create_gamer_pc -> prop_spec.build_prop): solo el nivel exterior hace el
+# trabajo final. En modo background no hay historial y no se apila nada.
+
+_depth = 0
+
+
+class BatchGeneration(ContextDecorator):
+    def __init__(self, label):
+        self.label = label
+
+    def __enter__(self):
+        global _depth
+        _depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _depth
+        _depth -= 1
+        if _depth == 0:
+            bpy.context.view_layer.update()
+            # También si falló: así se puede deshacer el prop a medias de una vez
+            if bpy.context.preferences.edit.use_global_undo and not bpy.app.background:
+                bpy.ops.ed.undo_push(message=self.label)
+        return False
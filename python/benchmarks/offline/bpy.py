@@ -0,0 +1,268 @@
+"""Sustituto de bpy que graba lo que hacen los generadores, sin Blender.
+
+Solo lo usa run_benchmarks.py en modo offline (pone esta carpeta primera en
+sys.path). Cuenta en COUNTS:
+  ops.<grupo>.<operador>        llamadas a operadores
+  data.<tipo>.new / .load       datablocks creados
+  data.<tipo>.remove            datablocks borrados
+  collection.link / .unlink     enlaces de objetos y colecciones
+  modifier.new                  modificadores añadidos
+
+Lo que no modela (nodos, propiedades de render, etc.) lo acepta cualquier
+atributo y devuelve otro objeto permisivo: aquí no se mide el resultado, solo
+el trabajo que se le pide a Blender.
+"""
+import collections
+import types as _types
+
+COUNTS = collections.Counter()
+
+
+class Auto:
+    """Objeto permisivo: cualquier atributo o índice existe y se puede asignar."""
+
+    def __init__(self, path="auto"):
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_attrs", {})
+        object.__setattr__(self, "_items", {})
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name not in self._attrs:
+            self._attrs[name] = Auto(f"{self._path}.{name}")
+        return self._attrs[name]
+
+    def __setattr__(self, name, value):
+        self._attrs[name] = value
+
+    def __call__(self, *args, **kwargs):
+        return Auto(self._path + "()")
+
+    def __getitem__(self, key):
+        if key not in self._items:
+            self._items[key] = Auto(f"{self._path}[{key!r}]")
+        return self._items[key]
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+
+    def __delitem__(self, key):
+        del self._items[key]
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __iter__(self):
+        return iter([])
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return True
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+
+class IDCollection:
+    """bpy.data.<tipo>: nombres únicos con sufijo .001 como en Blender."""
+
+    def __init__(self, kind, factory):
+        self.kind = kind
+        self._factory = factory
+        self._items = {}
+
+    def _add(self, name, *args, **kwargs):
+        base, n = name, 0
+        while name in self._items:
+            n += 1
+            name = f"{base}.{n:03d}"
+        item = self._factory(name, *args, **kwargs)
+        self._items[name] = item
+        return item
+
+    def new(self, name, *args, **kwargs):
+        COUNTS[f"data.{self.kind}.new"] += 1
+        return self._add(name, *args, **kwargs)
+
+    def load(self, filepath, check_existing=False):
+        COUNTS[f"data.{self.kind}.load"] += 1
+        return self._add(filepath.replace("\\", "/").rsplit("/", 1)[-1])
+
+    def remove(self, item, do_unlink=True):
+        COUNTS[f"data.{self.kind}.remove"] += 1
+        self._items.pop(item.name, None)
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def __getitem__(self, name):
+        return self._items[name]
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class ID(Auto):
+    def __init__(self, name):
+        super().__init__(name)
+        self.name = name
+        self.users = 1
+        self.use_fake_user = False
+
+    def __hash__(self):
+        return id(self)
+
+    def __eq__(self, other):
+        return self is other
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class Links:
+    """collection.objects / collection.children."""
+
+    def __init__(self):
+        self._items = []
+
+    def link(self, item):
+        COUNTS["collection.link"] += 1
+        if item in self._items:
+            raise RuntimeError(f"{item!r} ya está enlazado")
+        self._items.append(item)
+
+    def unlink(self, item):
+        COUNTS["collection.unlink"] += 1
+        self._items.remove(item)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+
+class Collection(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = Links()
+        self.children = Links()
+
+    @property
+    def all_objects(self):
+        return self.objects
+
+
+class Seq(list):
+    """Lista con foreach_set/foreach_get (polígonos, UVs...)."""
+
+    def foreach_set(self, attr, values):
+        pass
+
+    def foreach_get(self, attr, values):
+        pass
+
+
+class Mesh(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.materials = []
+        self.vertices = Seq()
+        self.polygons = Seq()
+        self.loops = Seq()
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices = Seq(range(len(vertices)))
+        self.polygons = Seq(range(len(faces)))
+        self.loops = Seq(range(sum(len(face) for face in faces)))
+
+
+class Modifiers(list):
+    def new(self, name, type):
+        COUNTS["modifier.new"] += 1
+        mod = Auto(name)
+        mod.name = name
+        mod.type = type
+        self.append(mod)
+        return mod
+
+
+class Object(ID):
+    def __init__(self, name, object_data=None):
+        super().__init__(name)
+        self.data = object_data
+        self.type = 'EMPTY' if object_data is None else 'MESH'
+        self.parent = None
+        self.modifiers = Modifiers()
+        self.location = (0, 0, 0)
+        self.rotation_euler = (0, 0, 0)
+        self.scale = (1, 1, 1)
+
+
+class Material(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.use_nodes = False
+
+
+class _OperatorGroup:
+    def __init__(self, group):
+        self._group = group
+
+    def __getattr__(self, name):
+        def operator(*args, **kwargs):
+            COUNTS[f"ops.{self._group}.{name}"] += 1
+            return {'FINISHED'}
+        return operator
+
+
+class _Operators:
+    def __getattr__(self, group):
+        return _OperatorGroup(group)
+
+
+def reset():
+    """Vacía bpy.data y los contadores (equivale a read_factory_settings(use_empty=True))."""
+    global data, context
+    COUNTS.clear()
+    data = _types.SimpleNamespace(
+        collections=IDCollection("collections", Collection),
+        materials=IDCollection("materials", Material),
+        meshes=IDCollection("meshes", Mesh),
+        objects=IDCollection("objects", Object),
+        images=IDCollection("images", ID),
+        actions=IDCollection("actions", ID),
+        node_groups=IDCollection("node_groups", ID),
+        is_saved=False,
+        filepath="",
+    )
+    scene = Auto("scene")
+    scene.collection = Collection("Scene Collection")
+    context = Auto("context")
+    context.scene = scene
+
+
+data = None
+context = None
+reset()
+
+ops = _Operators()
+app = Auto("app")
+app.version = (4, 2, 0)
+app.version_string = "4.2.0 (offline)"
+app.binary_path = ""
+app.background = True
+types = Auto("types")
+utils = Auto("utils")
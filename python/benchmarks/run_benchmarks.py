@@ -0,0 +1,188 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+
+# Benchmarks de los generadores.
+#
+#   blender --background --python python/benchmarks/run_benchmarks.py -- [opciones]   (bpy real)
+#   python python/benchmarks/run_benchmarks.py [opciones]                             (offline)
+#
+# Sin Blender se usa offline/bpy.py, que no construye nada pero cuenta las
+# llamadas a operadores, los datablocks creados y los link/unlink. Escenarios:
+#   prop:<módulo>   cada prop de build_setup.STAGES, en una escena vacía
+#   setup_x<N>      el setup completo N veces seguidas (escalado: 1, 10, 100)
+#
+# Cada ejecución se guarda en build/benchmarks/<modo>-<fecha>.json y se
+# compara con la anterior del mismo modo. En modo offline, además, se compara
+# con baseline_offline.json (versionado): si sube alguna llamada a operador
+# el script termina con error. --update-baseline lo reescribe.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "build", "benchmarks")
+BASELINE = os.path.join(BENCH_DIR, "baseline_offline.json")
+
+DEFAULT_SCALES = [1, 10, 100]
+DATABLOCKS = ["objects", "meshes", "materials", "collections", "images"]
+
+try:
+    import bpy
+    MODE = "bpy"
+except ImportError:
+    sys.path.insert(0, os.path.join(BENCH_DIR, "offline"))
+    import bpy
+    MODE = "offline"
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+
+import build_setup
+
+
+def reset():
+    if MODE == "offline":
+        bpy.reset()
+    else:
+        build_setup.reset_scene()
+
+
+def datablock_counts():
+    return {kind: len(getattr(bpy.data, kind)) for kind in DATABLOCKS}
+
+
+def run_scenario(stages, repeat=1):
+    """Ejecuta las etapas repeat veces en una escena vacía y devuelve las medidas."""
+    reset()
+    before = datablock_counts()
+    start = time.perf_counter()
+    # Los generadores imprimen una línea por prop; con 100 setups estorba
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for stage in stages:
+                build_setup.run_stage(stage)
+    seconds = time.perf_counter() - start
+
+    after = datablock_counts()
+    result = {
+        "seconds": round(seconds, 6),
+        "datablocks": {kind: after[kind] - before[kind] for kind in DATABLOCKS},
+    }
+    if MODE == "offline":
+        result["calls"] = dict(sorted(bpy.COUNTS.items()))
+    return result
+
+
+def run_all(scales, props=True):
+    results = {}
+    order = build_setup.resolve_order(build_setup.STAGES)
+    if props:
+        for stage in [s for s in order if s.prop]:
+            results[f"prop:{stage.module}"] = run_scenario([stage])
+    for n in scales:
+        results[f"setup_x{n}"] = run_scenario(order, repeat=n)
+    return results
+
+
+def operator_calls(result):
+    return {k: v for k, v in result.get("calls", {}).items() if k.startswith("ops.")}
+
+
+def check_baseline(results, baseline):
+    """Lista de regresiones: llamadas a operador que suben respecto a la base."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = operator_calls(baseline[name])
+        for op, count in operator_calls(result).items():
+            if count > old.get(op, 0):
+                regressions.append(f"{name}: {op} {old.get(op, 0)} -> {count}")
+    return regressions
+
+
+def previous_run():
+    runs = sorted(glob.glob(os.path.join(RESULTS_DIR, f"{MODE}-*.json")))
+    if not runs:
+        return None
+    with open(runs[-1], encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def print_results(results, previous=None):
+    width = max(len(name) for name in ["Escenario"] + list(results))
+    print()
+    print(f"{'Escenario'.ljust(width)}  {'Tiempo (s)':>10}  {'Δ tiempo':>9}  "
+          f"{'Operad.':>7}  {'Objetos':>7}  {'Mallas':>7}  {'Mater.':>7}  {'Links':>7}")
+    print("-" * (width + 70))
+    for name, result in results.items():
+        old = (previous or {}).get(name)
+        delta = f"{result['seconds'] / old['seconds'] - 1:+8.0%}" if old and old["seconds"] else "        -"
+        calls = result.get("calls", {})
+        ops = str(sum(operator_calls(result).values())) if MODE == "offline" else "-"
+        links = str(calls.get("collection.link", 0)) if MODE == "offline" else "-"
+        blocks = result["datablocks"]
+        print(f"{name.ljust(width)}  {result['seconds']:10.3f}  {delta:>9}  {ops:>7}  "
+              f"{blocks['objects']:7d}  {blocks['meshes']:7d}  {blocks['materials']:7d}  {links:>7}")
+
+
+def parse_args(argv=None):
+    if argv is None:
+        # Con blender --python los argumentos propios van después de "--"
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description="Benchmarks de los generadores del setup gamer.")
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES, metavar="N",
+                        help="Setups completos por escenario de escalado")
+    parser.add_argument("--no-props", action="store_true", help="Omitir los escenarios por prop")
+    parser.add_argument("--no-save", action="store_true", help="No guardar los resultados")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Reescribir baseline_offline.json con esta ejecución (solo offline)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"Modo: {MODE} (Blender {bpy.app.version_string})")
+
+    results = run_all(args.scales, props=not args.no_props)
+    print_results(results, previous_run())
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{MODE}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"mode": MODE, "blender": bpy.app.version_string, "results": results},
+                      f, indent=2, sort_keys=True)
+        print(f"\nResultados guardados en {path}")
+
+    if MODE != "offline":
+        return 0
+
+    if args.update_baseline:
+        baseline = {name: {"calls": result["calls"], "datablocks": result["datablocks"]}
+                    for name, result in results.items()}
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Base actualizada: {BASELINE}")
+        return 0
+
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            regressions = check_baseline(results, json.load(f))
+        if regressions:
+            print("\nERROR: más llamadas a operadores que en la base:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nLlamadas a operadores: sin aumentos respecto a la base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import bpy
+import glob
+import hashlib
+import json
+import os
+import re
+
+import material_library
+import primitives
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Caché de props direccionada por contenido.
+#
+# La huella de una etapa es el hash de: el código del generador y de todos los
+# módulos locales que importa (recursivamente), su JSON en props/ si lo tiene,
+# los parámetros de la etapa, el modo de mallas compartidas y la versión de
+# Blender. Cada prop se construye aislado (escena vacía) y su colección se
+# guarda como <modulo>-<huella>.blend. Si nada cambió, la siguiente build solo
+# hace append del .blend.
+#
+# Al construir cada prop aislado, el resultado no depende de qué otras etapas
+# se ejecutaron ni de si venían de la caché: al cargar, los materiales y las
+# mallas compartidas se unifican por hash en el mismo orden de etapas que una
+# build normal.
+
+CACHE_DIR = os.path.join(os.path.dirname(_script_dir), "build", "cache", "props")
+
+_IMPORT_RE = re.compile(r"^\s*(?:import|from)\s+([A-Za-z_][A-Za-z0-9_]*)", re.MULTILINE)
+
+
+def source_closure(module_name):
+    """Rutas de los ficheros de los que depende un generador (ordenadas)."""
+    seen = set()
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(_script_dir, f"{name}.py")
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.add(name)
+        with open(path, encoding="utf-8") as f:
+            pending.extend(_IMPORT_RE.findall(f.read()))
+
+    paths = [os.path.join(_script_dir, f"{name}.py") for name in seen]
+    spec = os.path.join(_script_dir, "props", f"{module_name}.json")
+    if os.path.exists(spec):
+        paths.append(spec)
+    return sorted(paths)
+
+
+def fingerprint(stage):
+    """Huella de una etapa (ver cabecera). Devuelve (hash, entradas)."""
+    inputs = {}
+    for path in source_closure(stage.module):
+        with open(path, "rb") as f:
+            inputs[os.path.relpath(path, _script_dir)] = hashlib.sha256(f.read()).hexdigest()
+
+    payload = {
+        "module": stage.module,
+        "function": stage.function,
+        "params": stage.params or {},
+        "sources": inputs,
+        "share_meshes": primitives.SHARE_MESHES,
+        "blender": bpy.app.version_string,
+    }
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:20], payload
+
+
+def artifact_path(stage, key):
+    return os.path.join(CACHE_DIR, f"{stage.module}-{key}.blend")
+
+
+def lookup(stage):
+    """Ruta del artefacto si está en caché (o None) y la huella calculada."""
+    key, _ = fingerprint(stage)
+    path = artifact_path(stage, key)
+    return (path if os.path.exists(path) else None), key
+
+
+def store(stage, key, collections):
+    """Guarda las colecciones del prop (y todo lo que usan) como artefacto."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = artifact_path(stage, key)
+
+    # Solo se guarda la última versión de cada etapa
+    for old in glob.glob(os.path.join(CACHE_DIR, f"{stage.module}-*")):
+        if not old.startswith(path):
+            os.remove(old)
+
+    bpy.data.libraries.write(path, set(collections), fake_user=True)
+    _, payload = fingerprint(stage)
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": key, "collections": [c.name for c in collections],
+                   "inputs": payload}, f, indent=2, sort_keys=True)
+    return path
+
+
+def build_isolated(stage, run_stage, reset_scene):
+    """Construye un prop en una escena vacía y devuelve sus colecciones nuevas."""
+    reset_scene()
+    before = set(bpy.data.collections)
+    run_stage(stage)
+    return [c for c in bpy.data.collections if c not in before]
+
+
+def load(path):
+    """Hace append de las colecciones de un artefacto y las enlaza a la escena."""
+    with open(path + ".json", encoding="utf-8") as f:
+        names = json.load(f)["collections"]
+
+    materials_before = set(bpy.data.materials)
+    meshes_before = set(bpy.data.meshes)
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        data_to.collections = [n for n in data_from.collections if n in names]
+
+    for collection in data_to.collections:
+        collection.use_fake_user = False
+        bpy.context.scene.collection.children.link(collection)
+
+    _unify_materials(materials_before)
+    _unify_shared_meshes(meshes_before)
+    return data_to.collections
+
+
+def _base_name(name):
+    """Nombre sin el sufijo .001 que añade Blender al repetirse."""
+    return re.sub(r"\.\d{3}$", "", name)
+
+
+def _unify_materials(before):
+    """Materiales recién cargados con el mismo hash que uno existente se fusionan."""
+    existing = {m.get("param_hash"): m for m in before if m.get("param_hash")}
+    for mat in [m for m in bpy.data.materials if m not in before]:
+        mat.use_fake_user = False
+        key = mat.get("param_hash")
+        if key in existing:
+            original = existing[key]
+            mat.user_remap(original)
+            # El nombre que pidió este prop queda como alias
+            for name in [_base_name(mat.name)] + mat.get("aliases", "").split(","):
+                if name:
+                    material_library.add_alias(original, name)
+            bpy.data.materials.remove(mat)
+        elif key:
+            existing[key] = mat
+
+
+def _shared_name(mesh):
+    """Clave de una malla compartida: el nombre guardado al crearla.
+
+    No se deduce quitando un sufijo .NNN del nombre actual: el pivote forma
+    parte del nombre (Prim_Cube_O0_0_0.125) y se confundiría con él.
+    """
+    return mesh.get("shared_name") or mesh.name
+
+
+def _unify_shared_meshes(before):
+    existing = {_shared_name(m): m for m in before if m.get("shared_primitive")}
+    for mesh in [m for m in bpy.data.meshes if m not in before and m.get("shared_primitive")]:
+        base = _shared_name(mesh)
+        if base in existing:
+            mesh.user_remap(existing[base])
+            bpy.data.meshes.remove(mesh)
+        else:
+            existing[base] = mesh
@@ -0,0 +1,342 @@
+import bpy
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _python_dir():
+    """Carpeta python/ del repositorio, donde viven los módulos compartidos.
+
+    Como archivo (blender --python, Texto > Abrir) es la de este script. Pegado
+    en el editor de texto de Blender __file__ apunta al bloque de texto: se
+    busca junto al .blend guardado (// o //python).
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    if os.path.isfile(os.path.join(here, "primitives.py")):
+        return here
+
+    candidates = []
+    text = bpy.data.texts.get(os.path.basename(__file__))
+    if text is not None and text.filepath:
+        candidates.append(os.path.dirname(bpy.path.abspath(text.filepath)))
+    if bpy.data.filepath:
+        candidates += [bpy.path.abspath("//"), bpy.path.abspath("//python")]
+    for folder in candidates:
+        if os.path.isfile(os.path.join(folder, "primitives.py")):
+            return os.path.normpath(folder)
+    raise ImportError("No se encuentra la carpeta python/ del repositorio: ejecuta build_setup.py "
+                      "desde python/ o guarda el .blend en la carpeta del repositorio.")
+
+
+# python/ se añade a sys.path aquí (y en watch_build.py, el otro punto de
+# entrada) y en ningún otro script
+_script_dir = _python_dir()
+if _script_dir not in sys.path:
+    sys.path.append(_script_dir)
+
+import glb_export
+import primitives
+
+# Construcción completa del setup en un solo paso, sin pegar scripts a mano.
+#
+#   blender --background --python-exit-code 1 --python python/build_setup.py -- [opciones]
+#   python python/build_setup.py [opciones]        (con el wheel de bpy)
+#   blender --python python/build_setup.py -- --only gamer_bed   (un solo prop)
+#
+# Los scripts de python/ importan módulos compartidos (primitives,
+# material_library...) y se ejecutan a través de este archivo, que pone
+# python/ en sys.path. Para construir un prop suelto se usa --only; desde el
+# editor de texto de Blender se abre (o pega) build_setup.py con el .blend
+# guardado en el repositorio. Una vez ejecutado, el resto de scripts también
+# se pueden lanzar desde el editor en esa sesión.
+#
+# Ejecuta las etapas en orden de dependencias, guarda el .blend, exporta el
+# GLB del visor web e imprime el tiempo de cada etapa.
+#
+# Con --jobs N cada prop se construye en su propio proceso headless (hasta N a
+# la vez) y se guarda como artefacto de build_cache; el proceso principal los
+# carga en el orden de STAGES, aplica las mejoras de materiales y exporta.
+
+REPO_DIR = os.path.dirname(_script_dir)
+DEFAULT_BLEND = os.path.join(REPO_DIR, "build", "setup_gamer.blend")
+DEFAULT_GLB = os.path.join(REPO_DIR, "web_project", "setup_gamer.glb")
+BENCHMARK_DIR = os.path.join(REPO_DIR, "build", "export")
+
+# module: script de python/, function: generador, after: etapas previas,
+# prop: crea su propia colección (se puede cachear/construir aparte),
+# params: argumentos para el generador
+Stage = namedtuple("Stage", "module function after prop params", defaults=((), True, None))
+
+STAGES = [
+    # Habitación y muebles
+    Stage("gamer_room", "create_gamer_room"),
+    Stage("gamer_desk_rgb", "create_gamer_desk_with_rgb"),
+    Stage("gamer_chair_pro", "create_gamer_chair"),
+    Stage("gamer_bed", "create_gamer_bed"),
+    Stage("gamer_shelf", "create_gamer_shelf"),
+    # Periféricos y objetos sobre el escritorio
+    Stage("gamer_pc", "create_gamer_pc"),
+    Stage("gamer_peripherals", "create_peripherals"),
+    Stage("nintendo_switch", "create_nintendo_switch"),
+    # Personajes
+    Stage("minecraft_steve", "create_minecraft_steve"),
+    # Mejoras de materiales (modifican materiales creados por otras etapas)
+    Stage("improve_wall_realism", "improve_wall_material", ("gamer_room",), prop=False),
+    Stage("setup_monitor_gif", "setup_monitor_debug", ("gamer_peripherals",), prop=False),
+    # Horneado de la pared procedural a texturas (caché en build/cache/bake)
+    Stage("bake_textures", "bake_wall_material", ("improve_wall_realism",), prop=False),
+]
+
+
+def resolve_order(stages, only=None):
+    """Orden estable que respeta 'after'; con only se añaden sus dependencias."""
+    by_name = {s.module: s for s in stages}
+    for stage in stages:
+        for dep in stage.after:
+            if dep not in by_name:
+                raise ValueError(f"La etapa '{stage.module}' depende de '{dep}', que no existe")
+
+    wanted = set(by_name) if not only else set()
+    pending = list(only or [])
+    while pending:
+        name = pending.pop()
+        if name not in by_name:
+            raise ValueError(f"Etapa desconocida: '{name}'")
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(by_name[name].after)
+
+    order, done = [], set()
+    while len(order) < len(wanted):
+        progress = False
+        for stage in stages:
+            if stage.module in wanted and stage.module not in done and all(d in done for d in stage.after):
+                order.append(stage)
+                done.add(stage.module)
+                progress = True
+        if not progress:
+            raise ValueError("Dependencias circulares entre etapas")
+    return order
+
+
+def run_stage(stage):
+    module = importlib.import_module(stage.module)
+    getattr(module, stage.function)(**(stage.params or {}))
+
+
+def build_props_cached(order, timings, jobs=1):
+    """Carga cada prop desde la caché, construyendo aislados solo los que cambiaron.
+
+    Con jobs > 1 los props que faltan se construyen en paralelo, cada uno en
+    su propio proceso de Blender/bpy (ver build_in_workers).
+    """
+    import build_cache
+
+    props = [s for s in order if s.prop]
+    keys = {}
+    misses = []
+    for stage in props:
+        path, keys[stage.module] = build_cache.lookup(stage)
+        if path is None:
+            misses.append(stage)
+
+    if jobs > 1 and len(misses) > 1:
+        timed(timings, f"construir {len(misses)} props ({jobs} procesos)",
+              build_in_workers, misses, keys, jobs)
+    else:
+        for stage in misses:
+            timed(timings, f"{stage.module} (construir)", build_and_store, stage, keys[stage.module])
+
+    timed(timings, "reset_scene", reset_scene)
+    for stage in props:
+        path = build_cache.artifact_path(stage, keys[stage.module])
+        timed(timings, f"{stage.module} (caché)", build_cache.load, path)
+
+    for stage in [s for s in order if not s.prop]:
+        timed(timings, stage.module, run_stage, stage)
+
+
+def build_and_store(stage, key):
+    import build_cache
+    collections = build_cache.build_isolated(stage, run_stage, reset_scene)
+    return build_cache.store(stage, key, collections)
+
+
+def worker_command(stage, key):
+    """Comando para construir un prop en otro proceso (Blender o Python con bpy)."""
+    args = ["--worker", stage.module, "--worker-key", key]
+    if primitives.SHARE_MESHES:
+        args.append("--share-meshes")
+
+    binary = bpy.app.binary_path
+    if binary and os.path.basename(binary).lower().startswith("blender"):
+        return [binary, "--background", "--factory-startup", "--python-exit-code", "1",
+                "--python", os.path.abspath(__file__), "--"] + args
+    # Wheel de bpy: el propio intérprete de Python
+    return [sys.executable, os.path.abspath(__file__)] + args
+
+
+def build_in_workers(stages, keys, jobs):
+    """Construye cada prop en un proceso aparte; el padre solo carga los artefactos."""
+    def run(stage):
+        start = time.perf_counter()
+        proc = subprocess.run(worker_command(stage, keys[stage.module]),
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Falló el proceso de '{stage.module}':\n{proc.stdout}\n{proc.stderr}")
+        return stage.module, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for module, seconds in pool.map(run, stages):
+            print(f"  {module}: {seconds:.3f} s (proceso aparte)")
+
+
+def reset_scene():
+    """Escena vacía, sin el cubo/cámara/luz por defecto."""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def save_blend(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(path))
+
+
+def timed(timings, label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    timings.append((label, time.perf_counter() - start))
+    return result
+
+
+def print_timings(timings):
+    width = max(len(label) for label, _ in timings)
+    print()
+    print(f"{'Etapa'.ljust(width)}  Tiempo (s)")
+    print("-" * (width + 12))
+    for label, seconds in timings:
+        print(f"{label.ljust(width)}  {seconds:10.3f}")
+    print("-" * (width + 12))
+    print(f"{'TOTAL'.ljust(width)}  {sum(s for _, s in timings):10.3f}")
+
+
+def parse_args(argv=None):
+    if argv is None:
+        # Con blender --python los argumentos propios van después de "--"
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description="Construye el setup gamer completo en modo headless.")
+    parser.add_argument("--blend", default=DEFAULT_BLEND, help="Ruta del .blend de salida")
+    parser.add_argument("--glb", default=DEFAULT_GLB, help="Ruta del GLB para el visor web")
+    parser.add_argument("--only", nargs="+", metavar="ETAPA",
+                        help="Ejecutar solo estas etapas (y las que necesitan)")
+    parser.add_argument("--no-blend", action="store_true", help="No guardar el .blend")
+    parser.add_argument("--no-export", action="store_true", help="No exportar el GLB")
+    parser.add_argument("--compression", default="none", choices=list(glb_export.PROFILES),
+                        help="Perfil de compresión del GLB (ver glb_export.py)")
+    parser.add_argument("--benchmark-compression", action="store_true",
+                        help=f"Exportar con todos los perfiles en {os.path.relpath(BENCHMARK_DIR, REPO_DIR)} "
+                             "y comparar tamaño y tiempos (al final, descarta la escena)")
+    parser.add_argument("--share-meshes", action="store_true",
+                        help="Reutilizar una malla por primitiva (ver primitives.py)")
+    parser.add_argument("--adaptive-bevels", action="store_true",
+                        help="Segmentos de bisel según el tamaño de cada pieza (ver poly_budget.py)")
+    parser.add_argument("--budget", default="warn", choices=["off", "warn", "error"],
+                        help="Qué hacer si un prop supera su presupuesto de triángulos")
+    parser.add_argument("--lightmaps", action="store_true",
+                        help="Hornear luz y AO de la habitación en el GLB (ver lightmaps.py)")
+    parser.add_argument("--lod", action="store_true",
+                        help="Generar niveles de detalle para los props (ver lod.py)")
+    parser.add_argument("--merge-static", action="store_true",
+                        help="Fusionar las piezas estáticas de cada prop (ver finalize.py)")
+    parser.add_argument("--no-pick-proxies", action="store_true",
+                        help="No crear las cajas de selección del visor (ver pick_proxies.py)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reutilizar los props sin cambios desde build/cache (ver build_cache.py)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Construir los props que falten en N procesos en paralelo (implica --cache)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-key", help=argparse.SUPPRESS)
+    parser.add_argument("--report", nargs="?", const="", metavar="JSON",
+                        help="Informe de complejidad por colección (ver scene_report.py)")
+    parser.add_argument("--timings-json", help="Guardar los tiempos por etapa en este JSON")
+    parser.add_argument("--list", action="store_true", help="Mostrar las etapas en orden y salir")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    order = resolve_order(STAGES, args.only)
+
+    if args.list:
+        for stage in order:
+            deps = f" (después de {', '.join(stage.after)})" if stage.after else ""
+            print(f"{stage.module}.{stage.function}{deps}")
+        return
+
+    if args.share_meshes:
+        primitives.use_shared_meshes(True)
+
+    if args.worker:
+        # Proceso hijo de --jobs: construir un único prop y guardar su artefacto
+        stage = next(s for s in STAGES if s.module == args.worker)
+        build_and_store(stage, args.worker_key)
+        return
+
+    timings = []
+    if args.cache or args.jobs > 1:
+        build_props_cached(order, timings, args.jobs)
+    else:
+        timed(timings, "reset_scene", reset_scene)
+        for stage in order:
+            timed(timings, stage.module, run_stage, stage)
+
+    if args.adaptive_bevels:
+        import poly_budget
+        timed(timings, "adaptive_bevels", poly_budget.adapt_bevels)
+    if args.budget != "off":
+        import poly_budget
+        timed(timings, "budget", poly_budget.check_budgets, args.budget)
+    if args.lightmaps:
+        import lightmaps
+        timed(timings, "lightmaps", lightmaps.bake_lightmaps)
+    if args.lod:
+        import lod
+        timed(timings, "lod", lod.generate_scene_lods)
+    if args.merge_static:
+        import finalize
+        timed(timings, "merge_static", finalize.merge_static_scene)
+    if not args.no_pick_proxies:
+        import pick_proxies
+        timed(timings, "pick_proxies", pick_proxies.create_pick_proxies)
+    if args.report is not None:
+        import scene_report
+        timed(timings, "report", scene_report.write_report, args.report or scene_report.DEFAULT_REPORT)
+    if not args.no_blend:
+        timed(timings, "save_blend", save_blend, args.blend)
+    if not args.no_export:
+        timed(timings, "export_glb", glb_export.export_glb, args.glb, args.compression)
+
+    compression = None
+    if args.benchmark_compression:
+        compression = glb_export.benchmark(BENCHMARK_DIR)
+
+    print_timings(timings)
+    if compression:
+        glb_export.print_benchmark(compression)
+    if args.timings_json:
+        report = {"blender": bpy.app.version_string,
+                  "stages": [{"stage": label, "seconds": round(s, 6)} for label, s in timings]}
+        if compression:
+            report["compression"] = compression
+        with open(args.timings_json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import bpy
+import bmesh
+from mathutils import Matrix
+
+# Etapa final opcional: fusionar las piezas estáticas de cada prop.
+#
+# Cada prop es una jerarquía de muchas piezas colgando de un empty *_ROOT (el
+# PC tiene unas 30). El visor three.js hace una llamada de dibujo por pieza.
+# Aquí se evalúan los modificadores, se hornean las transformaciones (incluida
+# la escala del ROOT) en los vértices y se junta todo en una malla por
+# material. Solo se conservan como objetos con nombre los que el visor web
+# necesita encontrar o animar. Si el prop tiene niveles de detalle (lod.py)
+# se fusiona cada nivel por separado dentro de su empty LOD.
+
+KEEP_SEPARATE = {
+    "Monitor_Panel", "Monitor_Body",   # Clic para abrir la PC
+    "Steve_ROOT",                      # WASD mueve a Steve
+    "Pierna_L", "Pierna_R", "Brazo_L", "Brazo_R",  # Animación de caminar
+}
+
+
+def find_root(collection):
+    """El empty *_ROOT sin padre de la colección (o None)."""
+    for obj in collection.objects:
+        if obj.type == 'EMPTY' and obj.parent is None and obj.name.endswith("_ROOT"):
+            return obj
+    return None
+
+
+def follows_kept(obj, keep, root):
+    """True si la pieza cuelga de un objeto conservado (sin contar el ROOT): se mueve con él.
+
+    Es el caso de los zapatos y las mangas de Steve, hijos de las extremidades animadas.
+    """
+    parent = obj.parent
+    while parent is not None and parent != root:
+        if parent.name in keep:
+            return True
+        parent = parent.parent
+    return False
+
+
+def material_of(obj):
+    """Material de la primera ranura, enlazado al objeto o a la malla."""
+    if obj.material_slots:
+        return obj.material_slots[0].material
+    return None
+
+
+def merge_static_prop(collection, keep=KEEP_SEPARATE):
+    """Fusiona las piezas estáticas de un prop. Devuelve los objetos fusionados."""
+    # Las matrix_world tienen que reflejar la escala/posición final del ROOT
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    root = find_root(collection)
+    keep_root = root is not None and (root.name in keep or "lod_distances" in root)
+    # Si el ROOT se conserva, las mallas fusionadas quedan en su espacio local
+    # para que moverlo (Steve) siga moviendo todo el prop.
+    root_space = root.matrix_world.inverted() if keep_root else Matrix.Identity(4)
+
+    # (empty LOD o None, material) -> piezas
+    groups = {}
+    for obj in collection.objects:
+        if obj.type != 'MESH' or obj.name in keep or follows_kept(obj, keep, root):
+            continue
+        lod = obj.parent if obj.parent is not None and "lod_level" in obj.parent else None
+        groups.setdefault((lod, material_of(obj)), []).append(obj)
+
+    if not groups:
+        return []
+
+    merged = []
+    for (lod, material), objects in groups.items():
+        to_space = lod.matrix_world.inverted() if lod else root_space
+        bm = bmesh.new()
+        for obj in objects:
+            matrix = to_space @ obj.matrix_world
+            temp = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+            temp.transform(matrix)
+            if matrix.determinant() < 0:
+                temp.flip_normals()
+            bm.from_mesh(temp)
+            bpy.data.meshes.remove(temp)
+
+        label = material.name if material else "SinMaterial"
+        if lod:
+            label += f"_LOD{lod['lod_level']}"
+        mesh = bpy.data.meshes.new(f"{collection.name}_{label}")
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.materials.append(material)
+
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        collection.objects.link(obj)
+        if lod:
+            obj.parent = lod
+        elif keep_root:
+            obj.parent = root
+        merged.append(obj)
+
+    # Borrar las piezas originales (y sus mallas si ya nadie las usa)
+    for objects in groups.values():
+        for obj in objects:
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+    if root is not None and not keep_root:
+        # Los objetos conservados se quedan donde estaban en el mundo
+        for obj in list(collection.objects):
+            if obj.parent == root:
+                world = obj.matrix_world.copy()
+                obj.parent = None
+                obj.matrix_world = world
+        bpy.data.objects.remove(root, do_unlink=True)
+
+    return merged
+
+
+def merge_static_scene(keep=KEEP_SEPARATE):
+    """Aplica merge_static_prop a cada colección de la escena que tenga un *_ROOT."""
+    total_before = total_after = 0
+    for collection in bpy.context.scene.collection.children:
+        if find_root(collection) is None:
+            continue
+        before = len(collection.objects)
+        merge_static_prop(collection, keep)
+        after = len(collection.objects)
+        total_before += before
+        total_after += after
+        print(f"{collection.name}: {before} -> {after} objetos")
+    print(f"Fusión estática: {total_before} -> {total_after} objetos en total.")
+
+
+if __name__ == "__main__":
+    merge_static_scene()
@@ -1,6 +1,11 @@
 import bpy
 import math
 
+import batch
+import material_library
+import primitives
+
+@batch.BatchGeneration("Cama gamer")
 def create_gamer_bed():
     collection_name = "Cama_Gamer"
     collection = bpy.data.collections.new(collection_name)
@@ -8,20 +13,7 @@ def create_gamer_bed():
 
     # --- MATERIALES ---
     def create_material(name, color, roughness=0.8):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            nodes = mat.node_tree.nodes
-            nodes.clear()
-            output = nodes.new('ShaderNodeOutputMaterial')
-            output.location = (400, 0)
-            shader = nodes.new('ShaderNodeBsdfPrincipled')
-            shader.inputs['Base Color'].default_value = color
-            shader.inputs['Roughness'].default_value = roughness
-            shader.location = (0, 0)
-            mat.node_tree.links.new(shader.outputs[0], output.inputs['Surface'])
-        return mat
+        return material_library.get_material(name, color, roughness=roughness)
 
     mat_frame = create_material("Bed_Frame_Black", (0.05, 0.05, 0.05, 1), roughness=0.4)
     mat_mattress = create_material("Bed_Mattress_White", (0.9, 0.9, 0.95, 1), roughness=0.9)
@@ -30,23 +22,13 @@ def create_gamer_bed():
 
     # --- HELPERS ---
     def create_cube(name, loc, scale, mat=None):
-        bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        if mat:
-            if obj.data.materials: obj.data.materials[0] = mat
-            else: obj.data.materials.append(mat)
-        for coll in obj.users_collection: coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        return obj
+        return primitives.add_primitive(collection, 'CUBE', name, loc, scale, material=mat)
 
     def add_softness(obj, bevel_width=0.05):
-        bpy.context.view_layer.objects.active = obj
         mod = obj.modifiers.new(name="Bevel", type='BEVEL')
         mod.width = bevel_width
         mod.segments = 5
-        bpy.ops.object.shade_smooth()
+        primitives.shade_smooth(obj)
 
     # --- DIMENSIONES ---
     bed_w = 1.6  # Cama Queen/Matrimonial
@@ -96,17 +78,7 @@ def create_gamer_bed():
     add_softness(p2, 0.08)
 
     # --- ROOT OBJECT ---
-    bpy.ops.object.empty_add(type='ARROWS', location=(0, 0, 0))
-    root = bpy.context.active_object
-    root.name = "Cama_Gamer_ROOT"
-    collection.objects.link(root)
-    for coll in root.users_collection:
-        if coll != collection: coll.objects.unlink(root)
-
-    # Emparentar
-    for obj in collection.objects:
-        if obj != root:
-            obj.parent = root
+    root = primitives.add_root(collection, "Cama_Gamer_ROOT")
 
     # Posicionar en la habitación (esquina opuesta al escritorio)
     root.location = (2.5, 2.5, 0)
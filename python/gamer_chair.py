@@ -1,11 +1,14 @@
 import bpy
 import math
 
+import batch
+import primitives
+
+@batch.BatchGeneration("Silla gamer")
 def create_gamer_chair():
     # Limpiar la escena (opcional, ten cuidado si tienes otras cosas)
-    bpy.ops.object.select_all(action='DESELECT')
-    bpy.ops.object.select_by_type(type='MESH')
-    bpy.ops.object.delete()
+    for obj in [o for o in bpy.context.scene.objects if o.type == 'MESH']:
+        bpy.data.objects.remove(obj, do_unlink=True)
 
     # Colección para la silla
     collection = bpy.data.collections.new("SillaGamer")
@@ -13,25 +16,12 @@ def create_gamer_chair():
     
     # Helper para crear objetos y asignarlos a la colección
     def create_cube(name, location, scale, rotation=(0,0,0)):
-        bpy.ops.mesh.primitive_cube_add(size=1, location=location, rotation=rotation)
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        # Mover a la colección
-        for coll in obj.users_collection:
-            coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        return obj
+        return primitives.add_primitive(collection, 'CUBE', name, location, scale, rotation)
 
     def create_cylinder(name, location, radius, depth, rotation=(0,0,0)):
-        bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=depth, location=location, rotation=rotation)
-        obj = bpy.context.active_object
-        obj.name = name
-        # Mover a la colección
-        for coll in obj.users_collection:
-            coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        return obj
+        # El cilindro unitario tiene radio 0.5 y altura 1
+        return primitives.add_primitive(collection, 'CYLINDER', name, location,
+                                        (radius * 2, radius * 2, depth), rotation)
 
     # 1. Asiento
     seat = create_cube("Asiento", (0, 0, 0.5), (0.6, 0.6, 0.1))
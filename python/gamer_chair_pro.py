@@ -1,6 +1,11 @@
 import bpy
 import math
 
+import batch
+import material_library
+import primitives
+
+@batch.BatchGeneration("Silla gamer pro")
 def create_gamer_chair():
     # NOTA: Ya no borramos los objetos existentes para respetar tu escena.
     
@@ -11,21 +16,7 @@ def create_gamer_chair():
     
     # --- MATERIALES ---
     def create_material(name, color, roughness=0.5, metallic=0.0):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            
-            # Buscar el nodo por tipo para evitar errores de idioma o versión
-            bsdf = next((n for n in mat.node_tree.nodes if n.type == 'BSDF_PRINCIPLED'), None)
-            
-            if not bsdf:
-                bsdf = mat.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
-                
-            bsdf.inputs['Base Color'].default_value = color
-            bsdf.inputs['Roughness'].default_value = roughness
-            bsdf.inputs['Metallic'].default_value = metallic
-        return mat
+        return material_library.get_material(name, color, roughness=roughness, metallic=metallic)
 
     mat_black = create_material("Gamer_Black_Leather", (0.05, 0.05, 0.05, 1), 0.4)
     mat_red = create_material("Gamer_Red_Accent", (0.8, 0.05, 0.05, 1), 0.4)
@@ -35,35 +26,13 @@ def create_gamer_chair():
     # --- HELPERS ---
     def add_bevel(obj, width=0.015, segments=3):
         """Añade un modificador de biselado para que no se vea tan 'low poly'"""
-        bpy.context.view_layer.objects.active = obj
         mod = obj.modifiers.new(name="Bevel", type='BEVEL')
         mod.width = width
         mod.segments = segments
-        bpy.ops.object.shade_smooth() # Suavizar sombreado
+        primitives.shade_smooth(obj) # Suavizar sombreado
 
     def create_primitive(type, name, location, scale, rotation=(0,0,0), material=None):
-        if type == 'CUBE':
-            bpy.ops.mesh.primitive_cube_add(size=1, location=location, rotation=rotation)
-        elif type == 'CYLINDER':
-            bpy.ops.mesh.primitive_cylinder_add(radius=0.5, depth=1, location=location, rotation=rotation)
-        
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        
-        # Asignar material
-        if material:
-            if obj.data.materials:
-                obj.data.materials[0] = material
-            else:
-                obj.data.materials.append(material)
-        
-        # Mover a la colección
-        for coll in obj.users_collection:
-            coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        
-        return obj
+        return primitives.add_primitive(collection, type, name, location, scale, rotation, material)
 
     # --- CONSTRUCCIÓN ---
 
@@ -144,19 +113,8 @@ def create_gamer_chair():
         wheel = create_primitive('CYLINDER', f"Rueda_{i}", (wx, wy, 0.03), (0.08, 0.08, 0.04), (0, math.radians(90), angle), mat_black)
 
     # Crear un objeto Empty para mover toda la silla junta fácilmente
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0, 0, 0))
-    root = bpy.context.active_object
-    root.name = "SillaGamer_ROOT"
-    collection.objects.link(root)
-    # Mover root a la colección correcta si se creó fuera
-    for coll in root.users_collection:
-        if coll != collection:
-            coll.objects.unlink(root)
-
-    # Emparentar todo al root
-    for obj in collection.objects:
-        if obj != root:
-            obj.parent = root
+    # (add_root también emparenta todo al root)
+    root = primitives.add_root(collection, "SillaGamer_ROOT", 'PLAIN_AXES')
 
     # --- AJUSTES FINALES (Escala y Rotación) ---
     # Ajusta estos números si la silla sale muy chica o mal orientada
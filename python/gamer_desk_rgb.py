@@ -1,6 +1,11 @@
 import bpy
 import math
 
+import batch
+import material_library
+import primitives
+
+@batch.BatchGeneration("Escritorio gamer RGB")
 def create_gamer_desk_with_rgb():
     collection_name = "Escritorio_Gamer_RGB"
     # Verificar si ya existe la colección, si no crearla
@@ -12,49 +17,15 @@ def create_gamer_desk_with_rgb():
 
     # --- MATERIALES ---
     def create_material(name, color, roughness=0.5, emission=False, emission_strength=1.0):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            nodes = mat.node_tree.nodes
-            nodes.clear()
-            output = nodes.new('ShaderNodeOutputMaterial')
-            output.location = (400, 0)
-            
-            if emission:
-                shader = nodes.new('ShaderNodeEmission')
-                shader.inputs['Color'].default_value = color
-                shader.inputs['Strength'].default_value = emission_strength
-            else:
-                shader = nodes.new('ShaderNodeBsdfPrincipled')
-                shader.inputs['Base Color'].default_value = color
-                shader.inputs['Roughness'].default_value = roughness
-            
-            shader.location = (0, 0)
-            mat.node_tree.links.new(shader.outputs[0], output.inputs['Surface'])
-        return mat
+        return material_library.get_material(name, color, roughness=roughness, emission=emission,
+                                             emission_strength=emission_strength)
 
     mat_desk_black = create_material("Desk_Black_Carbon", (0.05, 0.05, 0.05, 1), roughness=0.3)
     mat_rgb_strip = create_material("Desk_RGB_Rainbow", (1.0, 0.0, 1.0, 1), emission=True, emission_strength=5.0) # Magenta neon
 
     # --- HELPERS ---
     def create_obj(type, name, loc, scale, rot=(0,0,0), mat=None):
-        if type == 'CUBE':
-            bpy.ops.mesh.primitive_cube_add(size=1, location=loc, rotation=rot)
-        elif type == 'CYLINDER':
-            bpy.ops.mesh.primitive_cylinder_add(radius=0.5, depth=1, location=loc, rotation=rot)
-            
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        
-        if mat:
-            if obj.data.materials: obj.data.materials[0] = mat
-            else: obj.data.materials.append(mat)
-            
-        for coll in obj.users_collection: coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        return obj
+        return primitives.add_primitive(collection, type, name, loc, scale, rot, mat)
 
     # --- DIMENSIONES ---
     desk_w = 2.0
@@ -93,17 +64,7 @@ def create_gamer_desk_with_rgb():
     # pero aquí configuramos un color base vibrante.
     
     # --- ROOT OBJECT ---
-    bpy.ops.object.empty_add(type='ARROWS', location=(0, 0, 0))
-    root = bpy.context.active_object
-    root.name = "Escritorio_Gamer_ROOT"
-    collection.objects.link(root)
-    for coll in root.users_collection:
-        if coll != collection: coll.objects.unlink(root)
-
-    # Emparentar
-    for obj in collection.objects:
-        if obj != root:
-            obj.parent = root
+    root = primitives.add_root(collection, "Escritorio_Gamer_ROOT")
 
     # Posicionar (En el centro, donde debería ir)
     root.location = (0, 0, 0)
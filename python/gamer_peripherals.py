@@ -1,6 +1,11 @@
 import bpy
 import math
 
+import batch
+import material_library
+import primitives
+
+@batch.BatchGeneration("Periféricos gamer")
 def create_peripherals():
     collection_name = "Perifericos_Gamer"
     collection = bpy.data.collections.new(collection_name)
@@ -8,28 +13,8 @@ def create_peripherals():
 
     # --- MATERIALES ---
     def create_material(name, color, emission=False, emission_strength=1.0):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            nodes = mat.node_tree.nodes
-            nodes.clear()
-            output = nodes.new('ShaderNodeOutputMaterial')
-            output.location = (400, 0)
-            
-            if emission:
-                shader = nodes.new('ShaderNodeEmission')
-                shader.inputs['Color'].default_value = color
-                shader.inputs['Strength'].default_value = emission_strength
-            else:
-                shader = nodes.new('ShaderNodeBsdfPrincipled')
-                shader.inputs['Base Color'].default_value = color
-                shader.inputs['Roughness'].default_value = 0.4
-                shader.inputs['Metallic'].default_value = 0.1
-            
-            shader.location = (0, 0)
-            mat.node_tree.links.new(shader.outputs[0], output.inputs['Surface'])
-        return mat
+        return material_library.get_material(name, color, roughness=0.4, metallic=0.1, emission=emission,
+                                             emission_strength=emission_strength)
 
     mat_black = create_material("Peri_Black_Plastic", (0.05, 0.05, 0.05, 1))
     mat_screen = create_material("Peri_Screen_Glow", (0.05, 0.1, 0.2, 1), emission=True, emission_strength=2.0)
@@ -38,30 +23,9 @@ def create_peripherals():
 
     # --- HELPERS ---
     def create_obj(type, name, loc, scale, rot=(0,0,0), mat=None):
-        if type == 'CUBE':
-            bpy.ops.mesh.primitive_cube_add(size=1, location=loc, rotation=rot)
-        elif type == 'CYLINDER':
-            bpy.ops.mesh.primitive_cylinder_add(radius=0.5, depth=1, location=loc, rotation=rot)
-        elif type == 'SPHERE':
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=0.5, location=loc, rotation=rot)
-            
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        
-        if mat:
-            if obj.data.materials: obj.data.materials[0] = mat
-            else: obj.data.materials.append(mat)
-        
-        # Mover a colección
-        for coll in obj.users_collection: coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        
         # Suavizar si es esfera o cilindro
-        if type in ['SPHERE', 'CYLINDER']:
-            bpy.ops.object.shade_smooth()
-            
-        return obj
+        return primitives.add_primitive(collection, type, name, loc, scale, rot, mat,
+                                        smooth=type in ['SPHERE', 'CYLINDER'])
 
     # --- 1. MONITOR ---
     # Base
@@ -71,9 +35,12 @@ def create_peripherals():
     
     # Pantalla (Cuerpo)
     screen_w, screen_h = 1.2, 0.7
-    create_obj('CUBE', "Monitor_Body", (0, 0, 0.6), (screen_w, 0.05, screen_h), mat=mat_black)
+    monitor_body = create_obj('CUBE', "Monitor_Body", (0, 0, 0.6), (screen_w, 0.05, screen_h), mat=mat_black)
     # Pantalla (Panel luminoso)
-    create_obj('CUBE', "Monitor_Panel", (0, -0.026, 0.6), (screen_w-0.05, 0.01, screen_h-0.05), mat=mat_screen)
+    monitor_panel = create_obj('CUBE', "Monitor_Panel", (0, -0.026, 0.6), (screen_w-0.05, 0.01, screen_h-0.05), mat=mat_screen)
+    # Clic en el monitor abre la PC en el visor (pick_proxies.py)
+    monitor_body["interactive"] = "computer"
+    monitor_panel["interactive"] = "computer"
 
     # --- 2. TECLADO ---
     # Ubicación relativa al centro
@@ -104,17 +71,8 @@ def create_peripherals():
     create_obj('CYLINDER', "Mouse_Wheel", (mouse_x, mouse_y + 0.08, 0.06), (0.02, 0.02, 0.01), (0, math.radians(90), 0), mat=mat_mouse_led)
 
     # --- ROOT OBJECT ---
-    bpy.ops.object.empty_add(type='ARROWS', location=(0, 0, 0))
-    root = bpy.context.active_object
-    root.name = "Perifericos_ROOT"
-    collection.objects.link(root)
-    for coll in root.users_collection:
-        if coll != collection: coll.objects.unlink(root)
-
     # Emparentar todo al root
-    for obj in collection.objects:
-        if obj != root:
-            obj.parent = root
+    root = primitives.add_root(collection, "Perifericos_ROOT")
             
     # --- AJUSTES FINALES ---
     # Escalar y posicionar sobre el escritorio
@@ -1,5 +1,10 @@
 import bpy
 
+import batch
+import material_library
+import primitives
+
+@batch.BatchGeneration("Habitación gamer")
 def create_gamer_room():
     collection_name = "Gamer_Room"
     collection = bpy.data.collections.new(collection_name)
@@ -7,23 +12,7 @@ def create_gamer_room():
 
     # --- MATERIALES ---
     def create_material(name, color, roughness=0.5, texture_type=None):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            nodes = mat.node_tree.nodes
-            nodes.clear()
-            
-            output = nodes.new('ShaderNodeOutputMaterial')
-            output.location = (400, 0)
-            
-            shader = nodes.new('ShaderNodeBsdfPrincipled')
-            shader.location = (0, 0)
-            shader.inputs['Base Color'].default_value = color
-            shader.inputs['Roughness'].default_value = roughness
-            
-            mat.node_tree.links.new(shader.outputs['BSDF'], output.inputs['Surface'])
-        return mat
+        return material_library.get_material(name, color, roughness=roughness)
 
     # Colores oscuros para ambiente gamer
     mat_floor = create_material("Room_Floor_DarkWood", (0.05, 0.03, 0.01, 1), roughness=0.3)
@@ -32,18 +21,7 @@ def create_gamer_room():
 
     # --- HELPERS ---
     def create_cube(name, loc, scale, mat=None):
-        bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        
-        if mat:
-            if obj.data.materials: obj.data.materials[0] = mat
-            else: obj.data.materials.append(mat)
-            
-        for coll in obj.users_collection: coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        return obj
+        return primitives.add_primitive(collection, 'CUBE', name, loc, scale, material=mat)
 
     # --- DIMENSIONES ---
     # Hacemos la habitación grande para que quepa todo
@@ -0,0 +1,146 @@
+import bpy
+import os
+import shutil
+import subprocess
+import time
+from collections import namedtuple
+
+# Exportación del GLB del visor web con perfiles de compresión.
+#
+# El visor descarga setup_gamer.glb en cada carga de página, así que los bytes
+# importan. Perfiles:
+#   none      GLB tal cual (posiciones/normales/UV en float32)
+#   draco     KHR_draco_mesh_compression con la cuantización por defecto
+#   draco-max Draco con nivel máximo y cuantización más agresiva
+#   quantize  KHR_mesh_quantization (enteros de 8/16 bits), vía gltfpack
+#   meshopt   quantize + EXT_meshopt_compression, vía gltfpack
+#
+# El exportador de Blender solo sabe Draco; los perfiles de gltfpack exportan
+# sin comprimir y pasan el resultado por la herramienta (en el PATH o en la
+# variable de entorno GLTFPACK). viewer_3d.js registra los dos decodificadores.
+
+Profile = namedtuple("Profile", "description options gltfpack", defaults=({}, None))
+
+# Bits de cuantización: posición, normal, UV
+PROFILES = {
+    "none": Profile("Sin compresión"),
+    "draco": Profile("Draco, cuantización 14/10/12", {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": 6,
+        "export_draco_position_quantization": 14,
+        "export_draco_normal_quantization": 10,
+        "export_draco_texcoord_quantization": 12,
+    }),
+    "draco-max": Profile("Draco nivel 10, cuantización 12/8/10", {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": 10,
+        "export_draco_position_quantization": 12,
+        "export_draco_normal_quantization": 8,
+        "export_draco_texcoord_quantization": 10,
+    }),
+    "quantize": Profile("KHR_mesh_quantization 14/8/12 (gltfpack)",
+                        gltfpack=["-vp", "14", "-vn", "8", "-vt", "12"]),
+    "meshopt": Profile("Cuantizado + EXT_meshopt_compression (gltfpack)",
+                       gltfpack=["-vp", "14", "-vn", "8", "-vt", "12", "-c"]),
+}
+
+# gltfpack no debe tocar lo que el visor busca por nombre ni los extras
+GLTFPACK_KEEP = ["-kn", "-km", "-ke"]
+
+BASE_OPTIONS = {
+    "export_format": 'GLB',
+    "export_apply": True,    # Aplica los biselados
+    "export_extras": True,
+    # Las pistas NLA con el mismo nombre (Walk, Idle de minecraft_steve.py) se
+    # exportan juntas como una animación glTF
+    "export_animation_mode": 'NLA_TRACKS',
+}
+
+
+def find_gltfpack():
+    return os.environ.get("GLTFPACK") or shutil.which("gltfpack")
+
+
+def available(profile):
+    """False si el perfil necesita gltfpack y no está instalado."""
+    return PROFILES[profile].gltfpack is None or find_gltfpack() is not None
+
+
+def export_glb(path, profile="none"):
+    """Exporta la escena actual como GLB con el perfil de compresión indicado."""
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    spec = PROFILES[profile]
+
+    if spec.gltfpack is None:
+        bpy.ops.export_scene.gltf(filepath=path, **BASE_OPTIONS, **spec.options)
+        return path
+
+    tool = find_gltfpack()
+    if tool is None:
+        raise RuntimeError(f"El perfil '{profile}' necesita gltfpack (instálalo o define GLTFPACK)")
+    raw = os.path.splitext(path)[0] + ".raw.glb"
+    bpy.ops.export_scene.gltf(filepath=raw, **BASE_OPTIONS)
+    try:
+        subprocess.run([tool, "-i", raw, "-o", path] + GLTFPACK_KEEP + spec.gltfpack,
+                       check=True, capture_output=True, text=True)
+    finally:
+        os.remove(raw)
+    return path
+
+
+def decode_time(path):
+    """Segundos que tarda Blender en importar el GLB en una escena vacía.
+
+    No es el tiempo del navegador, pero sí compara el coste de decodificar
+    Draco frente a un GLB plano. None si el importador no soporta el archivo
+    (el de Blender no lee EXT_meshopt_compression).
+    """
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    start = time.perf_counter()
+    try:
+        result = bpy.ops.import_scene.gltf(filepath=path)
+    except RuntimeError:
+        return None
+    if 'FINISHED' not in result:
+        return None
+    return time.perf_counter() - start
+
+
+def benchmark(directory, name="setup_gamer", profiles=None):
+    """Exporta la escena actual con cada perfil y mide tamaño, exportación y decodificación.
+
+    Para medir la decodificación se reimporta cada archivo en una escena
+    vacía, así que la escena actual se pierde: llamar después de guardar.
+    """
+    rows = []
+    for profile in profiles or PROFILES:
+        if not available(profile):
+            print(f"ADVERTENCIA: se omite el perfil '{profile}' (no se encontró gltfpack).")
+            continue
+        path = os.path.join(directory, f"{name}-{profile}.glb")
+        start = time.perf_counter()
+        export_glb(path, profile)
+        rows.append({
+            "profile": profile,
+            "path": path,
+            "bytes": os.path.getsize(path),
+            "export_s": round(time.perf_counter() - start, 6),
+        })
+
+    for row in rows:
+        seconds = decode_time(row["path"])
+        row["decode_s"] = None if seconds is None else round(seconds, 6)
+    return rows
+
+
+def print_benchmark(rows):
+    base = next((r["bytes"] for r in rows if r["profile"] == "none"), None)
+    print()
+    print(f"{'Perfil':<10}  {'KB':>8}  {'vs none':>7}  {'Export (s)':>10}  {'Decod. (s)':>10}")
+    print("-" * 53)
+    for row in rows:
+        ratio = f"{row['bytes'] / base:6.0%}" if base else "      -"
+        decode = "n/d" if row["decode_s"] is None else f"{row['decode_s']:.3f}"
+        print(f"{row['profile']:<10}  {row['bytes'] / 1024:8.1f}  {ratio:>7}  "
+              f"{row['export_s']:10.3f}  {decode:>10}")
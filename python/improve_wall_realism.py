@@ -1,9 +1,15 @@
 import bpy
 
+import batch
+import material_library
+
+@batch.BatchGeneration("Material de pared realista")
 def improve_wall_material():
     # Nombre del material creado en gamer_room.py
     mat_name = "Room_Wall_DarkGrey"
-    mat = bpy.data.materials.get(mat_name)
+    # Puede haberse deduplicado con otro nombre; edit_material lo saca del
+    # registro para que nadie más reciba la pared procedural
+    mat = material_library.edit_material(mat_name)
     
     if not mat:
         print(f"Material '{mat_name}' no encontrado. Asegúrate de haber creado la habitación primero (gamer_room.py).")
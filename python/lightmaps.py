@@ -0,0 +1,311 @@
+import bpy
+import hashlib
+import json
+import os
+
+import bake_textures
+import material_library
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Lightmaps de la geometría estática de la habitación para el visor web.
+#
+# El visor ilumina en tiempo real (hemisférica, direccional con sombras 2048
+# y una puntual) y no ve la luz de los materiales emisivos (RGB_Blue a 15,
+# Desk_RGB_Rainbow, Shelf_LED_White). Aquí se hornea en CPU con Cycles, sobre
+# un atlas compartido en un segundo mapa UV (LightmapUV):
+#   light  luz difusa que sale de cada superficie (directa + indirecta, con
+#          el color del material) debida SOLO a los materiales emisivos: las
+#          lámparas y el mundo se apagan durante el horneado, porque esa luz
+#          ya la ponen las luces en tiempo real del visor y contaría dos veces
+#   ao     oclusión ambiental
+# y se exporta en el propio GLB con materiales estándar de glTF: light como
+# textura emisiva y ao como occlusionTexture, ambas en TEXCOORD_1. Three.js
+# las aplica sin código extra, así que el visor puede quitar las sombras
+# dinámicas en equipos modestos y seguir viendo el brillo.
+#
+# Los objetos horneados usan copias <material>_LM (el occlusionTexture va en
+# el material) y mallas propias (cada uno necesita su región del atlas). El
+# atlas se guarda en build/cache/lightmaps con una clave de toda la escena:
+# geometría, transformaciones, materiales y modificadores.
+
+CACHE_DIR = os.path.join(os.path.dirname(_script_dir), "build", "cache", "lightmaps")
+
+STATIC_COLLECTIONS = ("Gamer_Room", "Escritorio_Gamer_RGB", "Cama_Gamer", "Mueble_Coleccionables")
+
+LIGHTMAP_UV = "LightmapUV"
+LIGHTMAP_RESOLUTION = 1024
+LIGHTMAP_SAMPLES = 64
+LIGHTMAP_MARGIN = 4
+IMAGE_FORMAT = 'JPEG'
+
+# nombre del pase, tipo de bake, pass_filter, espacio de color
+PASSES = [
+    ("light", 'DIFFUSE', {'DIRECT', 'INDIRECT', 'COLOR'}, 'sRGB'),
+    ("ao", 'AO', set(), 'Non-Color'),
+]
+
+# El exportador glTF reconoce este grupo por su nombre (entrada Occlusion)
+GLTF_OUTPUT_GROUP = "glTF Material Output"
+
+
+def static_objects(collections=STATIC_COLLECTIONS):
+    """Mallas de las colecciones estáticas que no son emisivas (esas ya brillan)."""
+    objects = []
+    for name in collections:
+        collection = bpy.data.collections.get(name)
+        if collection is None:
+            continue
+        for obj in collection.all_objects:
+            if obj.type != 'MESH':
+                continue
+            materials = [s.material for s in obj.material_slots if s.material]
+            if materials and not any(material_library.is_emission(m) for m in materials):
+                objects.append(obj)
+    return objects
+
+
+def scene_key(objects, resolution):
+    """Huella de todo lo que influye en la luz horneada."""
+    scene_objects = []
+    materials = {}
+    for obj in sorted(bpy.context.scene.objects, key=lambda o: o.name):
+        if obj.type != 'MESH':
+            continue
+        slots = [s.material for s in obj.material_slots if s.material]
+        for mat in slots:
+            if mat.use_nodes:
+                materials[mat.name] = bake_textures.node_tree_params(mat.node_tree)
+        scene_objects.append({
+            "name": obj.name,
+            "matrix": [round(v, 5) for row in obj.matrix_world for v in row],
+            "geometry": bake_textures.geometry_hash(obj.data),
+            "materials": [m.name for m in slots],
+            "modifiers": [[m.type, round(getattr(m, "width", 0.0), 6), getattr(m, "segments", 0)]
+                          for m in obj.modifiers],
+        })
+
+    payload = {
+        "objects": scene_objects,
+        "materials": materials,
+        "static": sorted(o.name for o in objects),
+        "resolution": resolution,
+        "samples": LIGHTMAP_SAMPLES,
+        # Invalida los atlas horneados antes con las lámparas y el mundo encendidos
+        "light": "emitters-only",
+        "blender": bpy.app.version_string,
+    }
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:20]
+
+
+def _image_path(key, pass_name):
+    extension = ".jpg" if IMAGE_FORMAT == 'JPEG' else ".png"
+    return os.path.join(CACHE_DIR, f"{key}_{pass_name}{extension}")
+
+
+def _load_cached(key):
+    paths = {name: _image_path(key, name) for name, _, _, _ in PASSES}
+    if not all(os.path.exists(p) for p in paths.values()):
+        return None
+
+    images = {}
+    for name, _, _, colorspace in PASSES:
+        image = bpy.data.images.load(paths[name], check_existing=True)
+        image.colorspace_settings.name = colorspace
+        images[name] = image
+    return images
+
+
+def _make_single_user(obj):
+    """Malla propia para el objeto: el atlas necesita UVs distintas por objeto."""
+    if obj.data.users > 1 or obj.data.get("shared_primitive"):
+        mesh = obj.data.copy()
+        for key in ("shared_primitive", "shared_name"):
+            if key in mesh:
+                del mesh[key]
+        obj.data = mesh
+
+
+def _select_only(objects):
+    view_layer = bpy.context.view_layer
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    view_layer.objects.active = objects[0]
+
+
+def _pack_lightmap_uvs(objects, resolution):
+    """Crea LightmapUV en cada malla y las empaqueta todas en un mismo atlas."""
+    for obj in objects:
+        layers = obj.data.uv_layers
+        layer = layers.get(LIGHTMAP_UV) or layers.new(name=LIGHTMAP_UV)
+        layers.active = layer
+
+    _select_only(objects)
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_all(action='SELECT')
+    bpy.ops.uv.lightmap_pack(PREF_CONTEXT='ALL_FACES', PREF_PACK_IN_ONE=True,
+                             PREF_NEW_UVLAYER=False, PREF_APPLY_IMAGE=False,
+                             PREF_IMG_PX_SIZE=resolution, PREF_MARGIN_DIV=0.2)
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+
+def _lightmap_materials(objects):
+    """Sustituye los materiales de los objetos por copias <nombre>_LM."""
+    copies = {}
+    for obj in objects:
+        for slot in obj.material_slots:
+            mat = slot.material
+            if mat is None or mat.name.endswith("_LM"):
+                continue
+            if mat not in copies:
+                copy = bpy.data.materials.get(f"{mat.name}_LM")
+                if copy is None:
+                    copy = mat.copy()
+                    copy.name = f"{mat.name}_LM"
+                    # Que material_library no la confunda con el original
+                    for key in ("param_hash", "material_params", "aliases"):
+                        if key in copy:
+                            del copy[key]
+                copies[mat] = copy
+            slot.material = copies[mat]
+    return sorted({s.material for o in objects for s in o.material_slots if s.material},
+                  key=lambda m: m.name)
+
+
+def _emitters_only(scene):
+    """Apaga lámparas y mundo para hornear solo la luz de los emisivos.
+
+    Devuelve una función que lo deja todo como estaba.
+    """
+    lamps = [obj for obj in scene.objects if obj.type == 'LIGHT' and not obj.hide_render]
+    for obj in lamps:
+        obj.hide_render = True
+
+    # Mundo negro; si había uno se copia para conservar la distancia de AO
+    saved_world = scene.world
+    world = saved_world.copy() if saved_world is not None else bpy.data.worlds.new("Lightmap_World")
+    world.use_nodes = False
+    world.color = (0.0, 0.0, 0.0)
+    scene.world = world
+
+    def restore():
+        for obj in lamps:
+            obj.hide_render = False
+        scene.world = saved_world
+        bpy.data.worlds.remove(world)
+    return restore
+
+
+def _bake(objects, materials, key, resolution):
+    scene = bpy.context.scene
+    saved = (scene.render.engine, scene.cycles.device, scene.cycles.samples)
+    restore_lights = _emitters_only(scene)
+
+    targets = []
+    for mat in materials:
+        node = mat.node_tree.nodes.new('ShaderNodeTexImage')
+        mat.node_tree.nodes.active = node
+        targets.append((mat, node))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        scene.render.engine = 'CYCLES'
+        scene.cycles.device = 'CPU'
+        scene.cycles.samples = LIGHTMAP_SAMPLES
+        _select_only(objects)
+        for name, bake_type, pass_filter, colorspace in PASSES:
+            image = bpy.data.images.new(f"Lightmap_{name}", resolution, resolution)
+            image.colorspace_settings.name = colorspace
+            for _, node in targets:
+                node.image = image
+            print(f"Horneando lightmap '{name}' ({len(objects)} objetos, {resolution}x{resolution})...")
+            bpy.ops.object.bake(type=bake_type, pass_filter=pass_filter,
+                                margin=LIGHTMAP_MARGIN, use_clear=True)
+            image.filepath_raw = _image_path(key, name)
+            image.file_format = IMAGE_FORMAT
+            image.save()
+            bpy.data.images.remove(image)
+    finally:
+        for mat, node in targets:
+            mat.node_tree.nodes.remove(node)
+        scene.render.engine, scene.cycles.device, scene.cycles.samples = saved
+        restore_lights()
+
+    return _load_cached(key)
+
+
+def _gltf_output_group():
+    group = bpy.data.node_groups.get(GLTF_OUTPUT_GROUP)
+    if group is None:
+        group = bpy.data.node_groups.new(GLTF_OUTPUT_GROUP, 'ShaderNodeTree')
+        group.interface.new_socket("Occlusion", in_out='INPUT', socket_type='NodeSocketFloat')
+    return group
+
+
+def _wire_lightmap(mat, images):
+    """Conecta light a la emisión y ao al Occlusion de glTF, leyendo LightmapUV."""
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    bsdf = next((n for n in nodes if n.type == 'BSDF_PRINCIPLED'), None)
+    if bsdf is None or bsdf.inputs['Emission Color'].is_linked:
+        return
+
+    uv = nodes.new('ShaderNodeUVMap')
+    uv.uv_map = LIGHTMAP_UV
+    uv.location = (-900, -500)
+
+    light = nodes.new('ShaderNodeTexImage')
+    light.image = images["light"]
+    light.location = (-600, -450)
+    links.new(uv.outputs['UV'], light.inputs['Vector'])
+    links.new(light.outputs['Color'], bsdf.inputs['Emission Color'])
+    bsdf.inputs['Emission Strength'].default_value = 1.0
+
+    ao = nodes.new('ShaderNodeTexImage')
+    ao.image = images["ao"]
+    ao.location = (-600, -750)
+    links.new(uv.outputs['UV'], ao.inputs['Vector'])
+    separate = nodes.new('ShaderNodeSeparateColor')
+    separate.location = (-300, -750)
+    links.new(ao.outputs['Color'], separate.inputs['Color'])
+    output = nodes.new('ShaderNodeGroup')
+    output.node_tree = _gltf_output_group()
+    output.location = (0, -750)
+    links.new(separate.outputs['Red'], output.inputs['Occlusion'])
+
+
+def bake_lightmaps(collections=STATIC_COLLECTIONS, resolution=LIGHTMAP_RESOLUTION):
+    """Hornea (o carga de la caché) el atlas de luz y AO de la geometría estática."""
+    objects = static_objects(collections)
+    if not objects:
+        print("No hay geometría estática para hornear lightmaps.")
+        return None
+
+    # La huella se calcula antes de tocar mallas y materiales
+    key = scene_key(objects, resolution)
+
+    for obj in objects:
+        _make_single_user(obj)
+    _pack_lightmap_uvs(objects, resolution)
+    materials = _lightmap_materials(objects)
+
+    images = _load_cached(key)
+    if images is None:
+        images = _bake(objects, materials, key, resolution)
+    else:
+        print(f"Lightmaps en caché ({key}).")
+
+    for mat in materials:
+        _wire_lightmap(mat, images)
+    # Las texturas de color siguen usando el primer mapa UV
+    for obj in objects:
+        obj.data.uv_layers.active_index = 0
+    print(f"Lightmaps: {len(objects)} objetos, {len(materials)} materiales _LM.")
+    return images
+
+
+if __name__ == "__main__":
+    bake_lightmaps()
@@ -0,0 +1,106 @@
+import bpy
+from collections import namedtuple
+
+import finalize
+import primitives
+
+# Niveles de detalle (LOD) para los props redondeados y biselados.
+#
+# Casi todos los triángulos salen de los biselados de 3-5 segmentos (cama,
+# silla, Switch) y de las esferas y cilindros (cabezas, manos, ruedas). De
+# lejos solo se ve la silueta. Para cada prop con *_ROOT se crean empties
+# <Prop>_LOD0..N colgando del ROOT:
+#   LOD0  las piezas originales que se pueden reducir
+#   LOD1+ copias de esas piezas (comparten malla) con menos segmentos de
+#         bisel y un Decimate en las primitivas con muchos vértices
+# Las piezas que ningún nivel cambiaría (cubos sin bisel) se quedan colgando
+# del ROOT y se ven siempre: copiarlas solo multiplicaría los nodos del GLB.
+# El ROOT guarda las distancias en "lod_distances" y cada empty su nivel en
+# "lod_level"; viewer_3d.js monta un THREE.LOD con ellos. Los objetos que el
+# visor busca por nombre (finalize.KEEP_SEPARATE) no entran en los niveles.
+
+# distance: a partir de qué distancia de la cámara se usa el nivel
+# bevel_factor: segmentos de bisel respecto al original (0 quita el bisel)
+# decimate: ratio del Decimate en las mallas de más de DECIMATE_MIN_VERTS
+LodLevel = namedtuple("LodLevel", "distance bevel_factor decimate")
+
+LEVELS = (
+    LodLevel(8.0, 0.5, 0.5),
+    LodLevel(16.0, 0.0, 0.25),
+)
+
+# Cubo 8, cilindro 64, esfera 482
+DECIMATE_MIN_VERTS = 48
+
+
+def _reduce(obj, level):
+    """Aplica la reducción de un nivel a una copia."""
+    for mod in list(obj.modifiers):
+        if mod.type != 'BEVEL':
+            continue
+        segments = int(mod.segments * level.bevel_factor)
+        if segments < 1:
+            obj.modifiers.remove(mod)
+        else:
+            mod.segments = segments
+
+    if len(obj.data.vertices) > DECIMATE_MIN_VERTS:
+        mod = obj.modifiers.new(name="LOD_Decimate", type='DECIMATE')
+        mod.decimate_type = 'COLLAPSE'
+        mod.ratio = level.decimate
+
+
+def _reducible(obj):
+    return (any(m.type == 'BEVEL' for m in obj.modifiers)
+            or len(obj.data.vertices) > DECIMATE_MIN_VERTS)
+
+
+def generate_prop_lods(collection, levels=LEVELS, keep=finalize.KEEP_SEPARATE):
+    """Crea los niveles de un prop. Devuelve los empties LOD (vacío si no merece la pena)."""
+    root = finalize.find_root(collection)
+    if root is None or "lod_distances" in root:
+        return []
+
+    parts = [obj for obj in collection.objects
+             if obj.type == 'MESH' and obj.parent == root and obj.name not in keep
+             and _reducible(obj)]
+    if not parts:
+        return []
+
+    prefix = root.name[:-len("_ROOT")]
+
+    def add_level(index):
+        empty = primitives.add_empty(collection, f"{prefix}_LOD{index}", 'PLAIN_AXES')
+        empty.parent = root
+        empty["lod_level"] = index
+        return empty
+
+    lod0 = add_level(0)
+    for obj in parts:
+        obj.parent = lod0
+    groups = [lod0]
+
+    for index, level in enumerate(levels, start=1):
+        group = add_level(index)
+        for obj in parts:
+            copy = obj.copy()    # Misma malla, modificadores y materiales
+            copy.name = f"{obj.name}_LOD{index}"
+            collection.objects.link(copy)
+            copy.parent = group
+            _reduce(copy, level)
+        groups.append(group)
+
+    root["lod_distances"] = [0.0] + [level.distance for level in levels]
+    return groups
+
+
+def generate_scene_lods(levels=LEVELS):
+    """Aplica generate_prop_lods a cada colección de la escena."""
+    for collection in bpy.context.scene.collection.children:
+        groups = generate_prop_lods(collection, levels)
+        if groups:
+            print(f"{collection.name}: {len(groups)} niveles de detalle")
+
+
+if __name__ == "__main__":
+    generate_scene_lods()
@@ -0,0 +1,169 @@
+import bpy
+import hashlib
+import json
+
+# Biblioteca de materiales compartida por todos los props.
+#
+# Cada script tenía su propio create_material y solo deduplicaba por nombre:
+# dos materiales idénticos con nombres distintos acababan duplicados, y un
+# nombre reutilizado con otros parámetros se quedaba con el material viejo sin
+# avisar. Aquí el material se identifica por un hash de sus parámetros de
+# shader; el nombre es solo la etiqueta del primero que lo pidió.
+
+# hash de parámetros -> nombre del material en bpy.data.materials
+_cache = {}
+
+
+def material_params(color, roughness=0.5, metallic=0.0, specular=None,
+                    emission=False, emission_strength=1.0, transparency=0.0):
+    """Normaliza los parámetros: solo se guardan los que afectan al shader."""
+    params = {"color": [round(c, 6) for c in color]}
+    if emission:
+        params["type"] = 'EMISSION'
+        params["emission_strength"] = round(emission_strength, 6)
+        return params
+
+    params["type"] = 'PRINCIPLED'
+    params["metallic"] = round(metallic, 6)
+    if transparency > 0:
+        # El vidrio siempre es liso, la rugosidad pedida no se usa
+        params["transparency"] = round(transparency, 6)
+        params["roughness"] = 0.0
+    else:
+        params["roughness"] = round(roughness, 6)
+    if specular is not None:
+        params["specular"] = round(specular, 6)
+    return params
+
+
+def params_hash(params):
+    data = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+def get_material(name, color, roughness=0.5, metallic=0.0, specular=None,
+                 emission=False, emission_strength=1.0, transparency=0.0):
+    """Devuelve el material con estos parámetros, creándolo solo si no existe."""
+    params = material_params(color, roughness, metallic, specular,
+                             emission, emission_strength, transparency)
+    key = params_hash(params)
+
+    # 1. Mismo nombre
+    mat = bpy.data.materials.get(name)
+    if mat is not None:
+        existing = mat.get("param_hash")
+        if existing == key:
+            _cache[key] = mat.name
+            return mat
+        if existing is None:
+            # Material hecho a mano o de una versión anterior: se respeta
+            print(f"ADVERTENCIA: el material '{name}' ya existe sin parámetros registrados; se reutiliza tal cual.")
+            return mat
+        print(f"ADVERTENCIA: el material '{name}' ya existe con otros parámetros; "
+              f"se crea una variante nueva en lugar de reutilizarlo.")
+
+    # 2. Mismos parámetros con otro nombre
+    cached = _find_by_hash(key)
+    if cached is not None:
+        add_alias(cached, name)
+        return cached
+
+    # 3. Material nuevo
+    mat = _build_material(name, params)
+    mat["param_hash"] = key
+    mat["material_params"] = json.dumps(params, sort_keys=True)
+    _cache[key] = mat.name
+    return mat
+
+
+def find_material(name):
+    """Busca un material por nombre o por un alias registrado al deduplicar."""
+    mat = bpy.data.materials.get(name)
+    if mat is not None:
+        return mat
+    for mat in bpy.data.materials:
+        if name in mat.get("aliases", "").split(","):
+            return mat
+    return None
+
+
+def is_emission(mat):
+    """True si el material fue creado como emisivo por esta biblioteca."""
+    params = mat.get("material_params")
+    return bool(params) and json.loads(params).get("type") == 'EMISSION'
+
+
+def edit_material(name):
+    """Busca un material para reescribir sus nodos a mano y lo saca del registro.
+
+    Sin "param_hash" ningún get_material posterior lo reutiliza para otros
+    parámetros iguales. "material_params" se conserva para is_emission.
+    """
+    mat = find_material(name)
+    if mat is None:
+        return None
+    key = mat.get("param_hash")
+    if key is not None:
+        del mat["param_hash"]
+        if _cache.get(key) == mat.name:
+            del _cache[key]
+    return mat
+
+
+def _find_by_hash(key):
+    name = _cache.get(key)
+    if name is not None:
+        mat = bpy.data.materials.get(name)
+        if mat is not None and mat.get("param_hash") == key:
+            return mat
+
+    # El caché del módulo no sobrevive a recargas; se mira en el .blend
+    for mat in bpy.data.materials:
+        if mat.get("param_hash") == key:
+            _cache[key] = mat.name
+            return mat
+    return None
+
+
+def add_alias(mat, name):
+    aliases = [a for a in mat.get("aliases", "").split(",") if a]
+    if name != mat.name and name not in aliases:
+        aliases.append(name)
+        mat["aliases"] = ",".join(aliases)
+
+
+def _build_material(name, params):
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    nodes.clear()
+
+    output = nodes.new('ShaderNodeOutputMaterial')
+    output.location = (400, 0)
+
+    if params["type"] == 'EMISSION':
+        shader = nodes.new('ShaderNodeEmission')
+        shader.inputs['Color'].default_value = params["color"]
+        shader.inputs['Strength'].default_value = params["emission_strength"]
+    else:
+        shader = nodes.new('ShaderNodeBsdfPrincipled')
+        shader.inputs['Base Color'].default_value = params["color"]
+        shader.inputs['Roughness'].default_value = params["roughness"]
+        shader.inputs['Metallic'].default_value = params["metallic"]
+        if "specular" in params:
+            shader.inputs['Specular IOR Level'].default_value = params["specular"]
+
+        if "transparency" in params:
+            # Vidrio transparente inmediatamente (Alpha bajo)
+            shader.inputs['Alpha'].default_value = 0.2
+            shader.inputs['Transmission Weight'].default_value = params["transparency"]
+
+            # Compatibilidad con versiones antiguas
+            if hasattr(mat, 'blend_method'):
+                mat.blend_method = 'BLEND'
+            if hasattr(mat, 'shadow_method'):
+                mat.shadow_method = 'NONE'
+
+    shader.location = (0, 0)
+    mat.node_tree.links.new(shader.outputs[0], output.inputs['Surface'])
+    return mat
@@ -0,0 +1,130 @@
+import glob
+import hashlib
+import json
+import math
+import os
+import shutil
+import subprocess
+from collections import namedtuple
+
+# Preparación de vídeos/GIF: se decodifican una sola vez con ffmpeg.
+#
+# Una imagen MOVIE en Blender vuelve a decodificar el vídeo en cada fotograma
+# de render. Aquí el archivo se convierte una vez en una secuencia de PNG
+# (imagen SEQUENCE en Blender) guardada en build/cache/media/<hash>_<tamaño>_<fps>,
+# con el hash del contenido del archivo de origen: si no cambia, no se vuelve
+# a decodificar. Para la web se genera además un atlas JPEG pequeño con un
+# fotograma de cada pocos (web_project/media/<nombre>_atlas.jpg + .json) que
+# viewer_3d.js anima moviendo el desplazamiento de la textura.
+#
+# ffmpeg se busca en el PATH o en la variable de entorno FFMPEG.
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(_script_dir)
+CACHE_DIR = os.path.join(REPO_DIR, "build", "cache", "media")
+WEB_DIR = os.path.join(REPO_DIR, "web_project", "media")
+
+MEDIA_FPS = 24          # Fotogramas por segundo de la secuencia decodificada
+FRAME_SIZE = 512        # Lado mayor de cada fotograma para Blender
+WEB_FRAME_SIZE = 128    # Lado mayor de cada fotograma del atlas web
+WEB_FPS = 8
+WEB_MAX_FRAMES = 64
+
+FrameSequence = namedtuple("FrameSequence", "folder first_frame frames fps source_hash")
+
+
+def find_ffmpeg():
+    return os.environ.get("FFMPEG") or shutil.which("ffmpeg")
+
+
+def source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _fit(size):
+    """Filtro de escala que encaja el fotograma en size x size sin deformarlo."""
+    return f"scale={size}:{size}:force_original_aspect_ratio=decrease"
+
+
+def _read_sequence(folder):
+    with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    return FrameSequence(folder, os.path.join(folder, manifest["first_frame"]),
+                         manifest["frames"], manifest["fps"], manifest["source_hash"])
+
+
+def decode_frames(source, size=FRAME_SIZE, fps=MEDIA_FPS):
+    """Secuencia de fotogramas del archivo (de la caché si ya existe).
+
+    None sin ffmpeg o si ffmpeg no saca ningún fotograma.
+    """
+    key = source_hash(source)
+    folder = os.path.join(CACHE_DIR, f"{key}_{size}_{fps}")
+    if os.path.exists(os.path.join(folder, "manifest.json")):
+        sequence = _read_sequence(folder)
+        if sequence.frames > 0:
+            return sequence
+        # Caché vacía de una versión anterior: se vuelve a decodificar
+        shutil.rmtree(folder, ignore_errors=True)
+
+    ffmpeg = find_ffmpeg()
+    if ffmpeg is None:
+        return None
+
+    # Se decodifica en una carpeta temporal para no dejar cachés a medias
+    temp = folder + ".tmp"
+    shutil.rmtree(temp, ignore_errors=True)
+    os.makedirs(temp)
+    subprocess.run([ffmpeg, "-v", "error", "-i", source,
+                    "-vf", f"fps={fps},{_fit(size)}", "-start_number", "1",
+                    os.path.join(temp, "frame_%04d.png")],
+                   check=True, capture_output=True, text=True)
+    frames = len(glob.glob(os.path.join(temp, "frame_*.png")))
+    if frames == 0:
+        # No se guarda en caché: el atlas dividiría por cero en cada build
+        shutil.rmtree(temp, ignore_errors=True)
+        print(f"ADVERTENCIA: ffmpeg no sacó ningún fotograma de {os.path.basename(source)}.")
+        return None
+    with open(os.path.join(temp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.basename(source), "source_hash": key,
+                   "first_frame": "frame_0001.png", "frames": frames, "fps": fps}, f, indent=2)
+
+    shutil.rmtree(folder, ignore_errors=True)
+    os.replace(temp, folder)
+    print(f"Decodificado {os.path.basename(source)}: {frames} fotogramas en {folder}")
+    return _read_sequence(folder)
+
+
+def export_web_atlas(sequence, name, size=WEB_FRAME_SIZE):
+    """Atlas JPEG para el visor web a partir de una secuencia ya decodificada."""
+    if sequence.frames <= 0:
+        return None
+    # Un fotograma de cada 'step', sin pasar de WEB_MAX_FRAMES
+    step = max(1, round(sequence.fps / WEB_FPS), math.ceil(sequence.frames / WEB_MAX_FRAMES))
+    frames = math.ceil(sequence.frames / step)
+    cols = math.ceil(math.sqrt(frames))
+    rows = math.ceil(frames / cols)
+
+    atlas = os.path.join(sequence.folder, f"atlas_{size}_{step}.jpg")
+    if not os.path.exists(atlas):
+        ffmpeg = find_ffmpeg()
+        if ffmpeg is None:
+            return None
+        subprocess.run([ffmpeg, "-v", "error", "-y", "-framerate", str(sequence.fps),
+                        "-start_number", "1", "-i", os.path.join(sequence.folder, "frame_%04d.png"),
+                        "-vf", f"select='not(mod(n\\,{step}))',{_fit(size)},tile={cols}x{rows}",
+                        "-frames:v", "1", "-q:v", "4", atlas],
+                       check=True, capture_output=True, text=True)
+
+    os.makedirs(WEB_DIR, exist_ok=True)
+    image_name = f"{name}_atlas.jpg"
+    shutil.copyfile(atlas, os.path.join(WEB_DIR, image_name))
+    info = {"image": f"media/{image_name}", "frames": frames, "cols": cols, "rows": rows,
+            "fps": round(sequence.fps / step, 4), "source_hash": sequence.source_hash}
+    with open(os.path.join(WEB_DIR, f"{name}_atlas.json"), "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    return info
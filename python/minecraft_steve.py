@@ -1,6 +1,57 @@
 import bpy
 import math
 
+import batch
+import material_library
+import primitives
+
+# Steve no es un prop JSON (prop_spec.py) como la estantería o el PC: sus
+# extremidades necesitan pivote propio (origin), piezas colgadas de ellas
+# (attach) y clips de animación, y el formato declarativo solo describe piezas
+# estáticas sueltas bajo un ROOT.
+
+# Animaciones horneadas que se exportan al GLB (viewer_3d.js las reproduce con
+# THREE.AnimationMixer). Cada clip es un balanceo en X de las extremidades,
+# que tienen el origen en la cadera o el hombro. Fase: +1/-1 sentido del
+# balanceo; el brazo va al revés que la pierna del mismo lado.
+WALK_FRAMES = 24        # Un paso completo por segundo a 24 fps
+WALK_SWING = 0.5        # Radianes (el balanceo que antes calculaba el visor)
+WALK_PHASE = {"Pierna_L": 1, "Pierna_R": -1, "Brazo_L": -1, "Brazo_R": 1}
+IDLE_FRAMES = 72
+IDLE_SWING = 0.05
+IDLE_PHASE = {"Brazo_L": 1, "Brazo_R": -1}
+
+# Punto de la primitiva unitaria que queda en el origen: centro de la cara superior
+TOP = (0.0, 0.0, 0.5)
+
+
+def bake_swing_clip(limbs, clip, frames, swing, phases):
+    """Hornea un ciclo de balanceo como pista NLA 'clip' en cada extremidad.
+
+    El exportador glTF (export_animation_mode='NLA_TRACKS' en glb_export.py)
+    junta las pistas con el mismo nombre de todos los objetos en una sola
+    animación: "Walk", "Idle".
+    """
+    for name, phase in phases.items():
+        limb = limbs[name]
+        amplitude = swing * phase
+        anim = limb.animation_data_create()
+        action = bpy.data.actions.new(f"Steve_{clip}_{name}")
+        anim.action = action
+        # Extremos del balanceo: con las asas automáticas queda una curva suave
+        # y el final enlaza con el principio
+        for frame, value in ((0, amplitude), (frames // 2, -amplitude), (frames, amplitude)):
+            limb.rotation_euler = (value, 0.0, 0.0)
+            limb.keyframe_insert(data_path="rotation_euler", index=0, frame=frame)
+
+        track = anim.nla_tracks.new()
+        track.name = clip
+        track.strips.new(clip, 0, action)
+        anim.action = None
+        limb.rotation_euler = (0.0, 0.0, 0.0)
+
+
+@batch.BatchGeneration("Steve de Minecraft")
 def create_minecraft_steve():
     collection_name = "Minecraft_Steve"
     collection = bpy.data.collections.new(collection_name)
@@ -8,21 +59,8 @@ def create_minecraft_steve():
 
     # --- MATERIALES (Colores Planos de Steve) ---
     def create_material(name, color):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            nodes = mat.node_tree.nodes
-            nodes.clear()
-            output = nodes.new('ShaderNodeOutputMaterial')
-            output.location = (400, 0)
-            shader = nodes.new('ShaderNodeBsdfPrincipled')
-            shader.inputs['Base Color'].default_value = color
-            shader.inputs['Roughness'].default_value = 1.0 # Mate, como bloques
-            shader.inputs['Specular IOR Level'].default_value = 0.0
-            shader.location = (0, 0)
-            mat.node_tree.links.new(shader.outputs[0], output.inputs['Surface'])
-        return mat
+        # Mate, como bloques
+        return material_library.get_material(name, color, roughness=1.0, specular=0.0)
 
     # Colores aproximados de Steve
     mat_skin = create_material("Steve_Skin", (0.7, 0.5, 0.4, 1)) # Piel bronceada
@@ -34,20 +72,10 @@ def create_minecraft_steve():
     mat_eyes_pupil = create_material("Steve_Eyes_Pupil", (0.3, 0.2, 0.6, 1)) # Violeta/Azul oscuro
 
     # --- HELPERS ---
-    def create_block(name, loc, size, mat=None):
+    def create_block(name, loc, size, mat=None, origin=primitives.CENTER):
         # size es una tupla (x, y, z)
-        bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = size
-        
-        if mat:
-            if obj.data.materials: obj.data.materials[0] = mat
-            else: obj.data.materials.append(mat)
-            
-        for coll in obj.users_collection: coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        return obj
+        return primitives.add_primitive(collection, 'CUBE', name, loc, size, material=mat,
+                                        origin=origin)
 
     # --- CONSTRUCCIÓN (Escala: 1 unidad = 1 metro aprox, Steve mide ~1.8m) ---
     # Pixel size reference: 1 pixel = 0.0625m (1/16)
@@ -57,22 +85,22 @@ def create_minecraft_steve():
     leg_w = 4 * px
     leg_h = 12 * px
     leg_d = 4 * px
-    
-    # Pierna Derecha
-    leg_r = create_block("Pierna_R", (leg_w/2, 0, leg_h/2), (leg_w, leg_d, leg_h), mat=mat_pants_blue)
-    # Zapato R (Parte inferior de la pierna, visualmente separado o pintado)
-    # Para simplificar, hacemos un bloque extra para el zapato o asumimos textura. 
-    # Haremos el estilo "geometría pura":
-    # Zapatos (Bottom 2 pixels)
+    # Zapatos (Bottom 2 pixels): bloque aparte, hijo de la pierna para moverse con ella
     shoe_h = 2 * px
-    # Ajustamos la pierna para que sea pantalón y creamos zapato
-    leg_r.scale = (leg_w, leg_d, leg_h - shoe_h)
-    leg_r.location = (leg_w/2, 0, shoe_h + (leg_h - shoe_h)/2)
-    create_block("Zapato_R", (leg_w/2, 0, shoe_h/2), (leg_w, leg_d, shoe_h), mat=mat_shoes_grey)
+    # El origen de cada pierna es la cadera (cara superior): gira desde ahí
+    hip_z = leg_h
+
+    # Pierna Derecha
+    leg_r = create_block("Pierna_R", (leg_w/2, 0, hip_z), (leg_w, leg_d, leg_h - shoe_h),
+                         mat=mat_pants_blue, origin=TOP)
+    shoe_r = create_block("Zapato_R", (leg_w/2, 0, shoe_h/2), (leg_w, leg_d, shoe_h), mat=mat_shoes_grey)
+    primitives.attach(shoe_r, leg_r)
 
     # Pierna Izquierda
-    leg_l = create_block("Pierna_L", (-leg_w/2, 0, shoe_h + (leg_h - shoe_h)/2), (leg_w, leg_d, leg_h - shoe_h), mat=mat_pants_blue)
-    create_block("Zapato_L", (-leg_w/2, 0, shoe_h/2), (leg_w, leg_d, shoe_h), mat=mat_shoes_grey)
+    leg_l = create_block("Pierna_L", (-leg_w/2, 0, hip_z), (leg_w, leg_d, leg_h - shoe_h),
+                         mat=mat_pants_blue, origin=TOP)
+    shoe_l = create_block("Zapato_L", (-leg_w/2, 0, shoe_h/2), (leg_w, leg_d, shoe_h), mat=mat_shoes_grey)
+    primitives.attach(shoe_l, leg_l)
 
     # 2. Cuerpo (Torso) (8x12x4 pixels)
     body_w = 8 * px
@@ -82,25 +110,29 @@ def create_minecraft_steve():
     
     create_block("Torso", (0, 0, body_z), (body_w, body_d, body_h), mat=mat_shirt_cyan)
 
-    # 3. Brazos (4x12x4 pixels)
+    # 3. Brazos (4x12x4 pixels): piel abajo y manga (Top 4 pixels) hija del brazo
     arm_w = 4 * px
     arm_h = 12 * px
     arm_d = 4 * px
-    arm_z = leg_h + body_h - arm_h/2 # Pegado al hombro
-    
-    # Brazo Derecho
-    arm_r = create_block("Brazo_R", (body_w/2 + arm_w/2, 0, arm_z), (arm_w, arm_d, arm_h), mat=mat_skin)
-    # Manga (Top 4 pixels)
     sleeve_h = 4 * px
-    # Ajustamos brazo piel
-    arm_r.scale = (arm_w, arm_d, arm_h - sleeve_h)
-    arm_r.location = (body_w/2 + arm_w/2, 0, arm_z - sleeve_h/2)
-    # Manga
-    create_block("Manga_R", (body_w/2 + arm_w/2, 0, leg_h + body_h - sleeve_h/2), (arm_w + 0.005, arm_d + 0.005, sleeve_h), mat=mat_shirt_cyan)
+    shoulder_z = leg_h + body_h
+    # El origen del brazo es el hombro, por encima de la piel (donde acaba la manga)
+    arm_pivot = (0.0, 0.0, 0.5 + sleeve_h / (arm_h - sleeve_h))
+    sleeve_z = shoulder_z - sleeve_h/2
+
+    # Brazo Derecho
+    arm_r = create_block("Brazo_R", (body_w/2 + arm_w/2, 0, shoulder_z), (arm_w, arm_d, arm_h - sleeve_h),
+                         mat=mat_skin, origin=arm_pivot)
+    sleeve_r = create_block("Manga_R", (body_w/2 + arm_w/2, 0, sleeve_z), (arm_w + 0.005, arm_d + 0.005, sleeve_h),
+                            mat=mat_shirt_cyan)
+    primitives.attach(sleeve_r, arm_r)
 
     # Brazo Izquierdo
-    arm_l = create_block("Brazo_L", (-body_w/2 - arm_w/2, 0, arm_z - sleeve_h/2), (arm_w, arm_d, arm_h - sleeve_h), mat=mat_skin)
-    create_block("Manga_L", (-body_w/2 - arm_w/2, 0, leg_h + body_h - sleeve_h/2), (arm_w + 0.005, arm_d + 0.005, sleeve_h), mat=mat_shirt_cyan)
+    arm_l = create_block("Brazo_L", (-body_w/2 - arm_w/2, 0, shoulder_z), (arm_w, arm_d, arm_h - sleeve_h),
+                         mat=mat_skin, origin=arm_pivot)
+    sleeve_l = create_block("Manga_L", (-body_w/2 - arm_w/2, 0, sleeve_z), (arm_w + 0.005, arm_d + 0.005, sleeve_h),
+                            mat=mat_shirt_cyan)
+    primitives.attach(sleeve_l, arm_l)
 
     # 4. Cabeza (8x8x8 pixels)
     head_s = 8 * px
@@ -140,17 +172,12 @@ def create_minecraft_steve():
     create_block("Boca", (0, eye_y, eye_z - px*1.5), (px*4, 0.005, px), mat=mat_hair)
 
     # --- ROOT OBJECT ---
-    bpy.ops.object.empty_add(type='ARROWS', location=(0, 0, 0))
-    root = bpy.context.active_object
-    root.name = "Steve_ROOT"
-    collection.objects.link(root)
-    for coll in root.users_collection:
-        if coll != collection: coll.objects.unlink(root)
-
-    # Emparentar
-    for obj in collection.objects:
-        if obj != root:
-            obj.parent = root
+    root = primitives.add_root(collection, "Steve_ROOT")
+
+    # --- ANIMACIONES ---
+    limbs = {"Pierna_L": leg_l, "Pierna_R": leg_r, "Brazo_L": arm_l, "Brazo_R": arm_r}
+    bake_swing_clip(limbs, "Walk", WALK_FRAMES, WALK_SWING, WALK_PHASE)
+    bake_swing_clip(limbs, "Idle", IDLE_FRAMES, IDLE_SWING, IDLE_PHASE)
 
     # Posicionar
     root.location = (-1.0, -1.0, 0)
@@ -0,0 +1,149 @@
+import bpy
+import bmesh
+from mathutils import Matrix, Vector
+
+# Colisionadores de selección para el visor web.
+#
+# Para saber si el ratón está sobre el monitor, viewer_3d.js lanzaba un rayo
+# contra todos los triángulos de la escena en cada movimiento del ratón. Los
+# generadores marcan las piezas interactivas con la propiedad "interactive"
+# (p. ej. Monitor_Panel y Monitor_Body = "computer") y aquí se crea para cada
+# una una caja de 12 triángulos que envuelve su malla evaluada (con biselados).
+# La caja cuelga de la pieza, así que se mueve con ella, y lleva en los extras
+# del GLB pick_proxy, interactive y pick_target. El visor la oculta y lanza
+# los rayos solo contra estas cajas.
+#
+# Para que lo que hay delante (Steve, el PC) tape el clic, cada malla no
+# interactiva recibe también una caja <pieza>_Occl con el extra "occluder": el
+# visor prueba esas cajas en lugar de todos sus triángulos. Las piezas de un
+# LOD cuelgan la caja del ROOT (sirve para todos los niveles) y las copias
+# LOD1+ no llevan caja. Si la caja de una pieza se solapa con la de una pieza
+# interactiva (el escritorio bajo el monitor) taparía el clic sin estar
+# delante: esa pieza no lleva caja y se marca con "occluder_exact" para que el
+# visor pruebe su malla.
+#
+# Se ejecuta al final de la build (después de lod y merge_static): las piezas
+# interactivas están en finalize.KEEP_SEPARATE y no se fusionan.
+
+INTERACTIVE_PROP = "interactive"
+PROXY_SUFFIX = "_Pick"
+OCCLUDER_SUFFIX = "_Occl"
+
+
+def interactive_objects(scene=None):
+    scene = scene or bpy.context.scene
+    return [obj for obj in scene.objects
+            if obj.type == 'MESH' and INTERACTIVE_PROP in obj and PROXY_SUFFIX not in obj.name]
+
+
+def occluding_objects(scene=None):
+    """Mallas que pueden tapar una pieza interactiva (sin cajas ni copias LOD1+)."""
+    scene = scene or bpy.context.scene
+    return [obj for obj in scene.objects
+            if obj.type == 'MESH' and INTERACTIVE_PROP not in obj
+            and not obj.get("pick_proxy") and not obj.get("occluder")
+            and not (obj.parent is not None and obj.parent.get("lod_level", 0) > 0)]
+
+
+def _world_bounds(obj, depsgraph):
+    """(mínimo, máximo) de la caja de la malla evaluada en coordenadas de mundo."""
+    corners = [obj.matrix_world @ Vector(c) for c in obj.evaluated_get(depsgraph).bound_box]
+    return (Vector([min(c[i] for c in corners) for i in range(3)]),
+            Vector([max(c[i] for c in corners) for i in range(3)]))
+
+
+def _overlaps(a, b):
+    return all(a[0][i] <= b[1][i] and b[0][i] <= a[1][i] for i in range(3))
+
+
+def _box_mesh(name, corners):
+    """Caja alineada con los ejes locales que contiene las esquinas dadas."""
+    low = Vector((min(c[0] for c in corners), min(c[1] for c in corners), min(c[2] for c in corners)))
+    high = Vector((max(c[0] for c in corners), max(c[1] for c in corners), max(c[2] for c in corners)))
+    size = high - low
+    center = (low + high) / 2
+
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=1.0)
+    for v in bm.verts:
+        v.co = center + Vector((v.co.x * size.x, v.co.y * size.y, v.co.z * size.z))
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def create_proxy(obj, depsgraph):
+    """Caja de selección hija de obj (en su espacio local)."""
+    name = obj.name + PROXY_SUFFIX
+    old = bpy.data.objects.get(name)
+    if old is not None:
+        bpy.data.objects.remove(old, do_unlink=True)
+
+    corners = [Vector(c) for c in obj.evaluated_get(depsgraph).bound_box]
+    proxy = bpy.data.objects.new(name, _box_mesh(name, corners))
+    for collection in obj.users_collection:
+        collection.objects.link(proxy)
+    proxy.parent = obj
+    proxy.matrix_parent_inverse = Matrix.Identity(4)
+
+    proxy["pick_proxy"] = True
+    proxy[INTERACTIVE_PROP] = obj[INTERACTIVE_PROP]
+    proxy["pick_target"] = obj.name
+    # Invisible en los renders de Blender; en el visor lo oculta viewer_3d.js
+    proxy.display_type = 'WIRE'
+    proxy.hide_render = True
+    return proxy
+
+
+def create_occluder(obj, depsgraph, targets):
+    """Caja que tapa los clics detrás de obj, o None si se solapa con un objetivo."""
+    name = obj.name + OCCLUDER_SUFFIX
+    old = bpy.data.objects.get(name)
+    if old is not None:
+        bpy.data.objects.remove(old, do_unlink=True)
+    if "occluder_exact" in obj:
+        del obj["occluder_exact"]
+
+    bounds = _world_bounds(obj, depsgraph)
+    if any(_overlaps(bounds, target) for target in targets):
+        obj["occluder_exact"] = True
+        return None
+
+    # Dentro de un LOD la caja cuelga del ROOT para no ocultarse con el nivel 0
+    anchor = obj
+    if obj.parent is not None and "lod_level" in obj.parent and obj.parent.parent is not None:
+        anchor = obj.parent.parent
+    to_anchor = anchor.matrix_world.inverted() @ obj.matrix_world
+    corners = [to_anchor @ Vector(c) for c in obj.evaluated_get(depsgraph).bound_box]
+
+    box = bpy.data.objects.new(name, _box_mesh(name, corners))
+    for collection in obj.users_collection:
+        collection.objects.link(box)
+    box.parent = anchor
+    box.matrix_parent_inverse = Matrix.Identity(4)
+
+    box["occluder"] = True
+    box.display_type = 'WIRE'
+    box.hide_render = True
+    return box
+
+
+def create_pick_proxies():
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    interactive = interactive_objects()
+    proxies = [create_proxy(obj, depsgraph) for obj in interactive]
+    print(f"Colisionadores de selección: {len(proxies)} "
+          f"({', '.join(p['pick_target'] for p in proxies) or 'ninguno'}).")
+
+    targets = [_world_bounds(obj, depsgraph) for obj in interactive]
+    occluders = [create_occluder(obj, depsgraph, targets) for obj in occluding_objects()]
+    exact = [obj for obj in occluding_objects() if obj.get("occluder_exact")]
+    print(f"Cajas de oclusión: {sum(1 for o in occluders if o is not None)} "
+          f"(con malla exacta: {', '.join(o.name for o in exact) or 'ninguna'}).")
+    return proxies
+
+
+if __name__ == "__main__":
+    create_pick_proxies()
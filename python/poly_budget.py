@@ -0,0 +1,110 @@
+import bpy
+from mathutils import Vector
+
+# Presupuesto de triángulos por prop y segmentos de bisel adaptativos.
+#
+# Los biselados tienen anchura y segmentos fijos en cada llamada: un botón de
+# la Switch lleva los mismos 3 segmentos que el cuerpo, y nada impide que los
+# triángulos vayan creciendo. Aquí:
+#   - adapt_bevels recalcula los segmentos de cada Bevel según el tamaño final
+#     de la pieza en el mundo (con la escala del ROOT ya aplicada). Los
+#     segmentos pedidos en el script son el máximo, nunca se suben.
+#   - check_budgets cuenta los triángulos evaluados (con modificadores) de
+#     cada colección y avisa o falla si alguna pasa de su presupuesto.
+
+# Piezas de este tamaño (metros, lado mayor) o más conservan todos los
+# segmentos; las más pequeñas reciben proporcionalmente menos.
+FULL_SEGMENTS_SIZE = 0.3
+
+DEFAULT_BUDGET = 4000
+
+# Colección -> triángulos máximos (LOD0)
+BUDGETS = {
+    "SillaGamer_Pro": 10000,
+    "Personaje_Estudiante": 8000,
+}
+
+
+def world_size(obj):
+    """Lado mayor de la caja envolvente de la pieza en coordenadas de mundo."""
+    corners = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
+    return max(max(c[i] for c in corners) - min(c[i] for c in corners) for i in range(3))
+
+
+def adaptive_segments(requested, size):
+    segments = round(requested * size / FULL_SEGMENTS_SIZE)
+    return max(1, min(requested, segments))
+
+
+def adapt_bevels(collections=None):
+    """Ajusta los segmentos de todos los Bevel. Devuelve cuántos se redujeron."""
+    bpy.context.view_layer.update()
+    reduced = 0
+    for collection in collections or bpy.context.scene.collection.children:
+        for obj in collection.objects:
+            if obj.type != 'MESH':
+                continue
+            bevels = [m for m in obj.modifiers if m.type == 'BEVEL']
+            if not bevels:
+                continue
+            size = world_size(obj)
+            for mod in bevels:
+                segments = adaptive_segments(mod.segments, size)
+                if segments < mod.segments:
+                    mod.segments = segments
+                    reduced += 1
+    print(f"Biselados adaptativos: {reduced} modificadores con menos segmentos.")
+    return reduced
+
+
+def evaluated_counts(obj, depsgraph):
+    """(vértices, triángulos) de la malla evaluada (con los modificadores aplicados)."""
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        return len(mesh.vertices), sum(len(p.vertices) - 2 for p in mesh.polygons)
+    finally:
+        evaluated.to_mesh_clear()
+
+
+def _is_reduced_lod(obj):
+    """True para las copias de lod.py (LOD1+), que no cuentan en el presupuesto."""
+    parent = obj.parent
+    return parent is not None and parent.get("lod_level", 0) > 0
+
+
+def collection_triangles(collection, depsgraph):
+    return sum(evaluated_counts(obj, depsgraph)[1] for obj in collection.objects
+               if obj.type == 'MESH' and not _is_reduced_lod(obj))
+
+
+def check_budgets(mode="warn", budgets=BUDGETS, default=DEFAULT_BUDGET):
+    """Compara los triángulos de cada prop con su presupuesto.
+
+    mode: "warn" solo avisa, "error" lanza RuntimeError si alguno se pasa.
+    Devuelve [(colección, triángulos, presupuesto)].
+    """
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    rows = []
+    for collection in bpy.context.scene.collection.children:
+        rows.append((collection.name, collection_triangles(collection, depsgraph),
+                     budgets.get(collection.name, default)))
+
+    width = max(len(name) for name in ["Prop"] + [r[0] for r in rows])
+    print()
+    print(f"{'Prop'.ljust(width)}  {'Triángulos':>10}  {'Máximo':>8}")
+    over = []
+    for name, tris, budget in rows:
+        mark = "  <-- SUPERA" if tris > budget else ""
+        print(f"{name.ljust(width)}  {tris:10d}  {budget:8d}{mark}")
+        if tris > budget:
+            over.append(f"{name} ({tris} > {budget})")
+
+    if over:
+        message = "Presupuesto de triángulos superado: " + ", ".join(over)
+        if mode == "error":
+            raise RuntimeError(message)
+        print(f"ADVERTENCIA: {message}")
+    return rows
@@ -0,0 +1,288 @@
+import bpy
+import functools
+import math
+import os
+
+# Construcción de primitivas sin operadores.
+#
+# Los scripts antiguos usaban bpy.ops.mesh.primitive_*_add y luego leían
+# bpy.context.active_object. Cada llamada a un operador dispara un update del
+# view layer y un paso de undo. Aquí la malla se genera directamente en
+# bpy.data.meshes y el objeto se enlaza solo a la colección destino.
+
+CYLINDER_VERTICES = 32
+SPHERE_SEGMENTS = 32
+SPHERE_RINGS = 16
+
+# Modo de mallas compartidas: las piezas que son la misma primitiva con otra
+# transformación (patas, ruedas, botones, ventiladores...) reutilizan un único
+# datablock de malla. El material se enlaza al objeto en lugar de a la malla.
+# También se puede activar al lanzar Blender con SETUP_SHARE_MESHES=1.
+SHARE_MESHES = os.environ.get("SETUP_SHARE_MESHES") == "1"
+SHARED_MESH_PREFIX = "Prim_"
+
+# Origen por defecto: el centro de la primitiva. Con otro origen (en
+# coordenadas de la primitiva unitaria, p. ej. (0, 0, 0.5) = centro de la cara
+# superior) la pieza gira alrededor de ese punto: hombros y caderas de Steve.
+CENTER = (0.0, 0.0, 0.0)
+
+
+# --- GEOMETRÍA (Python puro, mismas dimensiones que los operadores) ---
+
+def cube_geometry():
+    """Cubo de lado 1 centrado en el origen (igual que primitive_cube_add(size=1))."""
+    h = 0.5
+    verts = [
+        (h, h, h), (h, h, -h), (h, -h, h), (h, -h, -h),
+        (-h, h, h), (-h, h, -h), (-h, -h, h), (-h, -h, -h),
+    ]
+    faces = [
+        (0, 4, 6, 2), (3, 2, 6, 7), (7, 6, 4, 5),
+        (5, 1, 3, 7), (1, 0, 2, 3), (5, 4, 0, 1),
+    ]
+    # Layout en cruz del cubo por defecto de Blender (un UV por loop)
+    uvs = [
+        (0.625, 0.5), (0.875, 0.5), (0.875, 0.75), (0.625, 0.75),
+        (0.375, 0.75), (0.625, 0.75), (0.625, 1.0), (0.375, 1.0),
+        (0.375, 0.0), (0.625, 0.0), (0.625, 0.25), (0.375, 0.25),
+        (0.125, 0.5), (0.375, 0.5), (0.375, 0.75), (0.125, 0.75),
+        (0.375, 0.5), (0.625, 0.5), (0.625, 0.75), (0.375, 0.75),
+        (0.375, 0.25), (0.625, 0.25), (0.625, 0.5), (0.375, 0.5),
+    ]
+    return verts, faces, uvs
+
+
+def cylinder_geometry(vertices=CYLINDER_VERTICES):
+    """Cilindro de radio 0.5 y altura 1 con tapas NGON."""
+    r, h = 0.5, 0.5
+    verts = []
+    for z in (-h, h):
+        for i in range(vertices):
+            a = 2 * math.pi * i / vertices
+            verts.append((r * math.cos(a), r * math.sin(a), z))
+
+    faces = []
+    uvs = []
+    # Lateral (tira de quads)
+    for i in range(vertices):
+        j = (i + 1) % vertices
+        faces.append((i, j, vertices + j, vertices + i))
+        u0, u1 = i / vertices, (i + 1) / vertices
+        uvs += [(u0, 0.0), (u1, 0.0), (u1, 0.5), (u0, 0.5)]
+
+    # Tapas (círculos en la mitad superior del espacio UV)
+    def cap_uv(i, cx):
+        a = 2 * math.pi * i / vertices
+        return (cx + 0.25 * math.cos(a), 0.75 + 0.25 * math.sin(a))
+
+    top = tuple(vertices + i for i in range(vertices))
+    faces.append(top)
+    uvs += [cap_uv(i, 0.75) for i in range(vertices)]
+
+    bottom = tuple(reversed(range(vertices)))
+    faces.append(bottom)
+    uvs += [cap_uv(i, 0.25) for i in reversed(range(vertices))]
+    return verts, faces, uvs
+
+
+def uv_sphere_geometry(segments=SPHERE_SEGMENTS, rings=SPHERE_RINGS):
+    """Esfera UV de radio 0.5."""
+    r = 0.5
+    verts = [(0.0, 0.0, r)]
+    for k in range(1, rings):
+        theta = math.pi * k / rings
+        for j in range(segments):
+            phi = 2 * math.pi * j / segments
+            verts.append((r * math.sin(theta) * math.cos(phi),
+                          r * math.sin(theta) * math.sin(phi),
+                          r * math.cos(theta)))
+    verts.append((0.0, 0.0, -r))
+    bottom_pole = len(verts) - 1
+
+    def ring_vert(k, j):
+        return 1 + (k - 1) * segments + (j % segments)
+
+    faces = []
+    uvs = []
+    for j in range(segments):
+        u0, u1 = j / segments, (j + 1) / segments
+        # Casquete superior
+        faces.append((ring_vert(1, j), ring_vert(1, j + 1), 0))
+        v = 1 - 1 / rings
+        uvs += [(u0, v), (u1, v), ((u0 + u1) / 2, 1.0)]
+        # Bandas intermedias
+        for k in range(1, rings - 1):
+            v_up, v_low = 1 - k / rings, 1 - (k + 1) / rings
+            faces.append((ring_vert(k + 1, j), ring_vert(k + 1, j + 1),
+                          ring_vert(k, j + 1), ring_vert(k, j)))
+            uvs += [(u0, v_low), (u1, v_low), (u1, v_up), (u0, v_up)]
+        # Casquete inferior
+        faces.append((bottom_pole, ring_vert(rings - 1, j + 1), ring_vert(rings - 1, j)))
+        v = 1 / rings
+        uvs += [((u0 + u1) / 2, 0.0), (u1, v), (u0, v)]
+    return verts, faces, uvs
+
+
+GEOMETRY_BUILDERS = {
+    'CUBE': cube_geometry,
+    'CYLINDER': cylinder_geometry,
+    'SPHERE': uv_sphere_geometry,
+}
+
+
+# --- DATABLOCKS ---
+
+@functools.lru_cache(maxsize=None)
+def primitive_geometry(kind, origin=CENTER):
+    """Geometría de la primitiva calculada una sola vez (UVs ya aplanados)."""
+    if kind not in GEOMETRY_BUILDERS:
+        raise ValueError(f"Primitiva desconocida: {kind!r}")
+    verts, faces, uvs = GEOMETRY_BUILDERS[kind]()
+    if origin != CENTER:
+        ox, oy, oz = origin
+        verts = [(x - ox, y - oy, z - oz) for x, y, z in verts]
+    return verts, faces, [c for uv in uvs for c in uv]
+
+
+def new_primitive_mesh(kind, name, origin=CENTER):
+    """Crea una malla nueva en bpy.data.meshes con la geometría de la primitiva."""
+    verts, faces, flat_uvs = primitive_geometry(kind, tuple(origin))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", flat_uvs)
+    mesh.update()
+    return mesh
+
+
+def _set_smooth(mesh):
+    polygons = mesh.polygons
+    polygons.foreach_set("use_smooth", [True] * len(polygons))
+    mesh.update()
+
+
+def use_shared_meshes(enabled=True):
+    """Activa o desactiva el modo de mallas compartidas para todos los props."""
+    global SHARE_MESHES
+    SHARE_MESHES = enabled
+
+
+def mesh_origin(mesh):
+    """Origen con el que se generó la malla (CENTER si no se indicó otro)."""
+    return tuple(mesh.get("primitive_origin", CENTER))
+
+
+def shared_primitive_mesh(kind, smooth=False, origin=CENTER):
+    """Devuelve la malla compartida de una primitiva, creándola la primera vez."""
+    origin = tuple(origin)
+    name = f"{SHARED_MESH_PREFIX}{kind.title()}" + ("_Smooth" if smooth else "")
+    if origin != CENTER:
+        # El origen forma parte de la clave: otro pivote es otra malla
+        name += "_O" + "_".join(f"{c:g}" for c in origin)
+    mesh = bpy.data.meshes.get(name)
+    if mesh is not None and mesh.get("shared_primitive") == kind and mesh_origin(mesh) == origin:
+        return mesh
+
+    mesh = new_primitive_mesh(kind, name, origin)
+    mesh["shared_primitive"] = kind
+    # Nombre pedido, aunque Blender le añada .001: build_cache unifica por él
+    mesh["shared_name"] = name
+    if origin != CENTER:
+        mesh["primitive_origin"] = origin
+    # Hueco de material vacío: cada objeto pone el suyo (link = 'OBJECT')
+    mesh.materials.append(None)
+    if smooth:
+        _set_smooth(mesh)
+    return mesh
+
+
+def set_material(obj, material):
+    """Asigna el material respetando si la malla es compartida o propia."""
+    if obj.data.get("shared_primitive"):
+        slot = obj.material_slots[0]
+        slot.link = 'OBJECT'
+        slot.material = material
+    elif obj.data.materials:
+        obj.data.materials[0] = material
+    else:
+        obj.data.materials.append(material)
+
+
+def primitive_mesh(kind, name, smooth=False, shared=None, origin=CENTER):
+    """Malla para una pieza: la compartida o una propia, según el modo."""
+    if shared is None:
+        shared = SHARE_MESHES
+
+    if shared:
+        return shared_primitive_mesh(kind, smooth, origin)
+
+    mesh = new_primitive_mesh(kind, name, origin)
+    if smooth:
+        _set_smooth(mesh)
+    return mesh
+
+
+def add_primitive(collection, kind, name, location=(0, 0, 0), scale=(1, 1, 1),
+                  rotation=(0, 0, 0), material=None, smooth=False, shared=None, origin=CENTER):
+    """Equivalente a primitive_*_add + mover a la colección, sin operadores.
+
+    Con shared=None se usa el modo global (SHARE_MESHES). origin es el punto
+    de la primitiva unitaria que queda en location (ver CENTER).
+    """
+    mesh = primitive_mesh(kind, name, smooth, shared, origin)
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    obj.rotation_euler = rotation
+    obj.scale = scale
+
+    if material:
+        set_material(obj, material)
+
+    collection.objects.link(obj)
+    return obj
+
+
+def shade_smooth(obj):
+    """Sustituto de bpy.ops.object.shade_smooth() que no depende de la selección.
+
+    Si la malla es compartida no se modifica (afectaría a todas las piezas):
+    el objeto pasa a usar la variante suavizada de la misma primitiva.
+    """
+    kind = obj.data.get("shared_primitive")
+    if not kind:
+        _set_smooth(obj.data)
+        return
+
+    material = obj.material_slots[0].material if obj.material_slots else None
+    obj.data = shared_primitive_mesh(kind, smooth=True, origin=mesh_origin(obj.data))
+    if material:
+        set_material(obj, material)
+
+
+def add_empty(collection, name, display_type='ARROWS', location=(0, 0, 0)):
+    """Empty enlazado directamente a la colección (sustituye a empty_add)."""
+    obj = bpy.data.objects.new(name, None)
+    obj.empty_display_type = display_type
+    obj.location = location
+    collection.objects.link(obj)
+    return obj
+
+
+def attach(child, parent):
+    """Emparenta child a parent sin moverlo (como Ctrl+P > Object, Keep Transform).
+
+    Solo para piezas recién creadas: parent todavía no tiene padre, así que su
+    matrix_basis es su transformación en el mundo.
+    """
+    child.parent = parent
+    child.matrix_parent_inverse = parent.matrix_basis.inverted()
+
+
+def add_root(collection, name, display_type='ARROWS'):
+    """Crea el empty ROOT de un prop y emparenta todo lo que hay en la colección."""
+    root = add_empty(collection, name, display_type)
+    for obj in collection.objects:
+        if obj != root and obj.parent is None:
+            obj.parent = root
+    return root
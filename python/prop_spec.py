@@ -0,0 +1,456 @@
+import bpy
+import ast
+import itertools
+import json
+import math
+import os
+
+import batch
+import material_library
+import primitives
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Props declarativos.
+#
+# Un prop se describe en JSON (python/props/<nombre>.json) como una lista de
+# piezas con primitiva, transformación, material y modificadores. El motor
+# valida la especificación completa (tipos de cada sección, parámetros de los
+# materiales, nombres, smooth, y modificadores con sus atributos, ver
+# MODIFIER_ATTRS) antes de tocar bpy.data y después la
+# construye en una sola pasada por lotes: materiales, mallas, objetos,
+# enlaces a la colección, modificadores y ROOT.
+#
+# Formato:
+#   {
+#     "collection": "Mueble_Coleccionables",
+#     "message": "Mueble para coleccionables creado.",
+#     "vars": {"width": 1.2, "half": "width / 2"},
+#     "materials": {"wood": {"name": "Shelf_BlackWood", "color": [...], "roughness": 0.6}},
+#     "defaults": {"CUBE": {"modifiers": [...], "smooth": true}},
+#     "parts": [
+#       {"name": "Lado", "primitive": "CUBE", "location": ["-half", 0, 1],
+#        "scale": [0.02, 0.35, 2], "rotation": [0, 0, 90], "material": "wood"},
+#       {"repeat": {"i": "num_shelves"}, "vars": {"z": "0.1 * i"}, "parts": [...]}
+#     ],
+#     "root": {"name": "..._ROOT", "display": "ARROWS", "location": [...],
+#              "rotation": [...], "scale": [...]}
+#   }
+#
+# Los números pueden escribirse como expresiones ("case_h/2 + 0.05") que usan
+# las variables; las rotaciones van en grados. "repeat" admite una lista de
+# valores o un número de iteraciones (range) por variable; con varias variables
+# se recorre el producto cartesiano. Los nombres admiten {variable}.
+
+PROPS_DIR = os.path.join(_script_dir, "props")
+
+PRIMITIVES = ('CUBE', 'CYLINDER', 'SPHERE')
+MATERIAL_KEYS = ('name', 'color', 'roughness', 'metallic', 'specular',
+                 'emission', 'emission_strength', 'transparency')
+MATERIAL_NUMBERS = ('roughness', 'metallic', 'specular', 'emission_strength', 'transparency')
+PART_KEYS = ('name', 'primitive', 'location', 'scale', 'rotation', 'material',
+             'modifiers', 'smooth')
+GROUP_KEYS = ('repeat', 'vars', 'parts')
+# Modificadores admitidos y el tipo de cada atributo (se comprueban antes de construir)
+MODIFIER_ATTRS = {
+    'BEVEL': {'width': float, 'segments': int, 'profile': float, 'limit_method': str,
+              'angle_limit': float, 'affect': str, 'harden_normals': bool},
+    'SUBSURF': {'levels': int, 'render_levels': int},
+    'SOLIDIFY': {'thickness': float, 'offset': float, 'use_even_offset': bool},
+    'DECIMATE': {'ratio': float, 'decimate_type': str},
+    'WEIGHTED_NORMAL': {'weight': int, 'keep_sharp': bool},
+    'ARRAY': {'count': int, 'use_relative_offset': bool},
+}
+
+_FUNCTIONS = {
+    'radians': math.radians, 'sin': math.sin, 'cos': math.cos,
+    'sqrt': math.sqrt, 'abs': abs, 'min': min, 'max': max,
+}
+_BINOPS = {
+    ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b, ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b, ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b,
+}
+
+
+class SpecError(ValueError):
+    """La especificación de un prop no es válida (se listan todos los errores)."""
+
+    def __init__(self, errors, source=None):
+        self.errors = list(errors)
+        self.source = source
+        where = f" en {source}" if source else ""
+        super().__init__(f"Especificación inválida{where}:\n  " + "\n  ".join(self.errors))
+
+
+# --- EXPRESIONES ---
+
+def evaluate(value, variables):
+    """Evalúa un número o una expresión aritmética con las variables dadas."""
+    if isinstance(value, bool):
+        raise ValueError(f"valor no numérico: {value!r}")
+    if isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"valor no numérico: {value!r}")
+    tree = ast.parse(value, mode='eval')
+    return _eval_node(tree.body, variables)
+
+
+def _eval_node(node, variables):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id in variables:
+            return variables[node.id]
+        if node.id == 'pi':
+            return math.pi
+        raise ValueError(f"variable desconocida '{node.id}'")
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        return _BINOPS[type(node.op)](_eval_node(node.left, variables),
+                                      _eval_node(node.right, variables))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _eval_node(node.operand, variables)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCTIONS and not node.keywords):
+        return _FUNCTIONS[node.func.id](*(_eval_node(a, variables) for a in node.args))
+    raise ValueError(f"expresión no permitida: {ast.dump(node)}")
+
+
+def _resolve_vars(declared, variables, errors, where, overrides=None):
+    variables = dict(variables)
+    overrides = overrides or {}
+    for key, value in (declared or {}).items():
+        if key in overrides:
+            variables[key] = overrides[key]
+            continue
+        try:
+            variables[key] = evaluate(value, variables)
+        except (ValueError, SyntaxError, ZeroDivisionError, TypeError) as e:
+            errors.append(f"{where}: variable '{key}': {e}")
+    return variables
+
+
+def _vector(value, variables, errors, where):
+    if not isinstance(value, list) or len(value) != 3:
+        errors.append(f"{where}: se esperaba una lista de 3 valores, no {value!r}")
+        return (0.0, 0.0, 0.0)
+    result = []
+    for item in value:
+        try:
+            result.append(float(evaluate(item, variables)))
+        except (ValueError, SyntaxError, ZeroDivisionError, TypeError) as e:
+            errors.append(f"{where}: {e}")
+            result.append(0.0)
+    return tuple(result)
+
+
+def _repeat_values(spec, variables, errors, where):
+    if isinstance(spec, list):
+        return spec
+    try:
+        count = evaluate(spec, variables)
+    except (ValueError, SyntaxError, ZeroDivisionError, TypeError) as e:
+        errors.append(f"{where}: {e}")
+        return []
+    if int(count) != count:
+        errors.append(f"{where}: el número de repeticiones debe ser entero, no {count!r}")
+        return []
+    return list(range(int(count)))
+
+
+# --- VALIDACIÓN Y EXPANSIÓN ---
+
+def expand_spec(spec, variables=None):
+    """Valida la especificación y devuelve (piezas resueltas, root resuelto).
+
+    Lanza SpecError con todos los problemas encontrados; si no lanza, la
+    construcción no necesita volver a comprobar nada.
+    """
+    errors = []
+    if not isinstance(spec, dict):
+        raise SpecError(["la especificación debe ser un objeto JSON"])
+
+    for key in ('collection', 'parts', 'root'):
+        if key not in spec:
+            errors.append(f"falta la clave '{key}'")
+
+    materials = _section(spec, 'materials', errors)
+    for key, params in materials.items():
+        if not isinstance(params, dict):
+            errors.append(f"material '{key}': debe ser un objeto")
+            continue
+        unknown = set(params) - set(MATERIAL_KEYS)
+        if unknown:
+            errors.append(f"material '{key}': claves desconocidas {sorted(unknown)}")
+        if 'name' not in params or 'color' not in params:
+            errors.append(f"material '{key}': necesita 'name' y 'color'")
+        else:
+            if not isinstance(params['name'], str):
+                errors.append(f"material '{key}': 'name' debe ser texto, no {params['name']!r}")
+            if not _is_color(params['color']):
+                errors.append(f"material '{key}': el color debe ser una lista de 4 números (RGBA), "
+                              f"no {params['color']!r}")
+        for attr in MATERIAL_NUMBERS:
+            if attr in params and not _matches_type(params[attr], float):
+                errors.append(f"material '{key}': '{attr}' debe ser un número, no {params[attr]!r}")
+        if 'emission' in params and not isinstance(params['emission'], bool):
+            errors.append(f"material '{key}': 'emission' debe ser true o false, no {params['emission']!r}")
+
+    # Las variables pasadas desde fuera sustituyen a las del JSON antes de
+    # calcular las que dependen de ellas (variantes de un mismo prop)
+    declared = _section(spec, 'vars', errors)
+    top_vars = _resolve_vars(declared, {}, errors, "vars", overrides=variables)
+    for key in set(variables or {}) - set(declared):
+        errors.append(f"variable externa '{key}' no declarada en 'vars'")
+    defaults = _section(spec, 'defaults', errors)
+    for primitive, part_defaults in list(defaults.items()):
+        if primitive not in PRIMITIVES:
+            errors.append(f"defaults: primitiva inválida {primitive!r}")
+            continue
+        if not isinstance(part_defaults, dict):
+            errors.append(f"defaults.{primitive}: debe ser un objeto")
+            defaults[primitive] = {}
+            continue
+        if 'modifiers' in part_defaults:
+            _check_modifiers(part_defaults['modifiers'], errors, f"defaults.{primitive}")
+        if 'smooth' in part_defaults and not isinstance(part_defaults['smooth'], bool):
+            errors.append(f"defaults.{primitive}: 'smooth' debe ser true o false, "
+                          f"no {part_defaults['smooth']!r}")
+
+    parts = []
+    if isinstance(spec.get('parts', []), list):
+        _expand_parts(spec.get('parts', []), top_vars, defaults, materials, parts, errors, "parts")
+    else:
+        errors.append("'parts' debe ser una lista")
+
+    root = None
+    if 'root' in spec and not isinstance(spec['root'], dict):
+        errors.append("'root' debe ser un objeto")
+    elif 'root' in spec:
+        root_spec = spec['root']
+        where = "root"
+        if 'name' not in root_spec:
+            errors.append("root: falta 'name'")
+        root = {
+            'name': root_spec.get('name', ''),
+            'display': root_spec.get('display', 'ARROWS'),
+            'location': _vector(root_spec.get('location', [0, 0, 0]), top_vars, errors, where),
+            'rotation': tuple(math.radians(a) for a in
+                              _vector(root_spec.get('rotation', [0, 0, 0]), top_vars, errors, where)),
+            'scale': _vector(root_spec.get('scale', [1, 1, 1]), top_vars, errors, where),
+        }
+
+    if errors:
+        raise SpecError(errors)
+    return parts, root
+
+
+def _expand_parts(entries, variables, defaults, materials, out, errors, where):
+    for index, entry in enumerate(entries):
+        here = f"{where}[{index}]"
+        if not isinstance(entry, dict):
+            errors.append(f"{here}: cada pieza debe ser un objeto")
+            continue
+
+        if 'parts' in entry:
+            unknown = set(entry) - set(GROUP_KEYS)
+            if unknown:
+                errors.append(f"{here}: claves desconocidas en el grupo {sorted(unknown)}")
+            repeat = _section(entry, 'repeat', errors)
+            group_vars = _section(entry, 'vars', errors)
+            if not isinstance(entry['parts'], list):
+                errors.append(f"{here}: 'parts' debe ser una lista")
+                continue
+            names = list(repeat)
+            value_lists = [_repeat_values(repeat[n], variables, errors, f"{here}.repeat.{n}") for n in names]
+            for combo in itertools.product(*value_lists):
+                scope = dict(variables)
+                scope.update(zip(names, combo))
+                scope = _resolve_vars(group_vars, scope, errors, f"{here}.vars")
+                _expand_parts(entry['parts'], scope, defaults, materials, out, errors, f"{here}.parts")
+            continue
+
+        unknown = set(entry) - set(PART_KEYS)
+        if unknown:
+            errors.append(f"{here}: claves desconocidas {sorted(unknown)}")
+
+        primitive = entry.get('primitive')
+        if primitive not in PRIMITIVES:
+            errors.append(f"{here}: primitiva inválida {primitive!r} (usa {', '.join(PRIMITIVES)})")
+            continue
+
+        try:
+            name = entry['name'].format(**variables)
+        except KeyError as e:
+            errors.append(f"{here}: variable {e} no definida en el nombre")
+            continue
+        except (ValueError, IndexError) as e:
+            errors.append(f"{here}: nombre inválido {entry['name']!r}: {e}")
+            continue
+        except (AttributeError, TypeError):
+            errors.append(f"{here}: falta 'name'")
+            continue
+
+        material = entry.get('material')
+        if material is not None and material not in materials:
+            errors.append(f"{here} ({name}): material desconocido '{material}'")
+
+        part_defaults = defaults.get(primitive, {})
+        # Los de 'defaults' ya se comprobaron una vez en expand_spec
+        if 'modifiers' in entry:
+            _check_modifiers(entry['modifiers'], errors, f"{here} ({name})")
+        modifiers = entry.get('modifiers', part_defaults.get('modifiers', []))
+        smooth = entry.get('smooth', part_defaults.get('smooth', False))
+        if not isinstance(smooth, bool):
+            errors.append(f"{here} ({name}): 'smooth' debe ser true o false, no {smooth!r}")
+
+        out.append({
+            'name': name,
+            'primitive': primitive,
+            'location': _vector(entry.get('location', [0, 0, 0]), variables, errors, f"{here} ({name})"),
+            'rotation': tuple(math.radians(a) for a in
+                              _vector(entry.get('rotation', [0, 0, 0]), variables, errors, f"{here} ({name})")),
+            'scale': _vector(entry.get('scale', [1, 1, 1]), variables, errors, f"{here} ({name})"),
+            'material': material,
+            'modifiers': modifiers,
+            'smooth': smooth is True,
+        })
+
+
+def _section(spec, key, errors):
+    """Sección opcional que debe ser un objeto JSON ({} si falta o no lo es)."""
+    value = spec.get(key, {})
+    if not isinstance(value, dict):
+        errors.append(f"'{key}' debe ser un objeto, no {type(value).__name__}")
+        return {}
+    return value
+
+
+def _is_color(value):
+    return (isinstance(value, list) and len(value) == 4
+            and all(isinstance(c, (int, float)) and not isinstance(c, bool) for c in value))
+
+
+def _check_modifiers(modifiers, errors, where):
+    """Tipo y atributos de cada modificador, para no fallar con el prop a medio construir."""
+    if not isinstance(modifiers, list):
+        errors.append(f"{where}: 'modifiers' debe ser una lista")
+        return
+    for index, mod in enumerate(modifiers):
+        here = f"{where}.modifiers[{index}]"
+        if not isinstance(mod, dict) or 'type' not in mod:
+            errors.append(f"{here}: modificador sin 'type'")
+            continue
+        attrs = MODIFIER_ATTRS.get(mod['type'])
+        if attrs is None:
+            errors.append(f"{here}: tipo de modificador desconocido {mod['type']!r} "
+                          f"(usa {', '.join(MODIFIER_ATTRS)})")
+            continue
+        for attr, value in mod.items():
+            if attr in ('type', 'name'):
+                continue
+            expected = attrs.get(attr)
+            if expected is None:
+                errors.append(f"{here}: atributo desconocido '{attr}' para {mod['type']}")
+            elif not _matches_type(value, expected):
+                errors.append(f"{here}: '{attr}' debe ser {expected.__name__}, no {value!r}")
+
+
+def _matches_type(value, expected):
+    if expected is bool or isinstance(value, bool):
+        return isinstance(value, bool) and expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def validate_spec(spec, variables=None):
+    """Solo valida; lanza SpecError si hay problemas."""
+    expand_spec(spec, variables)
+
+
+def spec_path(name_or_path):
+    """Ruta del JSON: un nombre de python/props o una ruta .json (relativa a python/)."""
+    if name_or_path.endswith(".json"):
+        # Una ruta absoluta se queda igual; una relativa no depende del directorio actual
+        return os.path.join(_script_dir, name_or_path)
+    return os.path.join(PROPS_DIR, f"{name_or_path}.json")
+
+
+def load_spec(name_or_path):
+    """Carga un JSON por ruta o por nombre dentro de python/props."""
+    with open(spec_path(name_or_path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# --- CONSTRUCCIÓN POR LOTES ---
+
+def build_prop(spec, variables=None, source=None):
+    """Construye el prop completo y devuelve su objeto ROOT."""
+    # Se valida todo antes de tocar la escena
+    try:
+        parts, root_spec = expand_spec(spec, variables)
+    except SpecError as e:
+        if source is None:
+            raise
+        # El mensaje dice qué archivo falla, no solo qué clave
+        raise SpecError(e.errors, source=source) from None
+    with batch.BatchGeneration(spec['collection']):
+        return _build_expanded(spec, parts, root_spec)
+
+
+def _build_expanded(spec, parts, root_spec):
+    collection = bpy.data.collections.new(spec['collection'])
+    bpy.context.scene.collection.children.link(collection)
+
+    # 1. Materiales (una sola vez por clave)
+    materials = {key: material_library.get_material(**params)
+                 for key, params in spec.get('materials', {}).items()}
+
+    # 2. Mallas: todas reservadas antes de crear ningún objeto
+    meshes = [primitives.primitive_mesh(p['primitive'], p['name'], p['smooth'])
+              for p in parts]
+
+    # 3. Objetos y transformaciones
+    objects = []
+    for part, mesh in zip(parts, meshes):
+        obj = bpy.data.objects.new(part['name'], mesh)
+        obj.location = part['location']
+        obj.rotation_euler = part['rotation']
+        obj.scale = part['scale']
+        if part['material']:
+            primitives.set_material(obj, materials[part['material']])
+        objects.append(obj)
+
+    # 4. Enlazar a la colección
+    for obj in objects:
+        collection.objects.link(obj)
+
+    # 5. Modificadores
+    for part, obj in zip(parts, objects):
+        for mod_spec in part['modifiers']:
+            mod = obj.modifiers.new(name=mod_spec.get('name', mod_spec['type'].title()),
+                                    type=mod_spec['type'])
+            for attr, value in mod_spec.items():
+                if attr not in ('type', 'name'):
+                    setattr(mod, attr, value)
+
+    # 6. ROOT
+    root = primitives.add_root(collection, root_spec['name'], root_spec['display'])
+    root.location = root_spec['location']
+    root.rotation_euler = root_spec['rotation']
+    root.scale = root_spec['scale']
+
+    if spec.get('message'):
+        print(spec['message'])
+    return root
+
+
+def build_prop_file(name_or_path, variables=None):
+    """Atajo: carga y construye un prop. 'variables' sobrescribe las 'vars' del JSON."""
+    path = spec_path(name_or_path)
+    return build_prop(load_spec(path), variables, source=os.path.relpath(path, _script_dir))
+
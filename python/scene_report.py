@@ -0,0 +1,133 @@
+import bpy
+import json
+import os
+
+import material_library
+import poly_budget
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Informe de complejidad de la escena, por colección.
+#
+# Para cada colección: objetos, vértices y triángulos evaluados (después de
+# los modificadores), modificadores, mallas únicas, materiales únicos y
+# materiales emisivos. Las copias LOD1+ de lod.py, sus empties de nivel y las
+# cajas _Pick y _Occl de pick_proxies.py no cuentan (solo se suman en "Auxil."): así el
+# peso no cambia con --lod ni con las cajas de selección. Se guarda en JSON para comparar entre builds; si ya
+# había un informe en la misma ruta se imprimen las diferencias.
+#
+#   Pegar en Blender y ejecutar, o: build_setup.py --report build/scene_report.json
+
+DEFAULT_REPORT = os.path.join(os.path.dirname(_script_dir), "build", "scene_report.json")
+
+FIELDS = ["objects", "vertices", "triangles", "modifiers", "meshes", "materials", "emission", "auxiliary"]
+HEADERS = ["Objetos", "Vértices", "Triáng.", "Modif.", "Mallas", "Mater.", "Emisivos", "Auxil."]
+
+
+def is_emissive(mat):
+    """Emisivo según la biblioteca o, si no viene de ella, según sus nodos."""
+    if material_library.is_emission(mat):
+        return True
+    if not mat.use_nodes or mat.node_tree is None:
+        return False
+    for node in mat.node_tree.nodes:
+        if node.type == 'EMISSION':
+            return True
+        if node.type == 'BSDF_PRINCIPLED' and node.inputs['Emission Strength'].default_value > 0:
+            return True
+    return False
+
+
+def is_auxiliary(obj):
+    """Objetos que añade la build y no son contenido: LOD1+, empties LOD y cajas _Pick/_Occl."""
+    return (bool(obj.get("pick_proxy")) or bool(obj.get("occluder")) or "lod_level" in obj
+            or poly_budget._is_reduced_lod(obj))
+
+
+def collection_stats(collection, depsgraph):
+    vertices = triangles = modifiers = 0
+    meshes = set()
+    materials = set()
+    objects = [obj for obj in collection.all_objects if not is_auxiliary(obj)]
+    for obj in objects:
+        modifiers += len(obj.modifiers)
+        if obj.type != 'MESH':
+            continue
+        verts, tris = poly_budget.evaluated_counts(obj, depsgraph)
+        vertices += verts
+        triangles += tris
+        meshes.add(obj.data.name)
+        materials.update(slot.material.name for slot in obj.material_slots if slot.material)
+
+    return {
+        "objects": len(objects),
+        "vertices": vertices,
+        "triangles": triangles,
+        "modifiers": modifiers,
+        "meshes": len(meshes),
+        "materials": len(materials),
+        "emission": sum(1 for name in materials if is_emissive(bpy.data.materials[name])),
+        "auxiliary": len(collection.all_objects) - len(objects),
+    }
+
+
+def build_report():
+    """Informe de todas las colecciones de la escena (y el total)."""
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    collections = {c.name: collection_stats(c, depsgraph)
+                   for c in bpy.context.scene.collection.children}
+    # En el total las mallas y materiales compartidos entre colecciones cuentan una vez
+    total = {field: sum(stats[field] for stats in collections.values()) for field in FIELDS}
+    scene_objects = [o for o in bpy.context.scene.objects if not is_auxiliary(o)]
+    total["meshes"] = len({o.data.name for o in scene_objects if o.type == 'MESH'})
+    scene_materials = {s.material for o in scene_objects for s in o.material_slots if s.material}
+    total["materials"] = len(scene_materials)
+    total["emission"] = sum(1 for mat in scene_materials if is_emissive(mat))
+
+    return {"blender": bpy.app.version_string, "collections": collections, "total": total}
+
+
+def print_report(report, previous=None):
+    """Tabla legible; con previous añade la diferencia de triángulos y objetos."""
+    rows = list(report["collections"].items()) + [("TOTAL", report["total"])]
+    width = max(len(name) for name in ["Colección"] + [name for name, _ in rows])
+
+    print()
+    header = "Colección".ljust(width) + "".join(f"  {h:>9}" for h in HEADERS)
+    if previous:
+        header += f"  {'Δ Triáng.':>10}  {'Δ Objetos':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in rows:
+        line = name.ljust(width) + "".join(f"  {stats[f]:9d}" for f in FIELDS)
+        if previous:
+            old = previous["total"] if name == "TOTAL" else previous["collections"].get(name)
+            if old is None:
+                line += f"  {'nueva':>10}  {'':>9}"
+            else:
+                line += (f"  {stats['triangles'] - old['triangles']:+10d}"
+                         f"  {stats['objects'] - old['objects']:+9d}")
+        print(line)
+
+
+def write_report(path=DEFAULT_REPORT):
+    """Genera el informe, lo imprime comparado con el anterior y lo guarda."""
+    previous = None
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f)
+
+    report = build_report()
+    print_report(report, previous)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Informe guardado en {path}")
+    return report
+
+
+if __name__ == "__main__":
+    write_report()
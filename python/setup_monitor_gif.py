@@ -1,32 +1,22 @@
 import bpy
-import os
 
+import assets
+import batch
+import material_library
+import media_cache
+
+@batch.BatchGeneration("Pantalla del monitor")
 def setup_monitor_debug():
     # 1. Lista de posibles archivos a buscar
     possible_files = ["monitor.gif", "monitor.mp4", "monitor.png", "monitor.jpg"]
-    found_file = None
-    
-    # Carpetas donde buscar:
-    # 1. Carpeta del archivo .blend actual (si está guardado)
-    # 2. c:\paginas_webs\blender\
-    search_folders = [r"c:\paginas_webs\blender"]
-    if bpy.data.is_saved:
-        search_folders.insert(0, os.path.dirname(bpy.data.filepath))
-        
-    print(f"Buscando archivos en: {search_folders}")
 
-    for folder in search_folders:
-        if not os.path.exists(folder): continue
-        for fname in possible_files:
-            full_path = os.path.join(folder, fname)
-            if os.path.exists(full_path):
-                found_file = full_path
-                break
-        if found_file: break
+    # Carpetas donde buscar: ver assets.py (SETUP_ASSETS_PATH, carpeta del .blend...)
+    print(f"Buscando archivos en: {assets.search_folders()}")
+    found_file = assets.find_asset(possible_files)
     
     # --- OBTENER MATERIAL ---
     mat_name = "Peri_Screen_Glow"
-    mat = bpy.data.materials.get(mat_name)
+    mat = material_library.edit_material(mat_name)
     
     if not mat:
         print(f"ERROR CRÍTICO: No existe el material '{mat_name}'.")
@@ -66,16 +56,29 @@ def setup_monitor_debug():
             tex_image = nodes.new('ShaderNodeTexImage')
             tex_image.location = (0, 0)
             
-            img = bpy.data.images.load(found_file, check_existing=True)
-            tex_image.image = img
-            
             # Configuración si es video/gif
             if found_file.endswith(('.gif', '.mp4', '.avi')):
-                img.source = 'MOVIE'
+                # Decodificado una sola vez a PNG (ver media_cache.py)
+                sequence = media_cache.decode_frames(found_file)
+                if sequence is not None:
+                    img = bpy.data.images.load(sequence.first_frame, check_existing=True)
+                    img.source = 'SEQUENCE'
+                    tex_image.image_user.frame_duration = sequence.frames
+                    tex_image.image_user.use_cyclic = True
+                    media_cache.export_web_atlas(sequence, "monitor")
+                else:
+                    print("ADVERTENCIA: sin fotogramas decodificados (¿ffmpeg no encontrado?); "
+                          "el vídeo se decodificará en cada fotograma.")
+                    img = bpy.data.images.load(found_file, check_existing=True)
+                    img.source = 'MOVIE'
+                    tex_image.image_user.frame_duration = 250
+                tex_image.image = img
                 tex_image.image_user.use_auto_refresh = True
-                tex_image.image_user.frame_duration = 250
                 tex_image.image_user.frame_start = 1
                 tex_image.extension = 'CLIP'
+            else:
+                img = bpy.data.images.load(found_file, check_existing=True)
+                tex_image.image = img
             
             # Mapeo
             tex_coord = nodes.new('ShaderNodeTexCoord')
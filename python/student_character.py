@@ -1,6 +1,11 @@
 import bpy
 import math
 
+import batch
+import material_library
+import primitives
+
+@batch.BatchGeneration("Personaje estudiante")
 def create_student_character():
     collection_name = "Personaje_Estudiante"
     collection = bpy.data.collections.new(collection_name)
@@ -8,20 +13,7 @@ def create_student_character():
 
     # --- MATERIALES ---
     def create_material(name, color, roughness=0.5):
-        mat = bpy.data.materials.get(name)
-        if not mat:
-            mat = bpy.data.materials.new(name=name)
-            mat.use_nodes = True
-            nodes = mat.node_tree.nodes
-            nodes.clear()
-            output = nodes.new('ShaderNodeOutputMaterial')
-            output.location = (400, 0)
-            shader = nodes.new('ShaderNodeBsdfPrincipled')
-            shader.inputs['Base Color'].default_value = color
-            shader.inputs['Roughness'].default_value = roughness
-            shader.location = (0, 0)
-            mat.node_tree.links.new(shader.outputs[0], output.inputs['Surface'])
-        return mat
+        return material_library.get_material(name, color, roughness=roughness)
 
     mat_skin = create_material("Skin_Tone", (0.8, 0.6, 0.5, 1), roughness=0.6)
     mat_shirt = create_material("Student_Hoodie_Grey", (0.2, 0.2, 0.25, 1), roughness=0.9)
@@ -32,29 +24,9 @@ def create_student_character():
 
     # --- HELPERS ---
     def create_obj(type, name, loc, scale, rot=(0,0,0), mat=None):
-        if type == 'CUBE':
-            bpy.ops.mesh.primitive_cube_add(size=1, location=loc, rotation=rot)
-        elif type == 'SPHERE':
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=0.5, location=loc, rotation=rot)
-        elif type == 'CYLINDER':
-            bpy.ops.mesh.primitive_cylinder_add(radius=0.5, depth=1, location=loc, rotation=rot)
-            
-        obj = bpy.context.active_object
-        obj.name = name
-        obj.scale = scale
-        
-        if mat:
-            if obj.data.materials: obj.data.materials[0] = mat
-            else: obj.data.materials.append(mat)
-            
-        for coll in obj.users_collection: coll.objects.unlink(obj)
-        collection.objects.link(obj)
-        
-        # Suavizar
-        if type in ['SPHERE', 'CYLINDER']:
-            bpy.ops.object.shade_smooth()
-            
-        return obj
+        # Suavizar esferas y cilindros
+        return primitives.add_primitive(collection, type, name, loc, scale, rot, mat,
+                                        smooth=type in ['SPHERE', 'CYLINDER'])
 
     # --- CONSTRUCCIÓN (Low Poly Stylized) ---
     
@@ -107,17 +79,7 @@ def create_student_character():
     create_obj('CUBE', "Tirante_R", (0.1, 0.13, backpack_z + 0.1), (0.05, 0.02, 0.3), (math.radians(15), 0, 0), mat=mat_backpack)
 
     # --- ROOT OBJECT ---
-    bpy.ops.object.empty_add(type='ARROWS', location=(0, 0, 0))
-    root = bpy.context.active_object
-    root.name = "Estudiante_ROOT"
-    collection.objects.link(root)
-    for coll in root.users_collection:
-        if coll != collection: coll.objects.unlink(root)
-
-    # Emparentar
-    for obj in collection.objects:
-        if obj != root:
-            obj.parent = root
+    root = primitives.add_root(collection, "Estudiante_ROOT")
 
     # Posicionar en la habitación (De pie cerca de la silla)
     root.location = (-1.0, -1.0, 0)
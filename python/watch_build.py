@@ -0,0 +1,139 @@
+import bpy
+import argparse
+import glob
+import importlib
+import os
+import sys
+import time
+import traceback
+
+# Punto de entrada como build_setup.py: pone python/ en sys.path antes de importarlo
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+if _script_dir not in sys.path:
+    sys.path.append(_script_dir)
+
+import build_cache
+import build_setup
+
+# Modo watch: reconstruye y reexporta al guardar un script.
+#
+#   blender --background --python python/watch_build.py -- [opciones de build_setup.py]
+#   python web_project/run_server.py        (en otra terminal; el visor se actualiza solo)
+#
+# Vigila python/*.py y python/props/*.json. Al guardar, recarga los módulos
+# cambiados en este mismo proceso (sin volver a arrancar Blender) y ejecuta
+# build_setup.py con --cache: solo se reconstruyen los props cuya huella
+# cambió (los que dependen del archivo según build_cache.source_closure); el
+# resto se carga de build/cache. El GLB se escribe en un temporal y se mueve
+# al final, así run_server.py nunca ve un archivo a medias; al detectarlo
+# avisa por /events y viewer_3d.js cambia el modelo.
+
+POLL_INTERVAL = 0.5
+# Los editores guardan en varios pasos: se espera a que nada cambie este tiempo
+SETTLE_TIME = 0.3
+
+
+def watched_files():
+    patterns = [os.path.join(_script_dir, "*.py"), os.path.join(_script_dir, "props", "*.json")]
+    files = {}
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            try:
+                files[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+    return files
+
+
+def wait_for_changes(known):
+    """Bloquea hasta que algún archivo cambie y se estabilice. Devuelve (rutas, estado)."""
+    while True:
+        time.sleep(POLL_INTERVAL)
+        current = watched_files()
+        if current == known:
+            continue
+        while True:
+            time.sleep(SETTLE_TIME)
+            settled = watched_files()
+            if settled == current:
+                break
+            current = settled
+        changed = {p for p in set(known) | set(current) if known.get(p) != current.get(p)}
+        return sorted(changed), current
+
+
+def affected_props(changed):
+    """Etapas prop cuyo código (o JSON) incluye alguno de los archivos cambiados."""
+    changed = set(changed)
+    return [s.module for s in build_setup.STAGES
+            if s.prop and changed.intersection(build_cache.source_closure(s.module))]
+
+
+def reload_modules(changed):
+    """Recarga los módulos cambiados que ya estaban importados."""
+    for path in changed:
+        name, extension = os.path.splitext(os.path.basename(path))
+        module = sys.modules.get(name)
+        if extension != ".py" or module is None or module.__name__ == __name__:
+            continue
+        try:
+            importlib.reload(module)
+        except Exception:
+            print(f"ERROR al recargar {name}:")
+            traceback.print_exc()
+            return False
+    return True
+
+
+def rebuild(glb, build_args):
+    """Build con caché y exportación atómica del GLB. True si terminó bien."""
+    temp = os.path.splitext(glb)[0] + ".watch.glb"
+    start = time.perf_counter()
+    try:
+        build_setup.main(["--cache", "--no-blend", "--glb", temp] + build_args)
+    except (Exception, SystemExit):
+        traceback.print_exc()
+        print("ERROR: la build falló; se espera al siguiente cambio.")
+        return False
+    os.replace(temp, glb)
+    print(f"GLB actualizado en {time.perf_counter() - start:.1f} s: {glb}")
+    return True
+
+
+def parse_args(argv=None):
+    if argv is None:
+        # Con blender --python los argumentos propios van después de "--"
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description="Reconstruye y reexporta el setup al guardar un script.")
+    parser.add_argument("--glb", default=build_setup.DEFAULT_GLB, help="GLB que sirve run_server.py")
+    parser.add_argument("--no-initial", action="store_true",
+                        help="No hacer una build al arrancar (esperar al primer cambio)")
+    # El resto (--share-meshes, --lod, --compression...) se pasa a build_setup.py
+    return parser.parse_known_args(argv)
+
+
+def main(argv=None):
+    args, build_args = parse_args(argv)
+    glb = os.path.abspath(args.glb)
+
+    known = watched_files()
+    if not args.no_initial:
+        rebuild(glb, build_args)
+
+    print(f"Vigilando {len(known)} archivos en {_script_dir} (Ctrl+C para salir)...")
+    try:
+        while True:
+            changed, known = wait_for_changes(known)
+            names = ", ".join(os.path.relpath(p, _script_dir) for p in changed)
+            props = affected_props(changed)
+            print(f"\nCambios: {names}")
+            print(f"Props a reconstruir: {', '.join(props) if props else 'ninguno (solo etapas finales)'}")
+            if reload_modules(changed):
+                rebuild(glb, build_args)
+    except KeyboardInterrupt:
+        print("\nModo watch detenido.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import * as THREE from 'three';
 import { GLTFLoader } from 'three/addons/loaders/GLTFLoader.js';
+import { DRACOLoader } from 'three/addons/loaders/DRACOLoader.js';
+import { MeshoptDecoder } from 'three/addons/libs/meshopt_decoder.module.js';
 import { OrbitControls } from 'three/addons/controls/OrbitControls.js';
 
 // Configuración básica
@@ -11,9 +13,17 @@ scene.fog = new THREE.Fog(0x050505, 5, 25);
 const camera = new THREE.PerspectiveCamera(50, window.innerWidth / window.innerHeight, 0.1, 100);
 camera.position.set(3, 2, 3);
 
-const renderer = new THREE.WebGLRenderer({ antialias: true });
+// Equipos modestos (o ?low en la URL): sin antialias y, si el GLB trae
+// lightmaps (build_setup.py --lightmaps), sin sombras dinámicas: la luz de los
+// RGB y la oclusión vienen horneadas. Sin lightmaps se mantienen las sombras.
+const lowEnd = new URLSearchParams(window.location.search).has('low')
+    || /Mobi|Android/i.test(navigator.userAgent)
+    || (navigator.hardwareConcurrency || 8) <= 4;
+let shadows = true;
+
+const renderer = new THREE.WebGLRenderer({ antialias: !lowEnd });
 renderer.setSize(window.innerWidth, window.innerHeight);
-renderer.shadowMap.enabled = true;
+renderer.shadowMap.enabled = shadows;
 renderer.shadowMap.type = THREE.PCFSoftShadowMap; // Sombras suaves
 renderer.toneMapping = THREE.ACESFilmicToneMapping; // Mejor color
 renderer.toneMappingExposure = 1.2;
@@ -25,7 +35,7 @@ scene.add(ambientLight);
 
 const dirLight = new THREE.DirectionalLight(0xffffff, 1.5);
 dirLight.position.set(5, 10, 7);
-dirLight.castShadow = true;
+dirLight.castShadow = shadows;
 dirLight.shadow.mapSize.width = 2048; // Sombras HD
 dirLight.shadow.mapSize.height = 2048;
 scene.add(dirLight);
@@ -43,17 +53,28 @@ controls.target.set(0, 1, 0);
 // Raycaster para detectar clicks
 const raycaster = new THREE.Raycaster();
 const mouse = new THREE.Vector2();
+// Objetos contra los que se lanzan los rayos: las cajas de selección del GLB
+// (pick_proxies.py) o, en GLB antiguos sin ellas, las piezas del monitor
+let pickTargets = [];
+// Lo que puede tapar el clic (Steve o el PC delante del monitor): las cajas de
+// oclusión del GLB más las mallas marcadas occluder_exact o, en GLB antiguos,
+// el resto de mallas. Solo se prueban si hay una caja de selección bajo el ratón
+let occluders = [];
 
 // --- LÓGICA DE STEVE ---
 let steveObject = null;
-let steveLimbs = {
-    legL: null, legR: null,
-    armL: null, armR: null
-};
+// Clips Walk/Idle horneados en el GLB (minecraft_steve.py)
+let steveMixer = null;
+let steveActions = {};
+let steveCurrent = null;
+// GLB antiguos sin clips: balanceo calculado en cada fotograma
+let steveLimbs = { legL: null, legR: null, armL: null, armR: null };
+let walkTime = 0;
+const clock = new THREE.Clock();
+const FADE_TIME = 0.2; // Segundos de transición entre clips
 const keys = { w: false, a: false, s: false, d: false };
 const moveSpeed = 0.05;
 const rotSpeed = 0.05;
-let walkTime = 0; // Para la animación
 
 window.addEventListener('keydown', (e) => {
     const k = e.key.toLowerCase();
@@ -66,83 +87,270 @@ window.addEventListener('keyup', (e) => {
 
 // Cargar Modelo
 const loader = new GLTFLoader();
+// El GLB puede venir comprimido (build_setup.py --compression)
+const dracoLoader = new DRACOLoader();
+dracoLoader.setDecoderPath('https://unpkg.com/three@0.160.0/examples/jsm/libs/draco/gltf/');
+loader.setDRACOLoader(dracoLoader);
+loader.setMeshoptDecoder(MeshoptDecoder);
 let monitorObject = null;
 
-loader.load('setup_gamer.glb', function (gltf) {
-    const model = gltf.scene;
-    scene.add(model);
-
-    // Buscar el objeto del monitor para hacerlo interactivo
-    model.traverse((child) => {
-        // Buscar a Steve y sus partes
-        if (child.name === 'Steve_ROOT') {
-            steveObject = child;
-            console.log("¡Steve encontrado!");
-        }
-        // Identificar extremidades (Nombres definidos en minecraft_steve.py)
-        if (child.name === 'Pierna_L') steveLimbs.legL = child;
-        if (child.name === 'Pierna_R') steveLimbs.legR = child;
-        if (child.name === 'Brazo_L') steveLimbs.armL = child;
-        if (child.name === 'Brazo_R') steveLimbs.armR = child;
-
-        if (child.isMesh) {
-            child.castShadow = true;
-            child.receiveShadow = true;
-            
-            // Identificar el monitor por nombre (del script de Blender)
-            if (child.name.includes("Monitor_Panel") || child.name.includes("Monitor_Body")) {
-                monitorObject = child;
-                // Cambiar cursor al pasar por encima
+let currentModel = null;
+
+function loadModel(url) {
+    loader.load(url, function (gltf) {
+        const model = gltf.scene;
+        // Al cambiar de modelo (modo watch) Steve conserva su posición
+        const previousSteve = steveObject;
+        if (currentModel) disposeModel(currentModel);
+        currentModel = model;
+        steveObject = null;
+        steveMixer = null;
+        steveActions = {};
+        steveCurrent = null;
+        steveLimbs = { legL: null, legR: null, armL: null, armR: null };
+        monitorObject = null;
+        pickTargets = [];
+        occluders = [];
+        scene.add(model);
+
+        // Niveles de detalle generados por lod.py (build_setup.py --lod)
+        const lodRoots = [];
+        model.traverse((child) => {
+            if (child.userData.lod_distances) lodRoots.push(child);
+        });
+        lodRoots.forEach(setupLod);
+
+        // Solo lightmaps.py pone occlusionTexture (aoMap) en los materiales
+        let baked = false;
+        model.traverse((child) => {
+            if (child.isMesh && child.material && child.material.aoMap) baked = true;
+        });
+        shadows = !(lowEnd && baked);
+        renderer.shadowMap.enabled = shadows;
+        dirLight.castShadow = shadows;
+
+        // Buscar el objeto del monitor para hacerlo interactivo
+        model.traverse((child) => {
+            // Buscar a Steve y sus partes
+            if (child.name === 'Steve_ROOT') {
+                steveObject = child;
+                console.log("¡Steve encontrado!");
+            }
+            if (child.name === 'Pierna_L') steveLimbs.legL = child;
+            if (child.name === 'Pierna_R') steveLimbs.legR = child;
+            if (child.name === 'Brazo_L') steveLimbs.armL = child;
+            if (child.name === 'Brazo_R') steveLimbs.armR = child;
+
+            // Caja de selección: invisible, pero el Raycaster no mira 'visible'
+            if (child.userData.pick_proxy) {
+                child.visible = false;
                 child.userData.isClickable = true;
+                pickTargets.push(child);
+                return;
+            }
+            if (child.userData.occluder) {
+                child.visible = false;
+                occluders.push(child);
+                return;
             }
+
+            if (child.isMesh) {
+                child.castShadow = shadows;
+                child.receiveShadow = shadows;
+
+                // Identificar el monitor por nombre (del script de Blender)
+                if (child.name.includes("Monitor_Panel") || child.name.includes("Monitor_Body")) {
+                    monitorObject = child;
+                    if (child.name === 'Monitor_Panel') setupScreenAtlas(child);
+                    // Cambiar cursor al pasar por encima
+                    child.userData.isClickable = true;
+                }
+            }
+        });
+
+        if (pickTargets.length === 0) {
+            model.traverse((child) => {
+                if (child.isMesh && child.userData.isClickable) pickTargets.push(child);
+            });
+        }
+        const boxes = occluders.length > 0;
+        model.traverse((child) => {
+            if (!child.isMesh || child.userData.isClickable || child.userData.occluder) return;
+            if (boxes ? child.userData.occluder_exact : !isReducedLod(child)) occluders.push(child);
+        });
+
+        if (previousSteve && steveObject) {
+            steveObject.position.copy(previousSteve.position);
+            steveObject.quaternion.copy(previousSteve.quaternion);
         }
+
+        // Las pistas apuntan a las extremidades por nombre (Pierna_L, Brazo_R...)
+        if (steveObject && gltf.animations.length > 0) {
+            steveMixer = new THREE.AnimationMixer(steveObject);
+            gltf.animations.forEach((clip) => {
+                steveActions[clip.name] = steveMixer.clipAction(clip);
+            });
+            playSteve('Idle');
+        }
+
+    }, undefined, function (error) {
+        console.error(error);
     });
+}
 
-}, undefined, function (error) {
-    console.error(error);
-});
+// Cambia de clip con un fundido corto (sin saltos si ya se está reproduciendo)
+function playSteve(name) {
+    const next = steveActions[name];
+    if (!next || next === steveCurrent) return;
+    next.reset().play();
+    if (steveCurrent) steveCurrent.crossFadeTo(next, FADE_TIME, false);
+    steveCurrent = next;
+}
+
+// Balanceo de piernas y brazos para GLB exportados sin los clips Walk/Idle
+function swingSteve(isMoving) {
+    walkTime = isMoving ? walkTime + 0.2 : 0;
+    const swing = Math.sin(walkTime) * 0.5;
+    if (steveLimbs.legL) steveLimbs.legL.rotation.x = swing;
+    if (steveLimbs.legR) steveLimbs.legR.rotation.x = -swing;
+    if (steveLimbs.armL) steveLimbs.armL.rotation.x = swing;
+    if (steveLimbs.armR) steveLimbs.armR.rotation.x = -swing;
+}
+
+// Libera la memoria de GPU del modelo anterior antes de añadir el nuevo
+function disposeModel(model) {
+    if (steveMixer) steveMixer.stopAllAction();
+    scene.remove(model);
+    model.traverse((child) => {
+        if (!child.isMesh) return;
+        child.geometry.dispose();
+        const materials = Array.isArray(child.material) ? child.material : [child.material];
+        materials.forEach((material) => {
+            Object.values(material).forEach((value) => {
+                if (value && value.isTexture) value.dispose();
+            });
+            material.dispose();
+        });
+    });
+    screenAtlas = null;
+}
+
+loadModel('setup_gamer.glb');
+
+// Modo watch: run_server.py avisa por /events cuando se reexporta un .glb
+// (python/watch_build.py) y se cambia el modelo sin recargar la página.
+if (window.location.protocol.startsWith('http') && window.EventSource) {
+    const events = new EventSource('events');
+    events.addEventListener('model', (event) => {
+        const { path, version } = JSON.parse(event.data);
+        if (!path.endsWith('/setup_gamer.glb')) return;
+        console.log(`Modelo actualizado (${version}), recargando...`);
+        loadModel(`setup_gamer.glb?v=${version}`);
+    });
+}
+
+// Copias LOD1+ de lod.py: sus mallas tapan lo mismo que las del nivel 0
+function isReducedLod(object) {
+    for (let node = object.parent; node; node = node.parent) {
+        if (node.userData.lod_level > 0) return true;
+    }
+    return false;
+}
+
+// THREE.LOD oculta el empty del nivel, no sus mallas: hay que mirar los padres.
+// Las cajas de oclusión están ocultas; cuenta lo que cuelga de ellas.
+function isShown(object) {
+    let node = object.userData.occluder ? object.parent : object;
+    for (; node; node = node.parent) {
+        if (!node.visible) return false;
+    }
+    return true;
+}
+
+// El ROOT guarda las distancias y cada empty <Prop>_LODn su nivel
+function setupLod(root) {
+    const distances = root.userData.lod_distances;
+    const lod = new THREE.LOD();
+    root.children
+        .filter((child) => child.userData.lod_level !== undefined)
+        .forEach((level) => lod.addLevel(level, distances[level.userData.lod_level]));
+    root.add(lod);
+}
+
+// Pantalla del monitor: atlas de fotogramas generado por setup_monitor_gif.py
+// (media_cache.py). Si no existe, se queda la imagen fija del GLB.
+let screenAtlas = null;
+
+async function setupScreenAtlas(mesh) {
+    let info;
+    try {
+        const response = await fetch('media/monitor_atlas.json');
+        if (!response.ok) return;
+        info = await response.json();
+    } catch (error) {
+        return;
+    }
+
+    const texture = await new THREE.TextureLoader().loadAsync(info.image);
+    texture.colorSpace = THREE.SRGBColorSpace;
+    texture.flipY = false; // Mismo convenio de UV que las texturas del GLB
+    const previous = mesh.material.emissiveMap || mesh.material.map;
+    if (previous) texture.rotation = previous.rotation;
+    texture.center.set(0.5, 0.5);
+    texture.repeat.set(1 / info.cols, 1 / info.rows);
+
+    mesh.material = mesh.material.clone();
+    mesh.material.emissiveMap = texture;
+    mesh.material.emissive.set(0xffffff);
+    mesh.material.needsUpdate = true;
+    screenAtlas = { texture, info, start: performance.now() };
+}
+
+function updateScreenAtlas(now) {
+    if (!screenAtlas) return;
+    const { texture, info, start } = screenAtlas;
+    const frame = Math.floor((now - start) / 1000 * info.fps) % info.frames;
+    const col = frame % info.cols;
+    const row = Math.floor(frame / info.cols);
+    // Con center en (0.5, 0.5) el desplazamiento se mide desde el centro del atlas
+    texture.offset.set((col + 0.5) / info.cols - 0.5, (row + 0.5) / info.rows - 0.5);
+}
 
 // Evento Click
 window.addEventListener('click', onMouseClick, false);
 window.addEventListener('mousemove', onMouseMove, false);
 
-function onMouseMove(event) {
+// Objeto clicable bajo el ratón, o null si no hay ninguno o algo visible lo tapa
+function pickClickable(event) {
     mouse.x = (event.clientX / window.innerWidth) * 2 - 1;
     mouse.y = -(event.clientY / window.innerHeight) * 2 + 1;
 
     raycaster.setFromCamera(mouse, camera);
-    const intersects = raycaster.intersectObjects(scene.children, true);
+    const hit = raycaster.intersectObjects(pickTargets, false)[0];
+    if (!hit || !hit.object.userData.isClickable) return null;
+
+    // Solo cuenta lo que está más cerca que la caja (far recorta los triángulos a probar)
+    raycaster.far = hit.distance;
+    const blocked = raycaster.intersectObjects(occluders, false).some((h) => isShown(h.object));
+    raycaster.far = Infinity;
+    return blocked ? null : hit.object;
+}
 
-    let hoveringClickable = false;
-    if (intersects.length > 0) {
-        if (intersects[0].object.userData.isClickable) {
-            hoveringClickable = true;
-        }
-    }
-    document.body.style.cursor = hoveringClickable ? 'pointer' : 'default';
+function onMouseMove(event) {
+    document.body.style.cursor = pickClickable(event) ? 'pointer' : 'default';
 }
 
 function onMouseClick(event) {
-    // Calcular posición del mouse
-    mouse.x = (event.clientX / window.innerWidth) * 2 - 1;
-    mouse.y = -(event.clientY / window.innerHeight) * 2 + 1;
-
-    raycaster.setFromCamera(mouse, camera);
-    const intersects = raycaster.intersectObjects(scene.children, true);
-
-    if (intersects.length > 0) {
-        const clickedObj = intersects[0].object;
-        
-        // Si clickeamos el monitor
-        if (clickedObj.userData.isClickable) {
-            openComputer();
-        }
+    // Si clickeamos el monitor
+    if (pickClickable(event)) {
+        openComputer();
     }
 }
 
 // Loop de animación
 function animate() {
     requestAnimationFrame(animate);
+    const delta = clock.getDelta();
 
     // Mover a Steve
     if (steveObject) {
@@ -161,24 +369,13 @@ function animate() {
         // 3. GRAVEDAD: Mantener en el suelo
         steveObject.position.y = 0; 
 
-        // Animación de caminar (swing)
-        if (isMoving) {
-            walkTime += 0.2;
-            const swing = Math.sin(walkTime) * 0.5; 
-
-            if (steveLimbs.legL) steveLimbs.legL.rotation.x = swing;
-            if (steveLimbs.legR) steveLimbs.legR.rotation.x = -swing;
-            if (steveLimbs.armL) steveLimbs.armL.rotation.x = swing;
-            if (steveLimbs.armR) steveLimbs.armR.rotation.x = -swing;
-        } else {
-            if (steveLimbs.legL) steveLimbs.legL.rotation.x = 0;
-            if (steveLimbs.legR) steveLimbs.legR.rotation.x = 0;
-            if (steveLimbs.armL) steveLimbs.armL.rotation.x = 0;
-            if (steveLimbs.armR) steveLimbs.armR.rotation.x = 0;
-            walkTime = 0;
-        }
+        // Animación de caminar: clips del GLB, o el balanceo de siempre si no los trae
+        if (steveMixer) playSteve(isMoving ? 'Walk' : 'Idle');
+        else swingSteve(isMoving);
     }
 
+    if (steveMixer) steveMixer.update(delta);
+    updateScreenAtlas(performance.now());
     controls.update();
     renderer.render(scene, camera);
 }
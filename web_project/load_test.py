@@ -0,0 +1,374 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+
+# Prueba de carga local de run_server.py.
+#
+#   python load_test.py [--concurrency 50] [--duration 20] [--server-args "--mode simple"]
+#   python load_test.py --url http://127.0.0.1:8000/ ...   (servidor ya arrancado)
+#
+# Sin --url arranca run_server.py en un puerto libre de 127.0.0.1 y lo para al
+# terminar: no hace falta red. Cada usuario virtual abre una conexión
+# keep-alive (como un navegador) y repite visitas a las dos páginas con todos
+# sus recursos: index.html con su CSS/JS y setup_gamer.html con su CSS, el
+# visor, setup_gamer.glb y el comienzo del vídeo con Range. Una parte de las
+# visitas son repetidas y revalidan con If-None-Match (la caché del navegador).
+#
+# Muestra peticiones por segundo, MB/s y latencias p50/p95/p99 por recurso, y
+# guarda el resultado en build/loadtest/<etiqueta>-<fecha>.json comparando el
+# p95 con la ejecución anterior de la misma etiqueta.
+
+WEB_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(os.path.dirname(WEB_DIR), "build", "loadtest")
+SERVER_SCRIPT = os.path.join(WEB_DIR, "run_server.py")
+
+# Recursos que pide el navegador en cada página (los que no existan se omiten)
+PAGES = {
+    "index": ["/index.html", "/css/portfolio_style.css", "/css/music_player.css",
+              "/js/music_player.js", "/musica.mp3"],
+    "setup": ["/setup_gamer.html", "/css/viewer_style.css", "/js/viewer_3d.js",
+              "/setup_gamer.glb", "/smash.mp4"],
+}
+# Peso de cada página en la mezcla de visitas
+PAGE_WEIGHTS = {"index": 0.4, "setup": 0.6}
+# Los medios se piden por rangos, como hace <video>/<audio> al empezar
+MEDIA_RANGE = "bytes=0-1048575"
+MEDIA_EXTENSIONS = (".mp4", ".mp3", ".webm")
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_DURATION = 20.0
+DEFAULT_REVISIT_RATIO = 0.5
+REQUEST_TIMEOUT = 30.0
+READ_CHUNK = 256 * 1024
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.ttfb = []
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.statuses = {}
+
+    def add(self, status, size, ttfb, latency):
+        self.count += 1
+        self.bytes += size
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.ttfb.append(ttfb)
+        self.latencies.append(latency)
+
+
+def percentile(values, p):
+    """Percentil por rango más cercano (en milisegundos)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index] * 1000
+
+
+# --- CLIENTE HTTP ---
+
+class Connection:
+    """Conexión HTTP/1.1 keep-alive mínima; se reabre si el servidor la cierra."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, path, headers):
+        """Hace un GET y lee la respuesta. Devuelve (estado, bytes, cabeceras, ttfb, total)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                 "Accept-Encoding: gzip, br", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        start = time.perf_counter()
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1"))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        ttfb = time.perf_counter() - start
+        status_line, *header_lines = head.decode("iso-8859-1").split("\r\n")
+        version, status = status_line.split(" ")[:2]
+        response_headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+
+        size = 0
+        status = int(status)
+        connection = response_headers.get("connection", "").lower()
+        if status not in (204, 304):
+            if "content-length" in response_headers:
+                remaining = int(response_headers["content-length"])
+                while remaining:
+                    chunk = await self.reader.read(min(READ_CHUNK, remaining))
+                    if not chunk:
+                        raise ConnectionError("Respuesta incompleta")
+                    size += len(chunk)
+                    remaining -= len(chunk)
+            else:
+                # Sin Content-Length el cuerpo termina al cerrar la conexión
+                while chunk := await self.reader.read(READ_CHUNK):
+                    size += len(chunk)
+                connection = "close"
+        if connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive"):
+            await self.close()
+        return status, size, response_headers, ttfb, time.perf_counter() - start
+
+
+# --- CARGA ---
+
+class LoadTest:
+    def __init__(self, host, port, pages, concurrency, duration, revisit_ratio, seed=0):
+        self.host = host
+        self.port = port
+        self.pages = pages
+        self.concurrency = concurrency
+        self.duration = duration
+        self.revisit_ratio = revisit_ratio
+        self.random = random.Random(seed)
+        self.stats = {}
+        self.visits = Stats()
+
+    async def fetch(self, connection, path, etags, revisit):
+        headers = {}
+        if path.endswith(MEDIA_EXTENSIONS):
+            headers["Range"] = MEDIA_RANGE
+        if revisit and path in etags:
+            headers["If-None-Match"] = etags[path]
+        stats = self.stats.setdefault(path, Stats())
+        try:
+            status, size, response_headers, ttfb, total = await asyncio.wait_for(
+                connection.request(path, headers), REQUEST_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            stats.errors += 1
+            await connection.close()
+            return False
+        if "etag" in response_headers:
+            etags[path] = response_headers["etag"]
+        stats.add(status, size, ttfb, total)
+        return status < 400
+
+    async def user(self, deadline):
+        connection = Connection(self.host, self.port)
+        etags = {}
+        names = list(self.pages)
+        weights = [PAGE_WEIGHTS.get(name, 1.0) for name in names]
+        try:
+            while time.perf_counter() < deadline:
+                page = self.random.choices(names, weights)[0]
+                revisit = bool(etags) and self.random.random() < self.revisit_ratio
+                if not revisit:
+                    # Visitante nuevo: sin caché ni conexión previas
+                    etags.clear()
+                    await connection.close()
+                start = time.perf_counter()
+                ok = True
+                for path in self.pages[page]:
+                    ok = await self.fetch(connection, path, etags, revisit) and ok
+                if ok:
+                    self.visits.add(200, 0, 0.0, time.perf_counter() - start)
+                else:
+                    self.visits.errors += 1
+        finally:
+            await connection.close()
+
+    async def run(self):
+        start = time.perf_counter()
+        deadline = start + self.duration
+        await asyncio.gather(*(self.user(deadline) for _ in range(self.concurrency)))
+        return time.perf_counter() - start
+
+
+async def existing_paths(host, port, pages):
+    """Quita de cada página los recursos que el servidor no tiene (404)."""
+    connection = Connection(host, port)
+    available = {}
+    missing = []
+    try:
+        for page, paths in pages.items():
+            available[page] = []
+            for path in paths:
+                status, _, _, _, _ = await connection.request(path, {"Range": "bytes=0-0"})
+                if status < 400:
+                    available[page].append(path)
+                else:
+                    missing.append(path)
+    finally:
+        await connection.close()
+    return available, missing
+
+
+def summarize(test, elapsed):
+    results = {}
+    for path, stats in sorted(test.stats.items()):
+        results[path] = {
+            "requests": stats.count,
+            "errors": stats.errors,
+            "statuses": {str(k): v for k, v in sorted(stats.statuses.items())},
+            "rps": round(stats.count / elapsed, 2),
+            "mb_per_s": round(stats.bytes / elapsed / 1e6, 3),
+            "p50_ms": round(percentile(stats.latencies, 50), 3),
+            "p95_ms": round(percentile(stats.latencies, 95), 3),
+            "p99_ms": round(percentile(stats.latencies, 99), 3),
+            "ttfb_p95_ms": round(percentile(stats.ttfb, 95), 3),
+        }
+    visits = test.visits
+    results["(visita)"] = {
+        "requests": visits.count,
+        "errors": visits.errors,
+        "rps": round(visits.count / elapsed, 2),
+        "p50_ms": round(percentile(visits.latencies, 50), 3),
+        "p95_ms": round(percentile(visits.latencies, 95), 3),
+        "p99_ms": round(percentile(visits.latencies, 99), 3),
+    }
+    return results
+
+
+def previous_run(label):
+    runs = sorted(glob.glob(os.path.join(RESULTS_DIR, f"{label}-*.json")))
+    if not runs:
+        return None
+    with open(runs[-1], encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def print_results(results, elapsed, previous=None):
+    width = max(len(name) for name in ["Recurso"] + list(results))
+    total = sum(r["requests"] for name, r in results.items() if name != "(visita)")
+    print()
+    print(f"{'Recurso'.ljust(width)}  {'Petic.':>7}  {'Errores':>7}  {'Pet/s':>8}  {'MB/s':>7}  "
+          f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'Δ p95':>7}")
+    print("-" * (width + 80))
+    for name, result in results.items():
+        old = (previous or {}).get(name)
+        delta = f"{result['p95_ms'] / old['p95_ms'] - 1:+7.0%}" if old and old["p95_ms"] else "      -"
+        mb = f"{result['mb_per_s']:7.2f}" if "mb_per_s" in result else "      -"
+        print(f"{name.ljust(width)}  {result['requests']:7d}  {result['errors']:7d}  "
+              f"{result['rps']:8.1f}  {mb}  {result['p50_ms']:8.2f}  {result['p95_ms']:8.2f}  "
+              f"{result['p99_ms']:8.2f}  {delta:>7}")
+    print(f"\nTotal: {total} peticiones en {elapsed:.1f} s ({total / elapsed:.1f} pet/s)")
+
+
+# --- SERVIDOR LOCAL ---
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, server_args):
+    command = [sys.executable, SERVER_SCRIPT, "--host", "127.0.0.1", "--port", str(port),
+               "--no-browser", "--quiet"] + server_args
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"run_server.py terminó al arrancar (código {process.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("run_server.py no empezó a escuchar en 10 s")
+
+
+def parse_url(url):
+    """(host, puerto, prefijo de ruta) de --url; solo http sin TLS."""
+    parts = urllib.parse.urlsplit(url if "://" in url else "http://" + url)
+    if parts.scheme != "http" or not parts.hostname:
+        raise ValueError(f"URL no soportada (se espera http://host[:puerto][/ruta]): {url}")
+    return parts.hostname, parts.port or 80, parts.path.rstrip("/")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga local de run_server.py.")
+    parser.add_argument("--url", help="Servidor ya arrancado (por defecto se arranca uno local)")
+    parser.add_argument("--server-args", default="",
+                        help="Argumentos extra para run_server.py, p. ej. \"--mode simple\"")
+    parser.add_argument("--concurrency", "-c", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Usuarios virtuales simultáneos")
+    parser.add_argument("--duration", "-d", type=float, default=DEFAULT_DURATION, help="Segundos de carga")
+    parser.add_argument("--revisit-ratio", type=float, default=DEFAULT_REVISIT_RATIO,
+                        help="Fracción de visitas repetidas que revalidan con If-None-Match")
+    parser.add_argument("--label", help="Etiqueta de los resultados (por defecto, el modo del servidor)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-save", action="store_true", help="No guardar los resultados")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server_args = args.server_args.split()
+    process = None
+    pages = PAGES
+    if args.url:
+        try:
+            host, port, prefix = parse_url(args.url)
+        except ValueError as e:
+            sys.exit(f"ERROR: {e}")
+        # Con una ruta en la URL (p. ej. /portafolio) los recursos cuelgan de ella
+        pages = {name: [prefix + path for path in paths] for name, paths in PAGES.items()}
+        label = args.label or "externo"
+    else:
+        host, port = "127.0.0.1", free_port()
+        process = start_server(port, server_args)
+        mode = server_args[server_args.index("--mode") + 1] if "--mode" in server_args else "async"
+        label = args.label or mode
+
+    try:
+        pages, missing = asyncio.run(existing_paths(host, port, pages))
+        for path in missing:
+            print(f"ADVERTENCIA: {path} no existe en el servidor; se omite de la mezcla.")
+        print(f"Carga: {args.concurrency} usuarios durante {args.duration:.0f} s contra "
+              f"http://{host}:{port} ({label})")
+        test = LoadTest(host, port, pages, args.concurrency, args.duration,
+                        args.revisit_ratio, args.seed)
+        elapsed = asyncio.run(test.run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    results = summarize(test, elapsed)
+    print_results(results, elapsed, previous_run(label))
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"label": label, "server_args": server_args, "concurrency": args.concurrency,
+                       "duration": round(elapsed, 3), "revisit_ratio": args.revisit_ratio,
+                       "results": results}, f, indent=2, sort_keys=True)
+        print(f"\nResultados guardados en {path}")
+    return 0 if not any(r["errors"] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,831 @@
+import argparse
+import asyncio
+import email.utils
+import gzip
+import hashlib
 import http.server
+import json
+import mimetypes
+import os
 import socketserver
+import threading
+import time
+import traceback
+import urllib.parse
 import webbrowser
-import os
+from collections import OrderedDict, namedtuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Servidor local del portafolio.
+#
+#   python run_server.py [--root CARPETA] [--port 8000] [--mode async|simple]
+#
+# El modo "async" (por defecto) atiende muchas conexiones a la vez con
+# asyncio: keep-alive, un máximo de conexiones simultáneas y un cliente lento
+# ya no bloquea a los demás. El modo "simple" es el servidor de siempre
+# (TCPServer + SimpleHTTPRequestHandler, una conexión cada vez).
+#
+# El modo async guarda en memoria cada archivo servido (hasta CACHE_MB en
+# total; al llenarse se descartan los menos usados) junto con sus variantes
+# gzip y brotli (si está instalado el paquete brotli), y las invalida cuando
+# cambia la fecha de modificación o el tamaño.
+# Las respuestas llevan ETag y Last-Modified, y con If-None-Match o
+# If-Modified-Since se responde 304 sin cuerpo: una visita repetida no vuelve
+# a leer, comprimir ni enviar nada.
+#
+# También entiende Range (206, y 416 si el rango no existe) para que el
+# <video> de setup_gamer.html salte sin descargar desde el principio. Los
+# archivos grandes que no se comprimen (vídeo, imágenes) no se guardan en
+# memoria: se envían con loop.sendfile, que en Linux/macOS usa os.sendfile
+# y copia del disco al socket sin pasar por Python.
+#
+# GET /metrics devuelve métricas en formato de texto de Prometheus: peticiones
+# y bytes por ruta, histogramas de tiempo hasta el primer byte y tiempo total,
+# y conexiones en curso y en espera.
+#
+# GET /events es un flujo Server-Sent Events: cuando cambia un .glb dentro de
+# root (por ejemplo al reexportar con python/watch_build.py) se envía un
+# evento "model" y viewer_3d.js cambia el modelo sin recargar la página.
 
 PORT = 8000
-DIRECTORY = r"c:\paginas_webs\blender\web_project"
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+MAX_CONNECTIONS = 128
+KEEPALIVE_TIMEOUT = 5.0      # Segundos esperando la siguiente petición
+MAX_HEADER_BYTES = 64 * 1024
+
+CACHE_MB = 256               # Memoria total para archivos y sus variantes comprimidas
+MAX_CACHED_FILE = 32 * 1024 * 1024
+# Archivos no comprimibles a partir de este tamaño se envían con sendfile
+SENDFILE_MIN_SIZE = 512 * 1024
+MIN_COMPRESS_SIZE = 1024
+# Al arrancar solo se precargan los recursos de la web (no los .py de esta carpeta)
+WARM_EXTENSIONS = (".html", ".css", ".js", ".mjs", ".json", ".svg", ".glb", ".gltf",
+                   ".png", ".jpg", ".jpeg", ".webp", ".gif", ".ico", ".woff2", ".mp4", ".webm")
+METRICS_PATH = "/metrics"
+EVENTS_PATH = "/events"
+WATCH_EXTENSIONS = (".glb",)
+WATCH_INTERVAL = 0.5         # Segundos entre comprobaciones de los archivos vigilados
+SSE_HEARTBEAT = 15.0         # Comentario periódico para detectar clientes desconectados
+# Los flujos /events no ocupan hueco de --max-connections; tienen su propio límite
+MAX_EVENT_STREAMS = 32
+# Cuerpos de petición mayores no se leen: se cierra la conexión
+MAX_DISCARD_BODY = 1024 * 1024
+# Límites superiores (segundos) de los histogramas de latencia
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Solo compensa guardar una variante si ahorra al menos un 10 %
+MIN_COMPRESS_RATIO = 0.9
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json",
+                      "image/svg+xml", "model/gltf")
+
+mimetypes.add_type("model/gltf-binary", ".glb")
+mimetypes.add_type("model/gltf+json", ".gltf")
+mimetypes.add_type("text/javascript", ".js")
+mimetypes.add_type("text/javascript", ".mjs")
+
+Request = namedtuple("Request", "method target path version headers")
+# variants: {codificación: bytes}; vacío si el archivo no cabe en la caché
+Asset = namedtuple("Asset", "path size mtime_ns etag last_modified content_type variants")
+
+
+class BadRequest(Exception):
+    pass
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+# --- CACHÉ DE ARCHIVOS ---
+
+def content_type(path):
+    ctype, _ = mimetypes.guess_type(path)
+    ctype = ctype or "application/octet-stream"
+    if ctype.startswith("text/") or ctype in ("application/json", "image/svg+xml"):
+        ctype += "; charset=utf-8"
+    return ctype
+
+
+def compress(data, ctype):
+    """Variantes comprimidas que merecen la pena ({codificación: bytes})."""
+    variants = {}
+    if len(data) < MIN_COMPRESS_SIZE or not ctype.startswith(COMPRESSIBLE_TYPES):
+        return variants
+    candidates = [("gzip", lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.insert(0, ("br", lambda: brotli.compress(data, quality=11)))
+    for encoding, compressor in candidates:
+        compressed = compressor()
+        if len(compressed) <= len(data) * MIN_COMPRESS_RATIO:
+            variants[encoding] = compressed
+    return variants
+
+
+class AssetCache:
+    def __init__(self, max_bytes=CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used = 0
+        # Ordenadas de menos a más recientemente usadas
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def fresh(self, path):
+        """Entrada de la caché si sigue al día con el archivo en disco, si no None."""
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        stat = os.stat(path)
+        if (stat.st_mtime_ns, stat.st_size) != (entry.mtime_ns, entry.size):
+            return None
+        with self.lock:
+            if path in self.entries:
+                self.entries.move_to_end(path)
+        return entry
+
+    def load(self, path):
+        """Lee (y comprime) el archivo y lo guarda. Se llama fuera del bucle de eventos."""
+        stat = os.stat(path)
+        ctype = content_type(path)
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+
+        variants = {}
+        compressible = ctype.startswith(COMPRESSIBLE_TYPES)
+        in_memory = compressible or stat.st_size < SENDFILE_MIN_SIZE
+        if in_memory and stat.st_size <= min(MAX_CACHED_FILE, self.max_bytes):
+            with open(path, "rb") as f:
+                data = f.read()
+            etag = hashlib.sha1(data).hexdigest()[:20]
+            variants = {"identity": data, **compress(data, ctype)}
+        else:
+            etag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+        entry = Asset(path, stat.st_size, stat.st_mtime_ns, etag, last_modified, ctype, variants)
+        size = sum(len(v) for v in variants.values())
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old is not None:
+                self.used -= sum(len(v) for v in old.variants.values())
+            # Se hace sitio descartando las entradas usadas hace más tiempo
+            while self.entries and self.used + size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.used -= sum(len(v) for v in evicted.variants.values())
+            if self.used + size > self.max_bytes:
+                # Sin sitio: se recuerdan los metadatos y el cuerpo se lee del disco
+                entry = entry._replace(variants={})
+                size = 0
+            self.entries[path] = entry
+            self.used += size
+        return entry
+
+    def warm(self, root):
+        """Precarga los recursos web de root (se ejecuta en un hilo al arrancar)."""
+        for folder, _, files in os.walk(root):
+            for name in files:
+                if not name.lower().endswith(WARM_EXTENSIONS):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    if self.fresh(path) is None:
+                        self.load(path)
+                except OSError as e:
+                    print(f"ADVERTENCIA: no se pudo precargar {path}: {e}")
+
 
-class Handler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=DIRECTORY, **kwargs)
+def preferred_encoding(accept_encoding, variants):
+    """La mejor variante disponible que acepta el cliente (br > gzip > identity)."""
+    accepted = set()
+    for token in accept_encoding.split(","):
+        name, _, params = token.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in variants and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
 
-print(f"Iniciando servidor en http://localhost:{PORT}")
-print(f"Sirviendo archivos desde: {DIRECTORY}")
-print("Presiona Ctrl+C para detener el servidor.")
 
-# Abrir el navegador automáticamente
-webbrowser.open(f"http://localhost:{PORT}/index.html")
+def not_modified(request, asset):
+    """True si la copia del cliente (If-None-Match / If-Modified-Since) sigue valiendo."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            tag = tag.removeprefix("W/").strip('"')
+            # Las variantes comprimidas llevan el mismo ETag con un sufijo
+            for encoding in ("br", "gzip"):
+                tag = tag.removesuffix(f"-{encoding}")
+            if tag == asset.etag:
+                return True
+        return False
 
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return asset.mtime_ns // 1_000_000_000 <= since
+    return False
+
+
+def byte_range(header, size):
+    """(inicio, fin incluido) de una cabecera Range, o None si se envía el archivo entero."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # Varios rangos: se permite responder con el archivo completo
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    if size == 0:
+        raise RangeNotSatisfiable()
     try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(first)
+            if start >= size:
+                raise RangeNotSatisfiable()
+            end = int(last) if last else size - 1
+            if end < start:
+                return None
+            end = min(end, size - 1)
+    except ValueError:
+        return None
+    return start, end
+
+
+def if_range_matches(request, asset):
+    """Sin If-Range, o si coincide con la versión actual, se respeta el Range."""
+    value = request.headers.get("if-range")
+    if value is None:
+        return True
+    if value.startswith('"'):
+        return value == f'"{asset.etag}"'
+    return value == asset.last_modified
+
+
+# --- MÉTRICAS ---
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        """Líneas _bucket (acumuladas), _sum y _count en formato Prometheus."""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.total:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self):
+        self.requests = {}          # (ruta, estado) -> peticiones
+        self.bytes_sent = {}        # ruta -> bytes de cuerpo
+        self.ttfb = {}              # ruta -> Histogram
+        self.duration = {}          # ruta -> Histogram
+        self.connections = 0        # conexiones atendidas ahora mismo
+        self.waiting = 0            # conexiones esperando un hueco (max-connections)
+        self.in_flight = 0          # peticiones en curso
+        self.started = time.time()
+
+    def record(self, path, status, sent, ttfb, duration):
+        self.requests[path, status] = self.requests.get((path, status), 0) + 1
+        self.bytes_sent[path] = self.bytes_sent.get(path, 0) + sent
+        self.ttfb.setdefault(path, Histogram()).observe(ttfb)
+        self.duration.setdefault(path, Histogram()).observe(duration)
+
+    def render(self, cache=None):
+        out = []
+
+        def metric(name, kind, help_text):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        metric("http_requests_total", "counter", "Peticiones atendidas por ruta y estado.")
+        for (path, status), count in sorted(self.requests.items()):
+            out.append(f'http_requests_total{{path="{_label(path)}",status="{status}"}} {count}')
+
+        metric("http_response_bytes_total", "counter", "Bytes de cuerpo enviados por ruta.")
+        for path, sent in sorted(self.bytes_sent.items()):
+            out.append(f'http_response_bytes_total{{path="{_label(path)}"}} {sent}')
+
+        for name, histograms, help_text in (
+                ("http_time_to_first_byte_seconds", self.ttfb,
+                 "Tiempo desde la petición hasta enviar las cabeceras."),
+                ("http_request_duration_seconds", self.duration,
+                 "Tiempo desde la petición hasta terminar de enviar el cuerpo.")):
+            metric(name, "histogram", help_text)
+            for path, histogram in sorted(histograms.items()):
+                out.extend(histogram.lines(name, f'path="{_label(path)}"'))
+
+        metric("http_connections_in_flight", "gauge", "Conexiones atendidas ahora mismo.")
+        out.append(f"http_connections_in_flight {self.connections}")
+        metric("http_connections_waiting", "gauge", "Conexiones esperando por --max-connections.")
+        out.append(f"http_connections_waiting {self.waiting}")
+        metric("http_requests_in_flight", "gauge", "Peticiones en curso.")
+        out.append(f"http_requests_in_flight {self.in_flight}")
+        if cache is not None:
+            metric("asset_cache_bytes", "gauge", "Memoria usada por la caché de archivos.")
+            out.append(f"asset_cache_bytes {cache.used}")
+            metric("asset_cache_entries", "gauge", "Archivos en la caché.")
+            out.append(f"asset_cache_entries {len(cache.entries)}")
+        metric("process_start_time_seconds", "gauge", "Hora de arranque del servidor (epoch).")
+        out.append(f"process_start_time_seconds {self.started:.3f}")
+        return "\n".join(out) + "\n"
+
+
+# --- EVENTOS (SSE) ---
+
+def scan_files(root, extensions=WATCH_EXTENSIONS):
+    """{ruta URL: (mtime_ns, tamaño)} de los archivos vigilados bajo root."""
+    files = {}
+    for folder, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(extensions):
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                url = "/" + os.path.relpath(path, root).replace(os.sep, "/")
+                files[url] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class ChangeNotifier:
+    """Vigila los .glb de root y avisa a cada suscriptor de /events."""
+
+    def __init__(self, root):
+        self.root = root
+        self.subscribers = set()
+
+    def subscribe(self):
+        queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    async def watch(self):
+        loop = asyncio.get_running_loop()
+        known = await loop.run_in_executor(None, scan_files, self.root)
+        pending = {}
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            current = await loop.run_in_executor(None, scan_files, self.root)
+            for url, state in current.items():
+                if known.get(url) == state:
+                    pending.pop(url, None)
+                # Se avisa cuando el archivo deja de cambiar (exportación terminada)
+                elif pending.get(url) == state:
+                    known[url] = state
+                    del pending[url]
+                    self.publish("model", {"path": url, "version": f"{state[0]:x}"})
+                else:
+                    pending[url] = state
+
+    def publish(self, event, data):
+        message = f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+        for queue in self.subscribers:
+            queue.put_nowait(message)
+
+
+# --- SERVIDOR ASYNCIO ---
+
+class StaticServer:
+    def __init__(self, root, max_connections=MAX_CONNECTIONS,
+                 keepalive_timeout=KEEPALIVE_TIMEOUT, quiet=False, cache_mb=CACHE_MB):
+        self.root = os.path.realpath(root)
+        self.keepalive_timeout = keepalive_timeout
+        self.quiet = quiet
+        self.limit = asyncio.Semaphore(max_connections)
+        self.cache = AssetCache(cache_mb * 1024 * 1024)
+        self.metrics = Metrics()
+        # Momento en que se escribieron las cabeceras de la respuesta en curso de cada conexión
+        self.first_byte = {}
+        # Etiqueta de métricas de la respuesta en curso: el archivo servido, relativo a root
+        self.labels = {}
+        self.notifier = ChangeNotifier(self.root)
+        # Conexiones que ya devolvieron su hueco de --max-connections (flujos /events)
+        self.detached = set()
+
+    async def handle_connection(self, reader, writer):
+        # Las conexiones que pasan del máximo esperan aquí su turno
+        self.metrics.waiting += 1
+        try:
+            await self.limit.acquire()
+        finally:
+            self.metrics.waiting -= 1
+        self.metrics.connections += 1
+        try:
+            await self.serve_connection(reader, writer)
+        finally:
+            self.first_byte.pop(writer, None)
+            self.labels.pop(writer, None)
+            if writer in self.detached:
+                self.detached.discard(writer)
+            else:
+                self.metrics.connections -= 1
+                self.limit.release()
+
+    def detach(self, writer):
+        """Devuelve el hueco de --max-connections de una conexión de larga duración."""
+        if writer not in self.detached:
+            self.detached.add(writer)
+            self.metrics.connections -= 1
+            self.limit.release()
+
+    async def serve_connection(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader),
+                                                     self.keepalive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except BadRequest as e:
+                    await self.send_error(writer, 400, str(e), keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                keep_alive = self.wants_keep_alive(request)
+                if not await self.discard_body(reader, request):
+                    keep_alive = False
+                start = time.perf_counter()
+                self.metrics.in_flight += 1
+                try:
+                    status, sent = await self.handle_request(request, writer, keep_alive)
+                finally:
+                    self.metrics.in_flight -= 1
+                end = time.perf_counter()
+                first_byte = self.first_byte.pop(writer, end)
+                # Se etiqueta por archivo servido (no por URL: /a/../x y //x son el
+                # mismo archivo) y los errores van juntos, así las series son finitas
+                label = self.labels.pop(writer, "other")
+                if status >= 400:
+                    label = "other"
+                self.metrics.record(label, status, sent, first_byte - start, end - start)
+                self.log(peer, request, status, sent)
+                if not keep_alive or request.path == EVENTS_PATH:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, reader):
+        """Lee la línea de petición y las cabeceras. None si el cliente cerró."""
+        try:
+            data = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise BadRequest("Cabeceras demasiado largas")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise
+
+        lines = data.decode("iso-8859-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise BadRequest("Línea de petición inválida")
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        path = urllib.parse.unquote(urllib.parse.urlsplit(target).path)
+        return Request(method, target, path, version, headers)
+
+    async def discard_body(self, reader, request):
+        """Lee y descarta el cuerpo de la petición para que no se tome por la siguiente.
+
+        Devuelve False si no se puede (chunked, demasiado grande o inválido) y
+        entonces la conexión no debe reutilizarse.
+        """
+        if "transfer-encoding" in request.headers:
+            return False
+        try:
+            length = int(request.headers.get("content-length", "0"))
+        except ValueError:
+            return False
+        if length < 0 or length > MAX_DISCARD_BODY:
+            return False
+        if length:
+            try:
+                await asyncio.wait_for(reader.readexactly(length), self.keepalive_timeout)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                return False
+        return True
+
+    @staticmethod
+    def wants_keep_alive(request):
+        connection = request.headers.get("connection", "").lower()
+        if request.version == "HTTP/1.1":
+            return connection != "close"
+        return connection == "keep-alive"
+
+    def resolve(self, url_path):
+        """Ruta del archivo dentro de root (None si se sale de root o no existe)."""
+        relative = url_path.lstrip("/")
+        path = os.path.realpath(os.path.join(self.root, relative))
+        if os.path.commonpath([self.root, path]) != self.root:
+            return None
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        return path if os.path.isfile(path) else None
+
+    async def handle_request(self, request, writer, keep_alive):
+        """Atiende una petición. Devuelve (estado, bytes de cuerpo enviados)."""
+        if request.method not in ("GET", "HEAD"):
+            await self.send_error(writer, 405, "Método no permitido", keep_alive,
+                                  extra={"Allow": "GET, HEAD"})
+            return 405, 0
+
+        if request.path in (EVENTS_PATH, METRICS_PATH):
+            self.labels[writer] = request.path
+        if request.path == EVENTS_PATH:
+            return await self.send_events(request, writer)
+
+        if request.path == METRICS_PATH:
+            body = self.metrics.render(self.cache).encode("utf-8")
+            self.write_head(writer, 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+                                          "Content-Length": str(len(body)),
+                                          "Cache-Control": "no-store"}, keep_alive)
+            if request.method == "HEAD":
+                body = b""
+            writer.write(body)
+            await writer.drain()
+            return 200, len(body)
+
+        try:
+            path = self.resolve(request.path)
+        except ValueError:
+            # Por ejemplo un byte nulo (%00) en la ruta
+            await self.send_error(writer, 400, "Ruta inválida", keep_alive)
+            return 400, 0
+        if path is None:
+            await self.send_error(writer, 404, "No encontrado", keep_alive)
+            return 404, 0
+        self.labels[writer] = "/" + os.path.relpath(path, self.root).replace(os.sep, "/")
+
+        try:
+            asset = self.cache.fresh(path)
+            if asset is None:
+                loop = asyncio.get_running_loop()
+                asset = await loop.run_in_executor(None, self.cache.load, path)
+        except PermissionError:
+            await self.send_error(writer, 403, "Prohibido", keep_alive)
+            return 403, 0
+        except OSError:
+            # Borrado o ilegible entre resolve() y la lectura
+            await self.send_error(writer, 404, "No encontrado", keep_alive)
+            return 404, 0
+
+        headers = {
+            "ETag": f'"{asset.etag}"',
+            "Last-Modified": asset.last_modified,
+            "Cache-Control": "no-cache",
+        }
+        if len(asset.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if not_modified(request, asset):
+            self.write_head(writer, 304, headers, keep_alive)
+            await writer.drain()
+            return 304, 0
+
+        headers["Accept-Ranges"] = "bytes"
+        headers["Content-Type"] = asset.content_type
+        status = 200
+        start, end = 0, asset.size - 1
+        range_header = request.headers.get("range")
+        if range_header and if_range_matches(request, asset):
+            try:
+                requested = byte_range(range_header, asset.size)
+            except RangeNotSatisfiable:
+                await self.send_error(writer, 416, "Rango no satisfacible", keep_alive,
+                                      extra={"Content-Range": f"bytes */{asset.size}"})
+                return 416, 0
+            if requested is not None:
+                status = 206
+                start, end = requested
+                headers["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+
+        # Los rangos se refieren siempre al archivo sin comprimir
+        encoding = "identity"
+        if status == 200:
+            encoding = preferred_encoding(request.headers.get("accept-encoding", ""), asset.variants)
+        body = asset.variants.get(encoding)
+        length = len(body) if encoding != "identity" else end - start + 1
+        headers["Content-Length"] = str(length)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+            headers["ETag"] = f'"{asset.etag}-{encoding}"'
+        if request.method == "HEAD" or length == 0:
+            self.write_head(writer, status, headers, keep_alive)
+            await writer.drain()
+            return status, 0
+
+        if body is not None:
+            self.write_head(writer, status, headers, keep_alive)
+            offset = start if encoding == "identity" else 0
+            writer.write(memoryview(body)[offset:offset + length])
+            await writer.drain()
+            return status, length
+
+        # Sin copia en memoria: del disco al socket con sendfile. Se abre antes
+        # de las cabeceras para poder responder con un error si ya no existe.
+        try:
+            f = open(asset.path, "rb")
+        except PermissionError:
+            await self.send_error(writer, 403, "Prohibido", keep_alive)
+            return 403, 0
+        except OSError:
+            await self.send_error(writer, 404, "No encontrado", keep_alive)
+            return 404, 0
+        with f:
+            self.write_head(writer, status, headers, keep_alive)
+            await writer.drain()
+            loop = asyncio.get_running_loop()
+            sent = await loop.sendfile(writer.transport, f, start, length)
+        return status, sent
+
+    async def send_events(self, request, writer):
+        """Flujo SSE abierto hasta que el cliente se va; la conexión no se reutiliza."""
+        if len(self.notifier.subscribers) >= MAX_EVENT_STREAMS:
+            await self.send_error(writer, 503, "Demasiados flujos de eventos", keep_alive=False,
+                                  extra={"Retry-After": "10"})
+            return 503, 0
+        self.write_head(writer, 200, {"Content-Type": "text/event-stream; charset=utf-8",
+                                      "Cache-Control": "no-store"}, keep_alive=False)
+        if request.method == "HEAD":
+            await writer.drain()
+            return 200, 0
+
+        # Un flujo abierto no debe dejar sin hueco a las peticiones normales
+        self.detach(writer)
+        queue = self.notifier.subscribe()
+        sent = 0
+        try:
+            # El navegador reconecta a los 2 s si se corta
+            writer.write(b"retry: 2000\n\n")
+            await writer.drain()
+            while not writer.is_closing():
+                try:
+                    message = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    message = b": ping\n\n"
+                writer.write(message)
+                sent += len(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.notifier.unsubscribe(queue)
+        return 200, sent
+
+    def write_head(self, writer, status, headers, keep_alive):
+        self.first_byte[writer] = time.perf_counter()
+        reason = http.HTTPStatus(status).phrase
+        lines = [f"HTTP/1.1 {status} {reason}",
+                 f"Date: {email.utils.formatdate(usegmt=True)}",
+                 "Server: portfolio-async",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1"))
+
+    async def send_error(self, writer, status, message, keep_alive, extra=None):
+        body = f"{status} {message}\n".encode("utf-8")
+        headers = {"Content-Type": "text/plain; charset=utf-8", "Content-Length": str(len(body))}
+        headers.update(extra or {})
+        self.write_head(writer, status, headers, keep_alive)
+        writer.write(body)
+        await writer.drain()
+
+    def log(self, peer, request, status, sent):
+        if not self.quiet:
+            host = peer[0] if peer else "-"
+            print(f'{host} "{request.method} {request.target} {request.version}" {status} {sent}')
+
+
+def report_task_error(task):
+    """Muestra el error de una tarea de fondo, que si no se perdería en silencio."""
+    if task.cancelled() or task.exception() is None:
+        return
+    error = task.exception()
+    print(f"ERROR en la tarea '{task.get_name()}':")
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+async def serve_async(args):
+    server = StaticServer(args.root, args.max_connections, args.keepalive_timeout,
+                          args.quiet, args.cache_mb)
+    if args.cache_mb > 0:
+        if brotli is None:
+            print("ADVERTENCIA: paquete 'brotli' no instalado; solo se servirá gzip.")
+        # Precarga en segundo plano: la primera visita ya encuentra todo comprimido
+        warmer = asyncio.create_task(asyncio.to_thread(server.cache.warm, server.root),
+                                     name="precarga de la caché")
+        warmer.add_done_callback(report_task_error)
+    listener = await asyncio.start_server(server.handle_connection, args.host, args.port,
+                                          limit=MAX_HEADER_BYTES, backlog=args.max_connections * 2)
+    # Se guarda la referencia para que la tarea no se recoja como basura
+    watcher = asyncio.create_task(server.notifier.watch(), name="vigilancia de /events")
+    watcher.add_done_callback(report_task_error)
+    async with listener:
+        await listener.serve_forever()
+
+
+# --- SERVIDOR SIMPLE (el de siempre) ---
+
+def serve_simple(args):
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *handler_args, **kwargs):
+            super().__init__(*handler_args, directory=args.root, **kwargs)
+
+    with socketserver.TCPServer((args.host, args.port), Handler) as httpd:
         httpd.serve_forever()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local del portafolio.")
+    parser.add_argument("--root", default=DIRECTORY, help="Carpeta a servir (por defecto, la de este script)")
+    parser.add_argument("--host", default="", help="Interfaz de escucha (por defecto, todas)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--mode", choices=["async", "simple"], default="async")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS,
+                        help="Conexiones atendidas a la vez (modo async)")
+    parser.add_argument("--keepalive-timeout", type=float, default=KEEPALIVE_TIMEOUT,
+                        help="Segundos que se mantiene abierta una conexión inactiva (modo async)")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_MB,
+                        help="Memoria para la caché de archivos comprimidos; 0 la desactiva (modo async)")
+    parser.add_argument("--no-browser", action="store_true", help="No abrir el navegador")
+    parser.add_argument("--quiet", action="store_true", help="Sin registro de peticiones")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"Iniciando servidor en http://localhost:{args.port} (modo {args.mode})")
+    print(f"Sirviendo archivos desde: {args.root}")
+    print("Presiona Ctrl+C para detener el servidor.")
+
+    # Abrir el navegador automáticamente
+    if not args.no_browser:
+        webbrowser.open(f"http://localhost:{args.port}/index.html")
+
+    try:
+        if args.mode == "async":
+            asyncio.run(serve_async(args))
+        else:
+            serve_simple(args)
     except KeyboardInterrupt:
         print("\nServidor detenido.")
+
+
+if __name__ == "__main__":
+    main()